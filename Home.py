@@ -1,8 +1,11 @@
 # ─────────────────────────────  Home.py  ─────────────────────────────
 # Landing page for the WTI Curve & Spread dashboard
-import streamlit as st, pandas as pd
+import streamlit as st, pandas as pd, os
 from io import BytesIO
-from src.preprocessing.daily import load_daily_xlsx
+from src.preprocessing.daily import load_daily
+from src.preprocessing.dataset import Dataset, dataset_key
+from src.preprocessing.warmup import warmup_for, sidebar_progress, artefact
+from src.viz.perf_panel import perf_panel
 
 # ──  page config  ────────────────────────────────────────────────────
 st.set_page_config(
@@ -11,25 +14,53 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 st.title("📈 WTI Curve & Spread Dashboard")
+perf_panel()
 
 # ──  file‑uploader (sidebar)  ────────────────────────────────────────
 uploaded = st.sidebar.file_uploader(
     "Upload **David WTI Spread Analysis.xlsx**", type="xlsx"
 )
 
+# ──  optional intraday feed (CSV prints, tailed by Curves / Alerts)  ──
+st.session_state["intraday_glob"] = st.sidebar.text_input(
+    "Intraday CSV files (optional glob)",
+    value=st.session_state.get("intraday_glob", os.environ.get("WTI_INTRADAY_GLOB", "")),
+    help="e.g. /data/intraday/*.csv — columns timestamp, leg, price[, volume]",
+)
+
+# ──  row calendar: every day (ffilled weekends) or CME trading days  ──
+_CAL_LABELS = {"daily": "Calendar days", "trading": "Trading days (CME)"}
+st.session_state["calendar"] = st.sidebar.radio(
+    "Row calendar", list(_CAL_LABELS), format_func=_CAL_LABELS.get,
+    index=list(_CAL_LABELS).index(st.session_state.get("calendar", "daily")),
+    help="Trading days: rolling windows count sessions, not calendar days",
+)
+
 # ──  persist raw bytes so a script error won’t drop the file  ───────
-if uploaded is not None:
-    st.session_state["xls_bytes"] = uploaded.getvalue()      # overwrite only on new upload
+# the bytes are hashed once per upload; that fingerprint is the cache key
+if uploaded is not None and st.session_state.get("xls_file_id") != uploaded.file_id:
+    st.session_state["xls_bytes"] = raw = uploaded.getvalue()
+    st.session_state["xls_file_id"] = uploaded.file_id
+    st.session_state["xls_key"] = dataset_key(raw)
 
-# ──  cached pre‑processing (keyed by bytes)  ─────────────────────────
-@st.cache_data(show_spinner="Pre‑processing workbook …", ttl=0)
-def _preprocess(raw_bytes: bytes) -> pd.DataFrame:
-    return load_daily_xlsx(BytesIO(raw_bytes))
+# ──  cached pre‑processing (keyed by fingerprint)  ───────────────────
+# cache_resource hands every rerun / session the *same* read‑only Dataset
+# (cache_data would unpickle a fresh copy of the frame on every hit);
+# `_raw_bytes` is excluded from the key so Streamlit never rehashes it
+@st.cache_resource(show_spinner="Pre‑processing workbook …", max_entries=4)
+def _preprocess(key: str, calendar: str, _raw_bytes: bytes) -> Dataset:
+    frame, contracts, provenance = load_daily(BytesIO(_raw_bytes), calendar=calendar)
+    return Dataset(frame, fingerprint=f"{key}-{calendar}", contracts=contracts,
+                   provenance=provenance, calendar=calendar)
 
 # ──  load DataFrame if we have bytes  ────────────────────────────────
 if "xls_bytes" in st.session_state:
-    daily_df = _preprocess(st.session_state["xls_bytes"])
-    st.session_state["daily_df"] = daily_df
+    dataset = _preprocess(st.session_state["xls_key"], st.session_state["calendar"],
+                          st.session_state["xls_bytes"])
+    st.session_state["dataset"] = dataset
+    st.session_state["daily_df"] = daily_df = dataset.frame   # shared: never mutate
+    warmup_for(dataset)                      # heavy analytics start in the background
+    sidebar_progress()
 else:
     daily_df = None
 
@@ -63,6 +94,19 @@ if daily_df is not None:
 
     st.success("Workbook loaded ✔︎ — use the sidebar to explore pages ➡️")
 
+    # ──  data quality (stale runs, gaps, outliers in observed points)  ──
+    with st.expander("Data quality"):
+        report = artefact("quality", dataset)
+        flagged = report[(report["Stale runs"] > 0) | (report["Outliers"] > 0)]
+        st.caption(f"{len(flagged)} of {len(report)} columns flagged  •  "
+                   f"provenance codes: {dataset.provenance.nbytes / 2**20:.1f} MB")
+        st.dataframe(
+            (flagged if len(flagged) else report)
+            .sort_values(["Outliers", "Stale runs"], ascending=False)
+            .style.format({"Observed %": "{:.1f}"}),
+            use_container_width=True,
+        )
+
 
 else:
     st.info(
@@ -1,21 +1,20 @@
 import streamlit as st, pandas as pd
-from src.alerts.engine import (
-    check_prompt_shock, check_dec_red, check_vol_spike,
-    check_spread_hi_lo, check_curve_kink, alert_bar
-)
+from src.alerts.engine import alert_bar
+from src.preprocessing.warmup import artefact, sidebar_progress
+from src.preprocessing.intraday import current_dataset, live_refresh
 from src.viz.alert_plots import plot_alert_ts  # small helper to convert ts→figure
+from src.viz.figure_cache import plotly_chart
+from src.viz.perf_panel import perf_panel
 
 st.header("🚨 Alerts Center")
+perf_panel()
 
-df: pd.DataFrame = st.session_state["daily_df"]
+ds = current_dataset()                      # + today's intraday row when live
+df: pd.DataFrame = ds.frame
 
-alerts = {
-    "Prompt": check_prompt_shock(df),
-    "DecRed": check_dec_red(df),
-    "Vol":    check_vol_spike(df),
-    "Hi/Lo":  check_spread_hi_lo(df, "%CL 1!", "%CL 2!"),
-    "Kink":   check_curve_kink(df),
-}
+sidebar_progress()
+live_refresh()
+alerts = artefact("alerts", ds)             # run_alerts(df), computed in the background
 
 alert_bar(alerts)
 st.divider()
@@ -24,7 +23,7 @@ st.divider()
 for name, data in alerts.items():
     with st.expander(f"{name} details", expanded=data is not None):
         if data:
-            st.plotly_chart(plot_alert_ts(name, data["ts"]), use_container_width=True)
+            plotly_chart(plot_alert_ts(name, data["ts"]), use_container_width=True)
             hist = st.session_state.setdefault(f"{name}_hist", [])
             if not hist or hist[-1]["date"] != df["Date (Day)"].iloc[-1]:
                 hist.append({"date": df['Date (Day)'].iloc[-1], "msg": data["msg"]})
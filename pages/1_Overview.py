@@ -1,20 +1,27 @@
 # pages/1_Overview.py  – Historical panels (outrights • spreads • inventory)
 import streamlit as st, pandas as pd, numpy as np, plotly.express as px
 from plotly.subplots import make_subplots
-import plotly.graph_objects as go
 from datetime import timedelta
 from src.analytics.term_structure import list_legs
+from src.viz.downsample import downsample, selected_x_range
+from src.viz.figure_cache import scatter_trace, memo_figure, plotly_chart
+from src.viz.perf_panel import perf_panel
 
 # ── page guard ──────────────────────────────────────────────────────────
 st.subheader("📊  Aligned time‑series panels")
+perf_panel()
 
 if "daily_df" not in st.session_state:
     st.warning("⬅️  Upload workbook first."); st.stop()
 
-df: pd.DataFrame = st.session_state["daily_df"].copy()
+ds = st.session_state["dataset"]          # shared read‑only dataset
+df: pd.DataFrame = ds.frame
 
 # ── classify columns ───────────────────────────────────────────────────
-leg_cols    = list_legs(df)                              # outrights
+# calendar contracts kept out of the wide frame (sparse store, pivoted on demand)
+grid_cols   = ([c for c in ds.contracts.contracts if c not in df.columns]
+               if ds.contracts is not None else [])
+leg_cols    = list_legs(df) + grid_cols                  # outrights
 inv_cols    = [c for c in df.columns if "Cushing" in c]  # inventory
 spread_cols = [c for c in df.columns                     # spreads
                if c not in leg_cols + inv_cols
@@ -31,10 +38,8 @@ if not sel:
     st.info("Select at least one series."); st.stop()
 
 # ── date‑range slider ──────────────────────────────────────────────────
-df_plot = df[["Date (Day)"] + sel].copy()
-
-min_d = df_plot["Date (Day)"].min().date()
-max_d = df_plot["Date (Day)"].max().date()
+min_d = ds.dates[0].date()
+max_d = ds.dates[-1].date()
 default_start = max_d - timedelta(days=30)
 if default_start < min_d:
     default_start = min_d
@@ -46,14 +51,24 @@ start_d, end_d = st.slider(
     format="MMM D YYYY",
 )
 
-mask = (
-    (df_plot["Date (Day)"] >= pd.Timestamp(start_d)) &
-    (df_plot["Date (Day)"] <= pd.Timestamp(end_d))
-)
-df_plot = df_plot.loc[mask]
+# box‑select on the chart zooms in: re‑query that range at full resolution
+zoom = selected_x_range("overview_ts")
+if zoom:
+    start_d, end_d = max(pd.Timestamp(start_d), zoom[0]), min(pd.Timestamp(end_d), zoom[1])
+
+# row‑range view of the shared frame (CoW: only sanitised columns get copied)
+grid_sel = [c for c in sel if c in set(grid_cols)]
+df_plot = ds.rows(start_d, end_d, ["Date (Day)"] + [c for c in sel if c not in grid_sel])
+if grid_sel:                                     # same rows, from the contract store
+    wide = ds.contracts.wide(grid_sel, start_d, end_d, index=ds.dates)
+    df_plot = df_plot.assign(**{c: wide[c].to_numpy() for c in grid_sel})[["Date (Day)"] + sel]
+if zoom:
+    st.caption(f"Zoomed to {zoom[0]:%d %b %Y} – {zoom[1]:%d %b %Y} "
+               "(double‑click the chart to reset).")
 
 # optional data‑sanitiser
-if st.checkbox("Hide COVID‑era extreme negatives", value=True):
+hide_covid = st.checkbox("Hide COVID‑era extreme negatives", value=True)
+if hide_covid:
     for col in [c for c in sel if c in leg_cols]:
         df_plot.loc[df_plot[col] < 0, col] = np.nan
     for col in [c for c in sel if c in spread_cols]:
@@ -69,41 +84,43 @@ rows = [(outs, "Outrights ($/bbl)"),
         (invs, "Inventory (Mbbl)")]
 rows = [r for r in rows if r[0]]      # keep non‑empty
 
-# ── build figure ───────────────────────────────────────────────────────
-fig = make_subplots(
-    rows=len(rows), cols=1,
-    shared_xaxes=True,
-    vertical_spacing=0.03,
-    subplot_titles=[title for _, title in rows],
-)
-
+# ── build figure (memoised on dataset fingerprint + selection) ───────
 palettes = [px.colors.qualitative.Set1,
             px.colors.qualitative.Set2,
             px.colors.qualitative.Set3]
 
-row_idx = 1
-for grp, _ in rows:
-    palette = palettes[row_idx - 1]
-    for i, col in enumerate(grp):
-        fig.add_trace(
-            go.Scatter(
-                x=df_plot["Date (Day)"],
-                y=df_plot[col],
-                mode="lines",
-                name=col,
-                line=dict(color=palette[i % len(palette)], width=2),
-                showlegend=(row_idx == 1)
-            ),
-            row=row_idx, col=1
-        )
-    row_idx += 1
-
-fig.update_layout(
-    height=250 * len(rows) + 100,
-    hovermode="x unified",
-    legend=dict(orientation="h", y=-0.15),
-    margin=dict(l=60, r=40, t=30, b=40),
-)
-
-fig.update_traces(fill="none")     # ensure no area shading
-st.plotly_chart(fig, use_container_width=True)
+def _build(frame: pd.DataFrame, rows):
+    fig = make_subplots(
+        rows=len(rows), cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.03,
+        subplot_titles=[title for _, title in rows],
+    )
+    for row_idx, (grp, _) in enumerate(rows, start=1):
+        palette = palettes[row_idx - 1]
+        for i, col in enumerate(grp):
+            xs, ys = downsample(frame["Date (Day)"], frame[col])   # ≈2 pts / px
+            fig.add_trace(
+                scatter_trace(
+                    xs, ys,
+                    mode="lines",
+                    name=col,
+                    line=dict(color=palette[i % len(palette)], width=2),
+                    showlegend=(row_idx == 1)
+                ),
+                row=row_idx, col=1
+            )
+
+    fig.update_layout(
+        height=250 * len(rows) + 100,
+        hovermode="x unified",
+        legend=dict(orientation="h", y=-0.15),
+        margin=dict(l=60, r=40, t=30, b=40),
+    )
+    fig.update_traces(fill="none")     # ensure no area shading
+    return fig
+
+fig = memo_figure("overview", _build, df_plot, rows=rows,
+                  data_key=(ds.fingerprint, start_d, end_d, tuple(sel), hide_covid))
+plotly_chart(fig, use_container_width=True, key="overview_ts",
+                on_select="rerun", selection_mode="box")
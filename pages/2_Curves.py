@@ -1,60 +1,128 @@
 # pages/2_Curve_Spreads.py
 import streamlit as st
 import pandas as pd
-from datetime import date as date_cls
-from src.viz.curve import make_curve_figure
+from datetime import date as date_cls, timedelta
+from src.viz.curve import make_curve_figure, curve_animation
 from src.analytics.term_structure import list_legs
-from src.analytics.top_movers import top_movers
 from src.viz.leaderboard import show_leaderboard
 from src.viz.waterfall import waterfall_curve
+from src.preprocessing.warmup import artefact, sidebar_progress
+from src.preprocessing.intraday import current_dataset, live_refresh, live_bars
+from src.viz.curve_factors import factor_panel
+from src.viz.figure_cache import memo_figure, plotly_chart
+from src.viz.perf_panel import perf_panel
 
 st.header("Forward Curve & Spread Ladder")
+perf_panel()
 
-daily_df: pd.DataFrame = st.session_state["daily_df"]
+ds = current_dataset()                      # + today's intraday row when live
+daily_df: pd.DataFrame = ds.frame
 
-# ── date slider ─────────────────────────────────────────────────────────
-min_d, max_d = daily_df["Date (Day)"].min(), daily_df["Date (Day)"].max()
-picked = st.slider(
-    "Pick a date",
-    min_value=min_d.date(),
-    max_value=max_d.date(),
-    value=max_d.date(),
-    format="MMM D YYYY"
-)
-picked_ts = pd.Timestamp(picked)
+sidebar_progress()
+live_refresh()
 
-# ── forward-curve strip ────────────────────────────────────────────────
-fig_curve = make_curve_figure(daily_df.set_index("Date (Day)"), picked_ts)
-st.plotly_chart(fig_curve, use_container_width=True)
+# ── curve cube: built once per dataset (warm‑up), every chart slices it ─
+cube = artefact("curve_cube", ds)
 
-st.caption("Green segments = backwardation (near > far), Red = contango.")
+# Each panel below is a fragment: moving its slider reruns (and re‑sends)
+# only that panel; figures are memoised per (dataset, row) in the session.
+
+# ── forward-curve strip + factors for one date ─────────────────────────
+@st.fragment
+def curve_panel():
+    min_d, max_d = daily_df["Date (Day)"].min(), daily_df["Date (Day)"].max()
+    picked = st.slider(
+        "Pick a date",
+        min_value=min_d.date(),
+        max_value=max_d.date(),
+        value=max_d.date(),
+        format="MMM D YYYY"
+    )
+    row = cube.row(pd.Timestamp(picked))
+    picked_ts = cube.date(row)
+
+    fig_curve = memo_figure("curve", make_curve_figure, cube, data_key=ds.fingerprint,
+                            date=picked_ts)
+    plotly_chart(fig_curve, use_container_width=True)
+    st.caption("Green segments = backwardation (near > far), Red = contango.")
+
+    with st.expander("Curve factors — rolling 1-yr PCA (level / slope / curvature)"):
+        pca = artefact("curve_pca", ds)
+        plotly_chart(memo_figure("curve_factors", factor_panel, pca, data_key=ds.fingerprint,
+                                 date=picked_ts), use_container_width=True)
+        share = pca.explained[row]
+        st.caption("Variance explained on picked date: " +
+                   "  ·  ".join(f"{n} {v:.1%}" for n, v in zip(pca.names, share)))
+
+
+curve_panel()
+
+
+# ── playback: every curve in a range as one client‑side animation ─────
+MAX_FRAMES = 600                            # keeps the figure ≈ 0.25 MB
+
+
+@st.fragment
+def playback_panel():
+    if not st.toggle("▶️ Playback — animate the curve over a date range"):
+        return
+    min_d, max_d = pd.Timestamp(cube.dates[0]).date(), pd.Timestamp(cube.dates[-1]).date()
+    c1, c2 = st.columns([3, 1])
+    start_d, end_d = c1.slider("Playback range", min_value=min_d, max_value=max_d,
+                               value=(max(min_d, max_d - timedelta(days=365)), max_d),
+                               format="MMM D YYYY")
+    step = c2.selectbox("Frame every", [1, 5, 21],
+                        format_func={1: "session", 5: "week (5)", 21: "month (21)"}.get)
+    frames = cube.frames(start_d, end_d, max_leg=12, every=step, max_frames=MAX_FRAMES)
+    if not len(frames):
+        st.info("No curves in this range."); return
+    fig = memo_figure("curve_playback", curve_animation, frames,
+                      data_key=(ds.fingerprint, start_d, end_d, step))
+    plotly_chart(fig, use_container_width=True)
+    st.caption(f"{len(frames)} frames ({frames.nbytes / 1024:.0f} KB of curves) — "
+               "play / scrub switches frames in the browser.")
+
+
+playback_panel()
+
+bars = live_bars()
+if bars is not None:
+    with st.expander(f"Intraday bars — last print {bars['time'].max():%d %b %H:%M:%S}"):
+        st.dataframe(bars.drop(columns="time").style.format(
+            {"last": "{:.2f}", "high": "{:.2f}", "low": "{:.2f}", "vwap": "{:.3f}",
+             "volume": "{:,.0f}", "prints": "{:,.0f}"}), use_container_width=True)
 
 
 st.subheader("⚡ Top curve movers (60-day z-score)")
-leader = top_movers(daily_df, window=60, k=7)
+leader = artefact("top_movers", ds)         # top_movers(window=60, k=7)
 show_leaderboard(leader)
 
 
+# ── overnight curve change ─────────────────────────────────────────────
+@st.fragment
+def overnight_panel():
+    st.subheader("Overnight curve change")
 
+    # a) ordered list of available dates (straight from the cube)
+    dates = pd.DatetimeIndex(cube.dates)
 
-st.subheader("Overnight curve change")
+    # b) Streamlit date-slider (skip the very first row since we need t-1)
+    picked_date = st.slider(
+        "Select day",
+        min_value=dates[1].to_pydatetime(),          # earliest allowed
+        max_value=dates[-1].to_pydatetime(),         # latest (today)
+        value=dates[-1].to_pydatetime(),             # default = latest
+        format="MMM D YYYY"
+    )
 
-# a) get an ordered list of available dates
-dates = pd.to_datetime(daily_df["Date (Day)"]).sort_values().unique()
+    # c) convert the chosen date to its cube row (O(1) lookup)
+    idx = cube.row(picked_date)
 
-# b) Streamlit date-slider (skip the very first row since we need t-1)
-picked_date = st.slider(
-    "Select day",
-    min_value=dates[1].to_pydatetime(),          # earliest allowed
-    max_value=dates[-1].to_pydatetime(),         # latest (today)
-    value=dates[-1].to_pydatetime(),             # default = latest
-    format="MMM D YYYY"
-)
+    # d) build the chart (idx is position not label)
+    wf_fig = memo_figure("waterfall", waterfall_curve, cube, data_key=ds.fingerprint,
+                         idx=idx, threshold=0.20)
+    plotly_chart(wf_fig, use_container_width=True)
+    st.caption("Segments coloured when |Δ| > 0.20 $/bbl overnight.")
 
-# c) convert the chosen date back to row index
-idx = daily_df.index[daily_df["Date (Day)"] == pd.Timestamp(picked_date)][0]
 
-# d) build the chart (idx is position not label)
-wf_fig = waterfall_curve(daily_df.reset_index(drop=True), idx, threshold=0.20)
-st.plotly_chart(wf_fig, use_container_width=True)
-st.caption("Segments coloured when |Δ| > 0.20 $/bbl overnight.")
\ No newline at end of file
+overnight_panel()
@@ -1,19 +1,157 @@
 import streamlit as st, pandas as pd, plotly.graph_objects as go, plotly.express as px
-from datetime import timedelta
 from src.analytics.term_structure import list_legs
-from src.analytics.spread_summary import compute_spread, summary_stats
+from src.analytics.spread_summary import compute_spread
+from src.preprocessing.dataset import overlay_for
+from src.analytics.spread_index import build_spread_index
+from src.analytics.rolling_rank import rolling_percentile_rank, DEFAULT_WINDOWS
+from src.analytics.all_pairs import all_pairs_summary, most_stretched, matrix_summary
+from src.analytics.spread_expr import engine_for, flies, condors, ExprError
+from src.jobs import submit, find, job_status
+from src.viz.pair_matrix import stretch_heatmap
+from src.viz.downsample import downsample, thin_figure
+from src.viz.figure_cache import scatter_trace, memo_figure, plotly_chart
+from src.viz.perf_panel import perf_panel
 
 st.header("📊 Spread Summary & Analysis")
+perf_panel()
 
 # ── Guard ─────────────────────────────────────────────────────────────
 if "daily_df" not in st.session_state:
     st.warning("Upload workbook first."); st.stop()
 
-df: pd.DataFrame = st.session_state["daily_df"]
+ds = st.session_state["dataset"]          # shared read‑only dataset
+df: pd.DataFrame = ds.frame
 
 # ── 1. Choose legs & date window ──────────────────────────────────────
 legs = list_legs(df)
 
+mode = st.radio("Mode", ["Single pair", "All pairs", "Expression"], horizontal=True)
+
+
+# Widgets that feed a single panel live in fragments: moving them reruns
+# (and re‑sends) that panel only, not the page above it.
+@st.fragment
+def stretched_table(summary: pd.DataFrame):
+    top_k = st.slider("Show top", 5, 50, 15, step=5)
+    st.dataframe(
+        most_stretched(summary, top_k).style.format({
+            "Last": "{:.3f}", "Mean": "{:.3f}", "Off Avg": "{:+.3f}",
+            "Median": "{:.3f}", "StDev": "{:.3f}", "StDev from Mean": "{:+.2f}",
+            "Percentile": "{:.1f}%", "High": "{:.3f}", "Low": "{:.3f}",
+        }),
+        use_container_width=True,
+    )
+
+# ── 0. All-pairs mode: every leg pair in one vectorised pass ─────────
+if mode == "All pairs":
+    min_d = ds.dates[0].date()
+    max_d = ds.dates[-1].date()
+    start_d, end_d = st.slider(
+        "Date range",
+        min_value=min_d,
+        max_value=max_d,
+        value=(min_d, max_d),
+        format="MMM D YYYY"
+    )
+    hide_covid = st.checkbox("Hide COVID negative-oil shock (Apr-May 2020)", value=True)
+    excluded = [(pd.Timestamp("2020-04-01"), pd.Timestamp("2020-05-15"))] if hide_covid else []
+    observed_only = st.checkbox("Observed settles only (skip filled weekend / holiday points)",
+                                value=False, disabled=ds.provenance is None)
+    observed = ds.provenance.observed(legs) if observed_only else None
+
+    summary = all_pairs_summary(df, start_d, end_d, exclude=excluded, legs=legs,
+                                observed=observed)
+    if summary.empty:
+        st.info("No leg pair has enough observations in this window."); st.stop()
+
+    st.subheader("StDev from mean — every near/far pair")
+    plotly_chart(stretch_heatmap(summary), use_container_width=True)
+
+    st.subheader("Most stretched spreads")
+    stretched_table(summary)
+
+    # ── cointegration scan: Engle–Granger per pair as a background job ──
+    @st.fragment
+    def scan_panel():
+        st.subheader("Cointegrated pairs (Engle–Granger)")
+        scan_legs = st.multiselect("Scan universe", legs,
+                                   default=[l for l in legs if l.startswith("%CL")][:12])
+        c1, c2 = st.columns(2)
+        p_thr = c1.select_slider("ADF p <", [0.01, 0.05, 0.10], value=0.05)
+        z_thr = c2.slider("|z| ≥", 0.0, 4.0, 2.0, step=0.5)
+        params = (ds.fingerprint, tuple(scan_legs), start_d, end_d, p_thr, z_thr)
+        job = find("pairs.batch_scan", params)
+        n_pairs = len(scan_legs) * (len(scan_legs) - 1) // 2
+        if (job is None or job.status in ("cancelled", "failed")) and \
+                st.button(f"Scan {n_pairs} pairs in the background", disabled=n_pairs == 0):
+            job = submit("pairs.batch_scan", ds.rows(start_d, end_d, scan_legs, by_date=True),
+                         scan_legs, p_thr, z_thr, key=params)
+        if job is not None:
+            job_status(job, "Cointegration scan")
+            if job.status == "done":
+                st.dataframe(job.result().style.format(
+                    {"β": "{:.3f}", "ADF_p": "{:.3f}", "z": "{:+.2f}"}),
+                    use_container_width=True, hide_index=True)
+
+    scan_panel()
+    st.stop()
+
+# ── 0b. Expression mode: flies / condors / strips as one matmul ──────
+if mode == "Expression":
+    eng = engine_for(ds)
+    expr = st.text_input(
+        "Spread expression", "%CL 1! - 2*%CL 2! + %CL 3!",
+        help='Linear in the legs, e.g. "%CL 1! - 2*%CL 2! + %CL 3!", '
+             '"(CL Z25 - CL Z26)/2", "0.5 %CL 1! + 0.5 %CL 2! - %CL 3!"',
+    )
+    min_d = ds.dates[0].date()
+    max_d = ds.dates[-1].date()
+    start_d, end_d = st.slider(
+        "Date range",
+        min_value=min_d,
+        max_value=max_d,
+        value=(min_d, max_d),
+        format="MMM D YYYY"
+    )
+    hide_covid = st.checkbox("Hide COVID negative-oil shock (Apr-May 2020)", value=True)
+
+    sl = ds.span(start_d, end_d)
+    dates = ds.dates[sl]
+    keep = ~((dates >= pd.Timestamp("2020-04-01")) & (dates <= pd.Timestamp("2020-05-15"))) \
+        if hide_covid else slice(None)
+
+    try:
+        series = eng.evaluate(expr)[expr].iloc[sl][keep]
+    except ExprError as err:
+        st.error(str(err)); st.stop()
+
+    stats = matrix_summary(series.to_numpy()[None, :], series.index, [expr], min_obs=1)
+    if stats.empty:
+        st.info("No observations in this window."); st.stop()
+    stats = stats.iloc[0]
+    cols = st.columns(5)
+    for i, lab in enumerate(["Last", "Mean", "StDev", "StDev from Mean", "Percentile"]):
+        val = stats[lab]
+        cols[i].metric(lab, f"{val:.1f}%" if lab == "Percentile" else f"{val:.3f}")
+
+    xs, ys = downsample(series.index, series.to_numpy())
+    fig_expr = go.Figure(scatter_trace(xs, ys, mode="lines", name=expr))
+    fig_expr.add_hline(stats["Mean"], line_dash="dash", line_color="gray")
+    fig_expr.update_layout(title=expr, hovermode="x unified")
+    plotly_chart(fig_expr, use_container_width=True)
+
+    # every fly and condor on the curve – one matmul, cached per expression
+    st.subheader("Flies & condors — most stretched")
+    pct = [c for c in legs if c.startswith("%CL") and int(c[4:-1]) <= 12]
+    decs = [c for c in legs if c.startswith("CL Z")]
+    scan = flies(pct) + flies(pct, 2) + condors(pct) + flies(decs) + condors(decs)
+    S = eng.evaluate(scan).iloc[sl][keep]
+    summary = matrix_summary(S.to_numpy().T, S.index, scan)
+    stretched_table(summary)
+    st.caption(f"{len(scan)} expressions evaluated as one "
+               f"{len(eng.legs)}×{len(scan)} weight matrix.")
+    st.stop()
+
 # quick presets
 presets = {
     "Prompt Spread (M1-M2)": ("%CL 1!", "%CL 2!"),
@@ -33,93 +171,59 @@ else:
 
 
 spread_name = f"{near} - {far}"
-df["Spread"] = compute_spread(df, near, far)
+# derived column lives in this session's overlay, not in the shared frame
+ov = overlay_for(st.session_state, ds)
+ov.derive("Spread", (near, far), lambda: compute_spread(df, near, far))
 
-# date-range slider
-min_d = df["Date (Day)"].min().date()
-max_d = df["Date (Day)"].max().date()
-default_start = max_d - timedelta(days=365)
+# range-query index: built once per leg pair, sliders then only query it
+if st.session_state.get("spread_index_src") is not df:
+    st.session_state["spread_index_src"] = df
+    st.session_state["spread_index"] = {}
+    st.session_state["spread_pct_rank"] = {}
+idx_cache = st.session_state["spread_index"]
+if (near, far) not in idx_cache:
+    idx_cache[(near, far)] = build_spread_index(df, near, far)
+spread_idx = idx_cache[(near, far)]
 
-start_d, end_d = st.slider(
-    "Date range",
-    min_value=min_d,
-    max_value=max_d,
-    value=(min_d, max_d),
-    format="MMM D YYYY"
-)
-
-mask = (df["Date (Day)"] >= pd.Timestamp(start_d)) & (df["Date (Day)"] <= pd.Timestamp(end_d))
-dff = df.loc[mask].copy()
-
-spread = dff.set_index("Date (Day)")["Spread"]
+# trailing percentile ranks (3 m / 1 y / 3 y) for the same pair
+rank_cache = st.session_state["spread_pct_rank"]
+if (near, far) not in rank_cache:
+    s_full = ov["Spread"].set_axis(ds.dates)
+    rank_cache[(near, far)] = pd.DataFrame(
+        {f"{w}d": rolling_percentile_rank(s_full, w) for w in DEFAULT_WINDOWS}
+    )
+pct_rank = rank_cache[(near, far)]
 
-# ── COVID window toggle ───────────────────────────────────────────────
+# ── 2. Date window → panels (fragment: the range only reruns this block) ─
 covid_start = pd.Timestamp("2020-04-01")
 covid_end   = pd.Timestamp("2020-05-15")
 
-hide_covid = st.checkbox(
-    "Hide COVID negative-oil shock (Apr-May 2020)",
-    value=True
-)
-
-if hide_covid:
-    dff = dff[~((dff["Date (Day)"] >= covid_start) &
-                (dff["Date (Day)"] <= covid_end))]
-    spread = dff.set_index("Date (Day)")["Spread"]   # refresh after drop
-
-
-# ── 2. Layout grid ────────────────────────────────────────────────────
-top = st.columns([2, 1])
-bot = st.columns([2, 1])
 
-# -- 2-A  overlay two legs --------------------------------------------
-with top[0]:
+def _legs_figure(dff):
     fig_legs = go.Figure()
     for col, clr in zip([near, far], ["#1f77b4", "#ff7f0e"]):
-        fig_legs.add_trace(go.Scatter(
-            x=dff["Date (Day)"], y=dff[col], name=col,
+        xs, ys = downsample(dff["Date (Day)"], dff[col])
+        fig_legs.add_trace(scatter_trace(
+            xs, ys, name=col,
             mode="lines", line=dict(color=clr)
         ))
     fig_legs.update_layout(title="Outrights overlay", hovermode="x unified")
-    st.plotly_chart(fig_legs, use_container_width=True)
+    return fig_legs
 
-# -- 2-B  numeric summary ---------------------------------------------
-with top[1]:
-    stats = summary_stats(spread)
 
-    labels = ["Last", "Mean", "Off Avg",
-              "Median", "StDev", "StDev from Mean",
-              "Percentile", "High", "Low"]
-
-    cols = st.columns(3)
-    for i, lab in enumerate(labels):
-        val = stats[lab]
-        if lab == "Percentile":
-            fmt = f"{val:.1f}%"
-        else:
-            fmt = f"{val:.3f}"
-        cols[i % 3].metric(lab, fmt)
-
-    st.caption(
-        f"High {stats['High Date']}  ·  "
-        f"Low {stats['Low Date']}"
-    )
-
-
-# -- 2-C  spread time-series ------------------------------------------
-with bot[0]:
+def _spread_figure(dff, mean):
     fig_spread = px.area(
         dff, x="Date (Day)", y="Spread",
         labels={"Spread": spread_name},
         title=f"{spread_name} over time"
     )
-    fig_spread.add_hline(stats["Mean"], line_dash="dash", line_color="gray")
+    fig_spread.add_hline(mean, line_dash="dash", line_color="gray")
     fig_spread.update_layout(hovermode="x unified")
-    
-    st.plotly_chart(fig_spread, use_container_width=True)
+    thin_figure(fig_spread)
+    return fig_spread
+
 
-# -- 2-D  histogram  ----------------------------------------------------
-with bot[1]:
+def _hist_figure(spread, mean, last):
     fig_hist = px.histogram(
         spread,
         nbins=60,
@@ -131,7 +235,7 @@ with bot[1]:
 
     # mean (existing line)
     fig_hist.add_vline(
-        x=stats["Mean"],
+        x=mean,
         line_dash="dash",
         line_color="gray",
         annotation_text="Mean",
@@ -140,11 +244,103 @@ with bot[1]:
 
     # today’s value  ← NEW dotted red line
     fig_hist.add_vline(
-        x=stats["Last"],
+        x=last,
         line_dash="dot",
         line_color="red",
         annotation_text="Today",
         annotation_position="top right"
     )
+    return fig_hist
+
+
+def _rank_figure(win_rank):
+    fig_rank = px.line(
+        win_rank,
+        labels={"value": "Percentile rank (%)", "index": "Date", "variable": "Look-back"},
+        title=f"{spread_name} — trailing percentile rank"
+    )
+    fig_rank.add_hrect(y0=0, y1=5, fillcolor="red", opacity=0.08, line_width=0)
+    fig_rank.add_hrect(y0=95, y1=100, fillcolor="red", opacity=0.08, line_width=0)
+    fig_rank.update_layout(hovermode="x unified", yaxis_range=[0, 100])
+    thin_figure(fig_rank)
+    return fig_rank
+
+
+@st.fragment
+def pair_panels():
+    # date-range slider
+    min_d = ds.dates[0].date()
+    max_d = ds.dates[-1].date()
+
+    start_d, end_d = st.slider(
+        "Date range",
+        min_value=min_d,
+        max_value=max_d,
+        value=(min_d, max_d),
+        format="MMM D YYYY"
+    )
+
+    # ── COVID window toggle ───────────────────────────────────────────
+    hide_covid = st.checkbox(
+        "Hide COVID negative-oil shock (Apr-May 2020)",
+        value=True
+    )
+
+    # figures are memoised per (dataset, pair, window) for this session
+    key = (ds.fingerprint, near, far, start_d, end_d, hide_covid)
+    dff = ov.rows(start_d, end_d, ["Date (Day)", near, far, "Spread"])   # row‑range view
+    if hide_covid:
+        dff = dff[~((dff["Date (Day)"] >= covid_start) &
+                    (dff["Date (Day)"] <= covid_end))]
+    spread = dff.set_index("Date (Day)")["Spread"]
+
+    excluded = [(covid_start, covid_end)] if hide_covid else []
+    stats = spread_idx.summary(pd.Timestamp(start_d), pd.Timestamp(end_d),
+                               exclude=excluded)
+
+    top = st.columns([2, 1])
+    bot = st.columns([2, 1])
+
+    # -- 2-A  overlay two legs ----------------------------------------
+    with top[0]:
+        plotly_chart(memo_figure("pair_legs", _legs_figure, dff, data_key=key),
+                     use_container_width=True)
+
+    # -- 2-B  numeric summary -----------------------------------------
+    with top[1]:
+        labels = ["Last", "Mean", "Off Avg",
+                  "Median", "StDev", "StDev from Mean",
+                  "Percentile", "High", "Low"]
+
+        cols = st.columns(3)
+        for i, lab in enumerate(labels):
+            val = stats[lab]
+            if lab == "Percentile":
+                fmt = f"{val:.1f}%"
+            else:
+                fmt = f"{val:.3f}"
+            cols[i % 3].metric(lab, fmt)
+
+        st.caption(
+            f"High {stats['High Date']}  ·  "
+            f"Low {stats['Low Date']}"
+        )
+
+    # -- 2-C  spread time-series --------------------------------------
+    with bot[0]:
+        plotly_chart(memo_figure("pair_spread", _spread_figure, dff, data_key=key,
+                                 mean=stats["Mean"]), use_container_width=True)
+
+    # -- 2-D  histogram  ------------------------------------------------
+    with bot[1]:
+        plotly_chart(memo_figure("pair_hist", _hist_figure, spread, data_key=key,
+                                 mean=stats["Mean"], last=stats["Last"]),
+                     use_container_width=True)
+
+    # -- 2-E  rolling percentile rank ----------------------------------
+    win_rank = pct_rank.loc[pd.Timestamp(start_d):pd.Timestamp(end_d)]
+    plotly_chart(memo_figure("pair_rank", _rank_figure, win_rank, data_key=key),
+                 use_container_width=True)
+
 
-    st.plotly_chart(fig_hist, use_container_width=True)
+pair_panels()
@@ -0,0 +1,58 @@
+# pages/4_Seasonality.py  – year‑over‑year overlays (spreads • Z contracts)
+import streamlit as st, pandas as pd
+from src.analytics.term_structure import list_legs, list_spreads
+from src.analytics.seasonal import SeasonalEngine
+from src.viz.seasonal import seasonal_figure
+from src.viz.figure_cache import plotly_chart
+from src.viz.perf_panel import perf_panel
+
+st.header("📅 Seasonality — this year vs past years")
+perf_panel()
+
+# ── guard ───────────────────────────────────────────────────────────────
+if "daily_df" not in st.session_state:
+    st.warning("⬅️  Upload workbook first."); st.stop()
+
+df: pd.DataFrame = st.session_state["daily_df"]
+
+# ── seasonal engine: one per dataset, matrices cached per series ───────
+if st.session_state.get("seasonal_src") is not df:
+    st.session_state["seasonal_src"] = df
+    st.session_state["seasonal"] = SeasonalEngine(df)
+eng: SeasonalEngine = st.session_state["seasonal"]
+
+# ── controls ───────────────────────────────────────────────────────────
+universe = list_spreads(df) + list_legs(df)
+default = universe.index("Dec Red") if "Dec Red" in universe else 0
+col = st.selectbox("Series", universe, index=default)
+
+years = eng.years.tolist()
+current = years[-1]
+c1, c2 = st.columns([3, 1])
+picked = c1.multiselect("Overlay years", years[::-1],
+                        default=[y for y in years[::-1][:4]])
+rebase = c2.checkbox("Rebase to 1 Jan", value=False)
+past = len(years) - 1                     # complete years before the current one
+if past > 3:
+    hist_n = st.slider("Years in bands", 3, past, min(10, past))
+else:                                     # short workbook: every past year
+    hist_n = past
+
+# ── compute (reductions over the cached year × doy matrix) ─────────────
+band_years = years[:-1][-hist_n:] if hist_n else []
+bands = eng.bands(col, exclude_years=[y for y in years if y not in band_years],
+                  rebase=rebase)
+overlay = eng.overlay(col, sorted(picked), rebase=rebase)
+
+plotly_chart(
+    seasonal_figure(bands, overlay, f"{col} — seasonal profile", current),
+    use_container_width=True
+)
+
+rank = eng.rank_today(col, rebase=rebase)
+st.caption(
+    f"Bands from {band_years[0]}–{band_years[-1]}  ·  "
+    f"today vs same day in past years: {rank:.0f}th percentile"
+    if band_years and pd.notna(rank) else
+    "Not enough history for a same‑day comparison."
+)
@@ -3,21 +3,27 @@
 # Interactive nearest‑neighbour analogue finder
 # ---------------------------------------------------------------
 import streamlit as st, pandas as pd
-from src.analytics.nn_features  import build_feature_matrix
+from src.preprocessing.warmup   import artefact, sidebar_progress
 from src.analytics.nn_search    import knn_search
 from src.analytics.nn_forward   import forward_outcomes
-from src.viz.nn_report          import neighbour_table, outcome_bar
+from src.analytics.nn_bootstrap import bootstrap_bands
+from src.viz.nn_report          import neighbour_table, outcome_bar, history_figure, bands_figure
+from src.viz.downsample         import selected_x_range
+from src.viz.figure_cache       import memo_figure, plotly_chart
+from src.viz.perf_panel         import perf_panel
+from src.jobs                   import submit, find, job_status
 
 st.header("🔍  Historical Analogue Finder")
+perf_panel()
 
 # ── guard ───────────────────────────────────────────────────────
 if "daily_df" not in st.session_state:
     st.warning("⬅️  Upload workbook first."); st.stop()
 
-# tidy DataFrame (index = date)
-df: pd.DataFrame = st.session_state["daily_df"].copy()
-df["Date (Day)"] = pd.to_datetime(df["Date (Day)"])
-df = df.set_index("Date (Day)").sort_index()
+# tidy DataFrame (index = date) – shared, read‑only view
+ds = st.session_state["dataset"]
+df: pd.DataFrame = ds.by_date
+sidebar_progress()
 
 # ── feature‑set selector (Full / Limited) ───────────────────────
 mode_label = st.selectbox(
@@ -29,13 +35,13 @@ mode_label = st.selectbox(
     index=0
 )
 mode_key = "limited" if mode_label.startswith("Limited") else "full"
+if mode_key == "full" and st.checkbox(
+        "Add curve PCA factors (level / slope / curvature)", value=False,
+        help="Rolling 1‑yr PCA scores; the first year of history drops out"):
+    mode_key = "full+pca"
 
-# ---- build & cache feature matrix ------------------------------
-@st.cache_data(show_spinner="Building feature matrix …")
-def _features(dframe, mode):
-    return build_feature_matrix(dframe, mode=mode)
-
-X, meta = _features(df, mode_key)
+# ---- feature matrix (built in the background after upload) -----
+X, meta = artefact(f"features:{mode_key}")
 
 # ── UI controls -------------------------------------------------
 query = st.date_input(
@@ -45,6 +51,12 @@ query = st.date_input(
     max_value=X.index[-1].date(),
 )
 
+search = st.radio("Match", ["Single day (k‑NN)", "Trajectory"], horizontal=True)
+if search == "Trajectory":
+    c1, c2 = st.columns(2)
+    window = c1.slider("Trajectory window (rows)", 5, 60, 20)
+    metric = c2.selectbox("Distance", ["DTW", "Euclidean"])
+
 k     = st.slider("Neighbours (k)",               3, 15, 5)
 fwd   = st.slider("Forward days",                 5, 30, 10, step=5)
 gap   = st.slider("Black‑out window ± days",      5, 90, 30, step=5)
@@ -56,17 +68,45 @@ spread_choices = (
 targets = st.multiselect("Target spreads", spread_choices,
                          default=["Prompt Spread"])
 
+# ── bootstrap bands: keyed on what they derive from, shared by sessions
+# (`_df` is left out of the key so Streamlit never hashes the frame)
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _bands(fingerprint, neighbours, targets, ci, _df):
+    return bootstrap_bands(_df, pd.DatetimeIndex(neighbours), list(targets),
+                           horizons=range(5, 31, 5), ci=ci)
+
 # ── nearest‑neighbour search -----------------------------------
-try:
-    nbrs = knn_search(
-        X,
-        pd.Timestamp(query),
-        k=k,
-        min_gap=gap,        # exclude dates within ±gap of query
-        dedup_gap=7         # neighbours themselves ≥7 d apart
-    )
-except ValueError as err:
-    st.error(str(err)); st.stop()
+if search == "Trajectory":
+    # DTW over every window is the slow part → background job, kept per parameters
+    params = (ds.fingerprint, mode_key, query, window, k, gap, metric)
+    job = find("analogues.trajectory", params)
+    if job is None or (job.status == "cancelled" and st.button("Search again")):
+        job = submit(
+            "analogues.trajectory",
+            X,
+            pd.Timestamp(query),
+            window=window,
+            k=k,
+            min_gap=gap,
+            dedup_gap=7,
+            metric="dtw" if metric == "DTW" else "euclid",
+            key=params,
+        )
+    job_status(job, f"{metric} trajectory search")
+    if job.status != "done":
+        st.stop()
+    nbrs = job.result()
+else:
+    try:
+        nbrs = knn_search(
+            X,
+            pd.Timestamp(query),
+            k=k,
+            min_gap=gap,        # exclude dates within ±gap of query
+            dedup_gap=7         # neighbours themselves ≥7 d apart
+        )
+    except ValueError as err:
+        st.error(str(err)); st.stop()
 
 # ── neighbour table --------------------------------------------
 st.subheader("Nearest neighbours")
@@ -83,40 +123,16 @@ if targets:
     tgt = targets[0]                     # plot just the first target
     ts = df[tgt].dropna()
 
-    import plotly.graph_objects as go
-    fig_hist = go.Figure()
-
-    # full history line
-    fig_hist.add_trace(go.Scatter(
-        x=ts.index, y=ts.values,
-        mode="lines",
-        name=tgt,
-        line=dict(color="royalblue")
-    ))
-
-    # add semi‑transparent vrect for ±7 day window of each neighbour
-    for dt in nbrs.index:
-        start = dt - pd.Timedelta(days=7)
-        end   = dt + pd.Timedelta(days=7)
-        fig_hist.add_vrect(
-            x0=start, x1=end,
-            fillcolor="orange", opacity=0.25, layer="below", line_width=0
-        )
-        # marker on the exact neighbour date
-        fig_hist.add_trace(go.Scatter(
-            x=[dt], y=[ts.loc[dt]],
-            mode="markers", marker=dict(color="red", size=6),
-            showlegend=False
-        ))
-
-    fig_hist.update_layout(
-        title=f"{tgt} — full history  (orange = ±7 d around neighbours)",
-        height=400,
-        margin=dict(l=60, r=40, t=50, b=40),
-        hovermode="x unified"
-    )
-    fig_hist.update_traces(fill="none")
-    st.plotly_chart(fig_hist, use_container_width=True)
+    # box‑select zoom → redraw that range at full resolution
+    zoom = selected_x_range("analogue_hist")
+
+    # memoised: rebuilt only when the series, neighbours or zoom change
+    starts = pd.DatetimeIndex(nbrs["Start"]) if "Start" in nbrs else None
+    fig_hist = memo_figure("analogue_hist", history_figure,
+                           ts, nbrs.index, name=tgt, zoom=zoom, starts=starts,
+                           data_key=(ds.fingerprint, tgt, tuple(nbrs.index)))
+    plotly_chart(fig_hist, use_container_width=True, key="analogue_hist",
+                    on_select="rerun", selection_mode="box")
 
     # ── neighbour Δ table (numeric, no chart) --------------------------
     delta_tbl = out[[tgt]].rename(columns={tgt: f"Δ{fwd}d"})
@@ -126,12 +142,30 @@ if targets:
         use_container_width=True,
         hide_index=False,
     )
+
+    # ── confidence bands: bootstrap over neighbours vs random dates ──
+    ci = st.select_slider("Confidence", [0.80, 0.90, 0.95], value=0.90,
+                          format_func=lambda c: f"{c:.0%}")
+    bands = _bands(ds.fingerprint, tuple(nbrs.index), tuple(targets), ci, df)
+    plotly_chart(memo_figure("analogue_bands", bands_figure, bands, target=tgt),
+                 use_container_width=True)
+    st.dataframe(
+        bands.xs(fwd, level="Horizon").style.format(
+            {"n": "{:.0f}", "Pctile": "{:.0f}"}, na_rep="–", precision=2),
+        use_container_width=True,
+    )
+    st.caption("Pctile = rank of the analogue mean among means of the same "
+               "number of random dates; near 0 or 100 ⇒ unlikely by chance.")
 else:
     st.info("Select at least one target spread to show history plot.")
 
 # ── caption -----------------------------------------------------
+match_note = ""
+if search == "Trajectory":
+    match_note = (f"  •  {metric} on {window}‑row windows "
+                  f"({nbrs.attrs['searched']}/{nbrs.attrs['candidates']} scored)")
 st.caption(
     f"**Feature mode**: {mode_label.split('–')[0].strip()}  •  "
     f"Query = {query}  •  "
-    f"Neighbours = {k}, blackout ±{gap} d, de‑dup ≥7 d."
+    f"Neighbours = {k}, blackout ±{gap} d, de‑dup ≥7 d." + match_note
 )
@@ -0,0 +1,65 @@
+# pages/6_Event_Study.py  – spreads around EIA release days, by inventory surprise
+import streamlit as st, pandas as pd
+from src.analytics.term_structure import list_spreads
+from src.analytics.event_study import (release_metrics, release_events, surprise_buckets,
+                                       EventCube, DEFAULT_METRIC)
+from src.viz.event_study import event_profile_figure
+from src.viz.figure_cache import plotly_chart
+from src.viz.perf_panel import perf_panel
+
+st.header("🛢️  EIA release event study")
+perf_panel()
+
+# ── guard ───────────────────────────────────────────────────────────────
+if "daily_df" not in st.session_state:
+    st.warning("⬅️  Upload workbook first."); st.stop()
+
+ds = st.session_state["dataset"]          # shared read‑only dataset
+df: pd.DataFrame = ds.frame
+
+metrics = release_metrics(df)
+if not metrics:
+    st.info("No weekly (Release) columns in this workbook."); st.stop()
+
+# ── controls ───────────────────────────────────────────────────────────
+c1, c2, c3 = st.columns([3, 2, 2])
+metric = c1.selectbox("Release", metrics,
+                      index=metrics.index(DEFAULT_METRIC) if DEFAULT_METRIC in metrics else 0)
+expect = c2.radio("Surprise vs", ["seasonal", "none"], horizontal=True,
+                  format_func={"seasonal": "Same week, past 5 y", "none": "Zero"}.get,
+                  help="The workbook has no survey consensus; the seasonal "
+                       "average change of the same ISO week is the expectation")
+n_buckets = c3.slider("Surprise buckets", 2, 5, 3)
+pre, post = st.slider("Window (rows around the release)", -20, 30, (-5, 10))
+pre = min(pre, -1)                         # base row is the one before the release
+
+# ── event cube: every spread around every release, one gather ──────────
+spreads = list_spreads(df)
+key = (ds.fingerprint, metric, expect, pre, post)
+if st.session_state.get("event_key") != key:
+    events = release_events(df, metric, ds.provenance, expect=expect)
+    st.session_state["event_cube"] = EventCube(df, events, spreads, range(pre, post + 1))
+    st.session_state["event_key"] = key
+cube: EventCube = st.session_state["event_cube"]
+codes, labels = surprise_buckets(cube.events["Surprise"], n_buckets)
+if not labels:
+    st.info("Not enough releases with a surprise to bucket."); st.stop()
+
+# ── profile of one spread ──────────────────────────────────────────────
+default = spreads.index("Prompt Spread") if "Prompt Spread" in spreads else 0
+col = st.selectbox("Spread", spreads, index=default)
+plotly_chart(event_profile_figure(cube.profile(col, codes, labels),
+                                  f"{col} around {metric} releases"),
+             use_container_width=True)
+
+# ── all spreads at one offset ──────────────────────────────────────────
+at = st.select_slider("Offset for the table", options=list(cube.offsets),
+                      value=1 if 1 in cube.offsets else int(cube.offsets[-1]))
+tbl = cube.table(at, codes, labels)
+sort_col = "Top − bottom" if "Top − bottom" in tbl.columns else labels[0]
+st.dataframe(tbl.sort_values(sort_col, key=abs, ascending=False)
+                .style.format("{:+.3f}", subset=[c for c in tbl.columns if c != "n"]),
+             use_container_width=True)
+n_ok = int((codes >= 0).sum())
+st.caption(f"{len(cube)} releases of {metric} ({n_ok} with a surprise) · "
+           f"{len(spreads)} spreads · Δ vs the row before the release")
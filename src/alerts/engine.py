@@ -3,7 +3,12 @@ from datetime import datetime
 import pandas as pd, numpy as np
 from src.analytics.spread_summary import compute_spread
 from src.analytics.rolling_vol import rolling_vol
-from src.analytics.term_structure import list_legs
+from src.analytics.curve_cube import as_curve_cube
+from src.analytics.rolling_rank import percentile_rank_panel
+from src.perf import timed
+
+# rows the checks read back from today: DecRed's 5‑yr z over its 750‑row plot
+LOOKBACK = 252 * 5 + 750
 
 def _z(series, win):                      # helper
     return (series - series.rolling(win).mean())/series.rolling(win).std()
@@ -58,16 +63,46 @@ def check_spread_hi_lo(df, near, far, lookback=504):
     return None
 
 def check_curve_kink(df):
-    legs = list_legs(df, 12)
-    today = df.set_index("Date (Day)").iloc[-1][legs]
-    prev  = df.set_index("Date (Day)").iloc[-2][legs]
-    diff  = today - prev
-    sig   = df.set_index("Date (Day)")[legs].diff().rolling(60).std().iloc[-2]
+    cube = as_curve_cube(df)
+    legs = cube.tenor_names(12)
+    block = cube.block(max(len(cube) - 62, 0), None, 12)   # 60 σ‑diffs + today
+    diff = pd.Series(block[-1] - block[-2], index=legs)
+    sig  = np.diff(block[:-1], axis=0).std(axis=0, ddof=1)
     for i in range(1, len(legs)-1):
-        if abs(diff[i]) > 2*sig[i] and abs(diff[i-1]) < 1*sig[i-1] and abs(diff[i+1]) < 1*sig[i+1]:
-            return dict(ts=diff, msg=f"Kink at M{i+1}: {diff[i]:+.2f}")
+        if abs(diff.iloc[i]) > 2*sig[i] and abs(diff.iloc[i-1]) < 1*sig[i-1] and abs(diff.iloc[i+1]) < 1*sig[i+1]:
+            return dict(ts=diff, msg=f"Kink at M{i+1}: {diff.iloc[i]:+.2f}")
     return None
 
+def check_pct_rank_extreme(df, window=252, lo=2.5, hi=97.5):
+    """Spreads whose trailing `window`-day percentile rank is outside [lo, hi]."""
+    ranks = percentile_rank_panel(df, windows=(window,))[window]
+    ranks.index = pd.to_datetime(ranks.index)
+    today = ranks.iloc[-1].dropna()
+    hits = today[(today < lo) | (today > hi)]
+    if hits.empty:
+        return None
+    worst = (hits - 50).abs().idxmax()
+    return dict(ts=ranks[worst].tail(250).rename(worst),
+                msg=f"{len(hits)} spread(s) at {window}d extreme · {worst} {hits[worst]:.0f}%")
+
+@timed()
+def run_alerts(df, progress=None) -> dict:
+    """The full alert suite shown on the Alerts page (name → result)."""
+    checks = {
+        "Prompt": lambda: check_prompt_shock(df),
+        "DecRed": lambda: check_dec_red(df),
+        "Vol":    lambda: check_vol_spike(df),
+        "Hi/Lo":  lambda: check_spread_hi_lo(df, "%CL 1!", "%CL 2!"),
+        "Kink":   lambda: check_curve_kink(df),
+        "Pctl":   lambda: check_pct_rank_extreme(df),
+    }
+    out = {}
+    for k, (name, check) in enumerate(checks.items()):
+        if progress is not None:
+            progress(k, len(checks), name)
+        out[name] = check()
+    return out
+
 def alert_bar(alerts):
     cols = st.columns(len(alerts))
     for (name, data), col in zip(alerts.items(), cols):
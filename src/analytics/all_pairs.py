@@ -0,0 +1,132 @@
+"""
+all_pairs.py  – summary_stats for every leg pair in one array pass
+------------------------------------------------------------------
+Instead of N² calls to ``compute_spread`` + ``summary_stats`` the outright
+matrix P (dates × legs) is differenced once into a spread matrix
+S = P[near] − P[far] (pairs × dates, rows contiguous) and every
+statistic is a NaN‑aware reduction along the date axis.
+"""
+
+from __future__ import annotations
+import pandas as pd, numpy as np
+from itertools import combinations
+
+from .term_structure import list_legs
+from ..perf import timed
+
+
+@timed()
+def all_pairs_summary(
+    df: pd.DataFrame,
+    start=None,
+    end=None,
+    exclude=(),
+    legs: list[str] | None = None,
+    min_obs: int = 20,
+    observed: np.ndarray | None = None,
+) -> pd.DataFrame:
+    """
+    Summary statistics for every (near, far) pair of outright legs.
+
+    Parameters
+    ----------
+    df : DataFrame with a 'Date (Day)' column
+    start, end : inclusive date window (default = full history)
+    exclude : iterable of (x0, x1) date windows to drop (e.g. COVID)
+    legs : outright columns (default = list_legs(df), incl. CL Zyy)
+    min_obs : pairs with fewer overlapping observations are dropped
+    observed : optional rows × legs bool mask (e.g. ``Provenance.observed``);
+        filled points are dropped so only real settles enter the stats
+
+    Returns
+    -------
+    DataFrame, one row per pair, with the ``summary_stats`` fields plus
+    Near / Far / Obs.
+    """
+    legs = list_legs(df) if legs is None else legs
+    dates = pd.to_datetime(df["Date (Day)"]).to_numpy()
+
+    keep = np.ones(len(dates), dtype=bool)
+    if start is not None:
+        keep &= dates >= np.datetime64(pd.Timestamp(start))
+    if end is not None:
+        keep &= dates <= np.datetime64(pd.Timestamp(end))
+    for x0, x1 in exclude:
+        keep &= ~((dates >= np.datetime64(pd.Timestamp(x0))) &
+                  (dates <= np.datetime64(pd.Timestamp(x1))))
+    dates = dates[keep]
+
+    P = df[legs].to_numpy(dtype=float)
+    if observed is not None:
+        P = np.where(observed, P, np.nan)
+    P = np.ascontiguousarray(P[keep].T)                     # legs × dates
+    pairs = list(combinations(range(len(legs)), 2))
+    if not pairs or not len(dates):
+        return pd.DataFrame()
+    i, j = np.array(pairs).T
+    S = P[i] - P[j]                                         # pairs × dates
+
+    leg_arr = np.array(legs, dtype=object)
+    names = [f"{a} - {b}" for a, b in zip(leg_arr[i], leg_arr[j])]
+    out = matrix_summary(S, dates, names, min_obs)
+    if out.empty:
+        return out
+    near_far = pd.DataFrame({"Near": leg_arr[i], "Far": leg_arr[j]}, index=names)
+    return near_far.join(out, how="inner")
+
+
+def matrix_summary(S: np.ndarray, dates, names, min_obs: int = 20) -> pd.DataFrame:
+    """
+    ``summary_stats`` fields + Obs for every row of S (series × dates),
+    as NaN‑aware reductions along the date axis; rows with fewer than
+    `min_obs` observations are dropped.
+    """
+    names = np.asarray(names, dtype=object)
+    valid = ~np.isnan(S)
+    n = valid.sum(axis=1)
+    ok = n >= min_obs
+    S, valid, n, names = S[ok], valid[ok], n[ok], names[ok]
+    if not len(n):
+        return pd.DataFrame()
+
+    # last non‑NaN value per series
+    rows = np.arange(len(S))
+    last_pos = S.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
+    last = S[rows, last_pos]
+
+    mean = np.nanmean(S, axis=1)
+    std = np.nanstd(S, axis=1, ddof=1)
+    median = np.nanmedian(S, axis=1)
+
+    # percentileofscore(kind="rank") against each series' own last value
+    left = (S < last[:, None]).sum(axis=1)
+    right = (S <= last[:, None]).sum(axis=1)
+    pct = (left + right + (left < right)) * 50.0 / n
+
+    hi_pos = np.argmax(np.where(valid, S, -np.inf), axis=1)
+    lo_pos = np.argmin(np.where(valid, S, np.inf), axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(std > 0, (last - mean) / std, np.nan)
+
+    dates = pd.DatetimeIndex(dates)
+    return pd.DataFrame({
+        "Last":            last,
+        "Mean":            mean,
+        "Off Avg":         last - mean,
+        "Median":          median,
+        "StDev":           std,
+        "StDev from Mean": z,
+        "Percentile":      pct,
+        "High":            S[rows, hi_pos],
+        "High Date":       dates[hi_pos].date,
+        "Low":             S[rows, lo_pos],
+        "Low Date":        dates[lo_pos].date,
+        "Obs":             n,
+    }, index=list(names))
+
+
+def most_stretched(summary: pd.DataFrame, k: int = 15) -> pd.DataFrame:
+    """Top-k pairs by |StDev from Mean|."""
+    return summary.sort_values("StDev from Mean", key=np.abs,
+                               ascending=False).head(k)
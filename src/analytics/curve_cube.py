@@ -0,0 +1,166 @@
+"""
+curve_cube.py  – dense date × tenor block of %CL outrights
+----------------------------------------------------------
+*Built once per dataset — every curve consumer slices it directly*
+
+values  : C‑contiguous float array (dates × tenors)
+dates   : sorted datetime64[ns] row labels
+tenors  : ['%CL 1!', '%CL 2!', …] column catalogue, months = [1, 2, …]
+
+Date → row is a dict lookup (falls back to "last row on or before" for
+dates outside the calendar), so pulling a curve costs the same whether
+the history is one year or thirty.
+
+``frames`` cuts a date range into compact playback frames (float32
+curves + slope colour bits) for a client‑side animation; ``with_tail``
+swaps in live rows without rebuilding the history.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+import pandas as pd, numpy as np
+from typing import Dict, List
+
+from .term_structure import list_legs, _LEG_RE_PCT
+from ..perf import timed
+
+
+def _fill_tenors(y: np.ndarray) -> np.ndarray:
+    """ffill then bfill along the tenor axis (last axis)."""
+    y = np.array(y, dtype=float, copy=True)
+    if not np.isnan(y).any():
+        return y
+    n = y.shape[-1]
+    idx = np.where(~np.isnan(y), np.arange(n), 0)
+    np.maximum.accumulate(idx, axis=-1, out=idx)
+    y = np.take_along_axis(y, idx, axis=-1)
+    idx = np.where(~np.isnan(y), np.arange(n), n - 1)
+    idx = np.minimum.accumulate(idx[..., ::-1], axis=-1)[..., ::-1]
+    return np.take_along_axis(y, idx, axis=-1)
+
+
+@dataclass(frozen=True)
+class CurveFrames:
+    """Playback frames: one tenor‑filled curve per date plus its slope colours."""
+    dates: np.ndarray            # datetime64[ns], one per frame
+    tenors: List[str]
+    values: np.ndarray           # frames × tenors, float32
+    back: np.ndarray             # frames × tenors, bool: ≤ previous tenor (backwardation)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def nbytes(self) -> int:
+        return self.dates.nbytes + self.values.nbytes + self.back.nbytes
+
+
+class CurveCube:
+    """Dense outright curve history with O(1) date lookups."""
+
+    def __init__(self, dates: np.ndarray, values: np.ndarray, tenors: List[str]):
+        order = np.argsort(dates, kind="stable")
+        self.dates = np.asarray(dates, dtype="datetime64[ns]")[order]
+        self.values = np.ascontiguousarray(np.asarray(values, dtype=float)[order])
+        self.tenors = list(tenors)
+        self.months = np.array([int(_LEG_RE_PCT.fullmatch(t).group(1)) for t in self.tenors])
+        self._row: Dict[int, int] = {d: i for i, d in
+                                     enumerate(self.dates.view("int64").tolist())}
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    # ── lookups ──────────────────────────────────────────────────────
+    def row(self, date) -> int:
+        """Row of `date`; if absent, the last row on or before it (clipped)."""
+        key = pd.Timestamp(date).value
+        i = self._row.get(key)
+        if i is None:
+            i = int(np.searchsorted(self.dates.view("int64"), key, "right")) - 1
+            i = min(max(i, 0), len(self) - 1)
+        return i
+
+    def date(self, i: int) -> pd.Timestamp:
+        return pd.Timestamp(self.dates[i])
+
+    def curve(self, date, max_leg: int | None = None) -> np.ndarray:
+        """Tenor‑filled curve for one date."""
+        return self.curve_at(self.row(date), max_leg)
+
+    def curve_at(self, i: int, max_leg: int | None = None) -> np.ndarray:
+        y = _fill_tenors(self.values[i])
+        return y if max_leg is None else y[self.months <= max_leg]
+
+    def tenor_names(self, max_leg: int | None = None) -> List[str]:
+        if max_leg is None:
+            return list(self.tenors)
+        return [t for t, m in zip(self.tenors, self.months) if m <= max_leg]
+
+    def with_tail(self, k: int, dates: np.ndarray, values: np.ndarray) -> "CurveCube":
+        """Rows [0, k) of this cube followed by `dates` / `values` (a live tail)."""
+        out = object.__new__(CurveCube)
+        out.dates = np.concatenate([self.dates[:k], np.asarray(dates, dtype="datetime64[ns]")])
+        out.values = np.ascontiguousarray(
+            np.concatenate([self.values[:k], np.asarray(values, dtype=float)]))
+        out.tenors, out.months = self.tenors, self.months
+        row = dict(self._row)                   # only the tail's keys change
+        for d in self.dates[k:].view("int64").tolist():
+            del row[d]
+        row.update((d, k + i) for i, d in enumerate(out.dates[k:].view("int64").tolist()))
+        out._row = row
+        return out
+
+    def block(self, start: int = 0, stop: int | None = None,
+              max_leg: int | None = None) -> np.ndarray:
+        """View (no copy) of rows [start, stop) up to `max_leg`."""
+        cols = len(self.tenors) if max_leg is None else int((self.months <= max_leg).sum())
+        return self.values[start:stop, :cols]
+
+    @timed("curve_cube.frames")
+    def frames(self, start=None, end=None, max_leg: int | None = 12,
+               every: int = 1, max_frames: int | None = None) -> CurveFrames:
+        """
+        Curves from start to end (inclusive) as playback frames.  Rows that
+        repeat the previous curve (ffilled weekends / holidays) are dropped,
+        then every `every`‑th frame is kept, counting back from `end`;
+        `every` is raised as needed to keep at most `max_frames`.
+        """
+        d = self.dates.view("int64")
+        lo = 0 if start is None else int(np.searchsorted(d, pd.Timestamp(start).value, "left"))
+        hi = len(self) if end is None else int(np.searchsorted(d, pd.Timestamp(end).value, "right"))
+        Y = _fill_tenors(self.block(lo, hi, max_leg))
+        keep = np.flatnonzero(np.r_[True, (Y[1:] != Y[:-1]).any(axis=1)] if len(Y) else [])
+        every = max(int(every), 1)
+        if max_frames:
+            every = max(every, -(-len(keep) // int(max_frames)))
+        keep = keep[::-1][::every][::-1]
+        Y = Y[keep]
+        back = np.empty(Y.shape, dtype=bool)
+        back[:, :1] = True
+        back[:, 1:] = Y[:, :-1] > Y[:, 1:]
+        return CurveFrames(self.dates[lo:hi][keep], self.tenor_names(max_leg),
+                           Y.astype(np.float32), back)
+
+    def frame(self, max_leg: int | None = None) -> pd.DataFrame:
+        return pd.DataFrame(self.block(max_leg=max_leg),
+                            index=pd.DatetimeIndex(self.dates, name="Date (Day)"),
+                            columns=self.tenor_names(max_leg))
+
+
+@timed()
+def build_curve_cube(df: pd.DataFrame, max_leg: int = 24) -> CurveCube:
+    """
+    Cube of the numeric %CL n! legs (n ≤ max_leg).
+    Accepts the loader frame ('Date (Day)' column) or a date‑indexed frame.
+    """
+    tenors = [c for c in list_legs(df, max_leg) if _LEG_RE_PCT.fullmatch(c)]
+    if "Date (Day)" in df.columns:
+        dates = pd.to_datetime(df["Date (Day)"]).to_numpy()
+    else:
+        dates = pd.DatetimeIndex(df.index).to_numpy()
+    return CurveCube(dates, df[tenors].to_numpy(dtype=float), tenors)
+
+
+def as_curve_cube(data, max_leg: int = 24) -> CurveCube:
+    """Pass a CurveCube through; build one from a DataFrame."""
+    return data if isinstance(data, CurveCube) else build_curve_cube(data, max_leg)
@@ -0,0 +1,227 @@
+"""
+curve_pca.py  – rolling level / slope / curvature factors of the %CL curve
+--------------------------------------------------------------------------
+The window covariance is updated incrementally (add today's curve,
+drop the oldest: O(n²) per day instead of O(w·n²)), and the top
+eigenvectors are warm‑started from yesterday's with a couple of
+subspace iterations + Rayleigh–Ritz.  A full ``eigh`` is only used on
+the first window or when the warm start fails to converge.
+
+The loop state is kept with the result, so ``extend_curve_pca`` pushes
+only a live tail (today's intraday curve) through the window instead of
+re‑running the history.
+
+Factor signs are pinned so the series are comparable through time:
+level  – loadings sum > 0
+slope  – back‑month loading > front‑month loading (contango ⇒ +)
+curv   – wings above the belly
+"""
+
+from __future__ import annotations
+import copy
+import pandas as pd, numpy as np
+from collections import deque
+
+from .curve_cube import as_curve_cube, _fill_tenors
+from ..perf import timed
+
+FACTOR_NAMES = ["level", "slope", "curv"]
+
+
+def _orient(Q: np.ndarray) -> np.ndarray:
+    n = Q.shape[0]
+    for j in range(Q.shape[1]):
+        q = Q[:, j]
+        if j == 0:
+            key = q.sum()
+        elif j == 1:
+            key = q[-1] - q[0]
+        elif j == 2:
+            key = (q[0] + q[-1]) / 2 - q[n // 2]
+        else:
+            key = q[np.argmax(np.abs(q))]
+        if key < 0:
+            Q[:, j] = -q
+    return Q
+
+
+def _top_eig(C: np.ndarray, k: int):
+    w, V = np.linalg.eigh(C)
+    return V[:, ::-1][:, :k].copy()
+
+
+class _Window:
+    """Running sums + warm‑started eigenvectors of the rolling window."""
+
+    def __init__(self, n: int, k: int, window: int, n_iter: int, guard: int,
+                 refresh: int, tol: float, max_leg: int):
+        self.k, self.p = k, min(k + guard, n)        # iterate a slightly wider block
+        self.window, self.n_iter, self.refresh, self.tol = window, n_iter, refresh, tol
+        self.max_leg = max_leg
+        self.s1, self.s2 = np.zeros(n), np.zeros((n, n))
+        self.buf: deque = deque()                    # curves in the window
+        self.Q = None
+        self.steps = 0
+
+    def copy(self) -> "_Window":
+        c = copy.copy(self)
+        c.s1, c.s2, c.buf = self.s1.copy(), self.s2.copy(), deque(self.buf)
+        c.Q = None if self.Q is None else self.Q.copy()
+        return c
+
+    def push(self, x: np.ndarray):
+        """Add curve `x` (dropping the oldest); (loadings, score, explained) once full."""
+        self.buf.append(x)
+        self.s1 += x
+        self.s2 += np.outer(x, x)
+        if len(self.buf) > self.window:
+            old = self.buf.popleft()
+            self.s1 -= old
+            self.s2 -= np.outer(old, old)
+        self.steps += 1
+        if self.steps % self.refresh == 0:
+            W = np.array(self.buf)
+            self.s1, self.s2 = W.sum(axis=0), W.T @ W
+        if len(self.buf) < self.window:
+            return None
+
+        k, m = self.k, len(self.buf)
+        mu = self.s1 / m
+        C = (self.s2 - m * np.outer(mu, mu)) / (m - 1)
+
+        if self.Q is None:
+            Q = _top_eig(C, self.p)
+        else:
+            Q = self.Q
+            for _ in range(self.n_iter):
+                Q, _ = np.linalg.qr(C @ Q)
+            lam, U = np.linalg.eigh(Q.T @ C @ Q)
+            lam, Q = lam[::-1], Q @ U[:, ::-1]
+            resid = np.linalg.norm(C @ Q[:, :k] - Q[:, :k] * lam[:k], axis=0)
+            if (resid > self.tol * np.maximum(np.abs(lam[:k]), 1e-12)).any():
+                Q = _top_eig(C, self.p)
+        self.Q = Q
+        Qk = _orient(Q[:, :k])
+
+        lam = np.einsum("ij,ik,kj->j", Qk, C, Qk)
+        return Qk.T, (x - mu) @ Qk, lam / np.trace(C)
+
+
+def _scan(state: _Window, X: np.ndarray, loadings, scores, explained) -> _Window:
+    """Push the rows of X; returns a copy of the state before the last row."""
+    prev = state
+    for t in range(len(X)):
+        if t == len(X) - 1:
+            prev = state.copy()
+        x = X[t]
+        if np.isnan(x).any():
+            continue
+        res = state.push(x)
+        if res is not None:
+            loadings[t], scores[t], explained[t] = res
+    return prev
+
+
+class CurvePCA:
+    """Compact result of ``rolling_curve_pca``."""
+
+    def __init__(self, dates, tenors, loadings, scores, explained):
+        self.dates = dates                  # datetime64[ns]   (T,)
+        self.tenors = tenors                # tenor names      (n,)
+        self.loadings = loadings            # float32          (T, k, n)
+        self.scores = scores                # float64          (T, k)
+        self.explained = explained          # variance share   (T, k)
+        self._state: _Window | None = None  # window after the last row
+        self._prev: _Window | None = None   # … and before it
+
+    @property
+    def names(self):
+        k = self.scores.shape[1]
+        return (FACTOR_NAMES + [f"pc{j + 1}" for j in range(3, k)])[:k]
+
+    def scores_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.scores, columns=self.names,
+                            index=pd.DatetimeIndex(self.dates, name="Date (Day)"))
+
+    def loadings_on(self, date) -> pd.DataFrame:
+        """Tenor × factor loadings for the last row on or before `date`."""
+        i = int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(date), "ns"), "right")) - 1
+        return pd.DataFrame(self.loadings[max(i, 0)].T, index=self.tenors,
+                            columns=self.names)
+
+
+@timed()
+def rolling_curve_pca(
+    data,
+    window: int = 252,
+    n_factors: int = 3,
+    max_leg: int = 12,
+    n_iter: int = 3,
+    guard: int = 3,
+    refresh: int = 252,
+    tol: float = 1e-4,
+) -> CurvePCA:
+    """
+    Rolling PCA of curve levels (de‑meaned over the window).
+
+    Parameters
+    ----------
+    data : CurveCube or loader DataFrame
+    window : look‑back in observations
+    n_factors : number of factors kept
+    max_leg : highest %CL leg in the curve
+    n_iter : warm‑start subspace iterations per day
+    guard : extra vectors carried in the iterated block (faster
+            convergence when the minor factors are close in size)
+    refresh : rebuild the running sums from scratch every `refresh`
+              days (bounds floating‑point drift of add / remove)
+    tol : per‑factor relative residual above which the warm start
+          falls back to eigh
+
+    Returns
+    -------
+    CurvePCA (rows before the first full window are NaN).
+    """
+    cube = as_curve_cube(data)
+    X = _fill_tenors(cube.block(max_leg=max_leg))
+    T, n = X.shape
+    k = min(n_factors, n)
+
+    loadings = np.full((T, k, n), np.nan, dtype=np.float32)
+    scores = np.full((T, k), np.nan)
+    explained = np.full((T, k), np.nan)
+
+    state = _Window(n, k, window, n_iter, guard, refresh, tol, max_leg)
+    prev = _scan(state, X, loadings, scores, explained)
+    out = CurvePCA(cube.dates, cube.tenor_names(max_leg), loadings, scores, explained)
+    out._state, out._prev = state, prev
+    return out
+
+
+@timed()
+def extend_curve_pca(pca: CurvePCA, cube, k: int) -> CurvePCA:
+    """
+    `pca` for `cube`, whose rows [0, k) are the rows `pca` was built on
+    and whose later rows are new (a live tail replacing at most the last
+    row).  Only the tail goes through the window: one add / drop step per
+    row from the state saved with `pca`.
+    """
+    T = len(pca.dates)
+    if k == T:
+        state = pca._state.copy()
+    elif k == T - 1:
+        state = pca._prev.copy()
+    else:
+        raise ValueError(f"a tail must start at row {T - 1} or {T}, not {k}")
+    cube = as_curve_cube(cube)
+    X = _fill_tenors(cube.block(k, None, state.max_leg))
+    m, (kf, n) = len(X), pca.loadings.shape[1:]
+
+    loadings = np.concatenate([pca.loadings[:k], np.full((m, kf, n), np.nan, dtype=np.float32)])
+    scores = np.concatenate([pca.scores[:k], np.full((m, kf), np.nan)])
+    explained = np.concatenate([pca.explained[:k], np.full((m, kf), np.nan)])
+
+    prev = _scan(state, X, loadings[k:], scores[k:], explained[k:])
+    out = CurvePCA(cube.dates, pca.tenors, loadings, scores, explained)
+    out._state, out._prev = state, prev
+    return out
@@ -0,0 +1,157 @@
+"""
+event_study.py  – spread behaviour around EIA release days
+-----------------------------------------------------------
+    events = release_events(ds.frame, "Cushing Stocks (Mbbl)", ds.provenance)
+    cube   = EventCube(ds.frame, events, list_spreads(ds.frame))
+    means, n = cube.bucket_means(surprise_buckets(events["Surprise"], 3)[0], 3)
+
+An event is one weekly release: the loader stamps each weekly value on
+the following Wednesday (``<metric> (Release)``).  Its surprise is the
+week‑on‑week change minus the average change of the same ISO week over
+the previous `years` years – the workbook has no consensus survey, so
+seasonality is the expectation.
+
+``EventCube`` gathers every series around every event in one fancy‑index
+op into an (events × offsets × series) block of changes vs the base
+offset (default: the settle before the release).  Offsets are rows, i.e.
+sessions under the trading calendar and calendar days otherwise.
+Bucket averages are one tensordot with a bucket indicator matrix.
+"""
+
+from __future__ import annotations
+import warnings
+from typing import Iterable, List, Sequence, Tuple
+
+import pandas as pd, numpy as np
+
+from ..perf import timed
+
+DEFAULT_METRIC = "Cushing Stocks (Mbbl)"
+OFFSETS = range(-5, 11)
+
+
+def release_metrics(df: pd.DataFrame) -> List[str]:
+    """Weekly metrics that have a ``(Release)`` column."""
+    return [c[: -len(" (Release)")] for c in df.columns if c.endswith(" (Release)")]
+
+
+# ── events ──────────────────────────────────────────────────────────
+@timed()
+def release_events(df: pd.DataFrame, metric: str = DEFAULT_METRIC, provenance=None,
+                   expect: str = "seasonal", years: int = 5) -> pd.DataFrame:
+    """
+    One row per release of `metric`:
+
+        Row        position in `df` (first row on the release day)
+        Date       release date
+        Value      released level
+        Change     Value − previous release
+        Expected   mean Change of the same ISO week in the prior `years`
+                   years ("seasonal") or 0 ("none")
+        Surprise   Change − Expected (NaN without enough history)
+    """
+    col = f"{metric} (Release)"
+    if col not in df.columns:
+        raise KeyError(f"no release column for {metric!r}")
+    v = df[col].to_numpy(dtype=float)
+    if provenance is not None and col in provenance:
+        hit = provenance.observed([col])[:, 0]
+    else:                                                  # value changes = releases
+        prev = np.concatenate(([np.nan], v[:-1]))
+        hit = np.isfinite(v) & ~(v == prev)
+    rows = np.flatnonzero(hit & np.isfinite(v))
+    dates = (pd.DatetimeIndex(df["Date (Day)"]) if "Date (Day)" in df.columns
+             else pd.DatetimeIndex(df.index))[rows]
+
+    value = v[rows]
+    change = np.diff(value, prepend=np.nan)
+    if expect == "seasonal":
+        week = np.asarray(dates.isocalendar().week, dtype=np.int64)
+        age = (dates.values[:, None] - dates.values[None, :]) / np.timedelta64(1, "D")
+        peers = (week[:, None] == week[None, :]) & (age > 0) & (age <= 366 * years)
+        peers &= np.isfinite(change)[None, :]
+        with np.errstate(invalid="ignore"):
+            expected = (peers * np.nan_to_num(change)).sum(1) / peers.sum(1)
+    elif expect == "none":
+        expected = np.zeros(len(rows))
+    else:
+        raise ValueError(f"unknown expectation {expect!r}; expected 'seasonal' or 'none'")
+
+    return pd.DataFrame({"Row": rows, "Date": dates, "Value": value, "Change": change,
+                         "Expected": expected, "Surprise": change - expected})
+
+
+def surprise_buckets(surprise: pd.Series | np.ndarray, q: int = 3) -> Tuple[np.ndarray, List[str]]:
+    """
+    Quantile bucket of each event (−1 where the surprise is NaN) and the
+    bucket labels, lowest (largest draw vs expectation) first.
+    """
+    s = pd.Series(np.asarray(surprise, dtype=float))
+    ok = s.notna()
+    codes = np.full(len(s), -1, dtype=np.int64)
+    if ok.sum() < q:
+        return codes, []
+    cut, edges = pd.qcut(s[ok], q, labels=False, retbins=True, duplicates="drop")
+    codes[ok.to_numpy()] = cut.to_numpy()
+    labels = [f"Q{i + 1}  {lo:+,.0f} … {hi:+,.0f}"
+              for i, (lo, hi) in enumerate(zip(edges[:-1], edges[1:]))]
+    return codes, labels
+
+
+# ── cube ────────────────────────────────────────────────────────────
+class EventCube:
+    """events × offsets × series changes around each release."""
+
+    @timed("event_study.cube")
+    def __init__(self, df: pd.DataFrame, events: pd.DataFrame, series: Sequence[str],
+                 offsets: Iterable[int] = OFFSETS, base: int = -1):
+        self.events = events.reset_index(drop=True)
+        self.series = list(series)
+        self.offsets = np.asarray(list(offsets), dtype=np.int64)
+        self.base = base
+
+        V = df[self.series].to_numpy(dtype=float)          # rows × series
+        n = len(V)
+        rows = self.events["Row"].to_numpy(dtype=np.int64)
+        idx = rows[:, None] + np.append(self.offsets, base)[None, :]
+        ok = (idx >= 0) & (idx < n)
+        X = V[np.clip(idx, 0, n - 1)]                      # one gather: events × (offsets+1) × series
+        X[~ok] = np.nan
+        self.values = X[:, :-1] - X[:, -1:]                # vs the base row
+        self.values.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def bucket_means(self, codes: np.ndarray, n_buckets: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(buckets × offsets × series) mean change and observation count."""
+        codes = np.asarray(codes)
+        keep = np.flatnonzero(codes >= 0)
+        B = np.zeros((n_buckets, len(codes)))
+        B[codes[keep], keep] = 1.0
+        ok = np.isfinite(self.values)
+        total = np.tensordot(B, np.where(ok, self.values, 0.0), axes=(1, 0))
+        count = np.tensordot(B, ok.astype(float), axes=(1, 0))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return total / count, count
+
+    def profile(self, col: str, codes: np.ndarray, labels: Sequence[str]) -> pd.DataFrame:
+        """offsets × bucket mean path of one series (plus "All")."""
+        j = self.series.index(col)
+        means, _ = self.bucket_means(codes, len(labels))
+        out = pd.DataFrame(means[:, :, j].T, index=self.offsets, columns=list(labels))
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)      # all‑NaN offsets
+            out["All"] = np.nanmean(self.values[codes >= 0, :, j], axis=0)
+        out.index.name = "Offset"
+        return out
+
+    def table(self, offset: int, codes: np.ndarray, labels: Sequence[str]) -> pd.DataFrame:
+        """series × bucket mean change at `offset`, with the top − bottom gap."""
+        k = int(np.flatnonzero(self.offsets == offset)[0])
+        means, count = self.bucket_means(codes, len(labels))
+        out = pd.DataFrame(means[:, k, :].T, index=self.series, columns=list(labels))
+        if len(labels) > 1:
+            out["Top − bottom"] = out[labels[-1]] - out[labels[0]]
+        out["n"] = count[:, k, :].sum(0).astype(int)
+        return out
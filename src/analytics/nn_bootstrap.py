@@ -0,0 +1,141 @@
+# src/analytics/nn_bootstrap.py
+"""
+Confidence bands for analogue forward outcomes.
+
+For every target spread × horizon the mean forward Δ over the k
+neighbours gets two intervals:
+
+    bootstrap  – resample the neighbours with replacement
+    baseline   – mean Δ of k *random* dates from the whole history,
+                 i.e. what the analogue mean would look like by chance
+
+Both are index resampling: one (draws × k) integer array gathers every
+draw from a (dates × targets·horizons) Δ matrix in a single fancy‑index
+op.  Big requests are cut into fixed chunks with independent seeds
+(``SeedSequence.spawn``) and mapped over a shared process pool; the
+chunking – not the worker count – fixes the random stream, so a result is
+reproducible whether it ran serially or in parallel.
+"""
+
+from __future__ import annotations
+import os, threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List
+import multiprocessing as mp
+
+import pandas as pd, numpy as np
+from ..perf import timed
+from ..jobs import spawn_guard
+
+CHUNK = 2_000               # draws per chunk (unit of parallelism / seeding)
+POOL_MIN_CELLS = 5_000_000  # draws × k × columns before going to the pool
+
+
+def forward_deltas(df: pd.DataFrame, target_cols: List[str],
+                   horizons: Iterable[int]) -> np.ndarray:
+    """dates × (targets · horizons) array of df[t + h] − df[t]; NaN past the end."""
+    V = df[target_cols].to_numpy(dtype=float)
+    n, hs = len(V), list(horizons)
+    out = np.full((n, len(target_cols) * len(hs)), np.nan)
+    for j, h in enumerate(hs):
+        if h < n:
+            out[: n - h, j::len(hs)] = V[h:] - V[: n - h]
+    return out
+
+
+@timed()
+def bootstrap_bands(df: pd.DataFrame,
+                    neighbours: pd.Index,
+                    target_cols: List[str],
+                    horizons: Iterable[int] = (5, 10, 15, 20, 25, 30),
+                    n_boot: int = 5_000,
+                    n_base: int = 5_000,
+                    ci: float = 0.90,
+                    seed: int = 0,
+                    workers: int | None = None) -> pd.DataFrame:
+    """
+    Returns long DataFrame indexed by (Target, Horizon) with
+    n, Mean, Boot lo/hi, Base lo/hi and Pctile (rank of Mean among the
+    random‑date means, 0–100).
+    """
+    hs = list(horizons)
+    D = forward_deltas(df, target_cols, hs)
+    pos = df.index.get_indexer(pd.Index(neighbours))
+    N = D[pos[pos >= 0]]                              # neighbours × columns
+    k = len(N)
+
+    mean = _nanmean(N, axis=0)
+    count = np.isfinite(N).sum(0)
+    ss = np.random.SeedSequence(seed)
+    s_boot, s_base = ss.spawn(2)
+    boot = _resample(N, k, n_boot, s_boot, workers)   # n_boot × columns
+    base = _resample(D, k, n_base, s_base, workers)   # n_base × columns
+
+    a = (1 - ci) / 2 * 100
+    with np.errstate(invalid="ignore"):
+        pct = (base < mean).mean(0) * 100
+    pct[~np.isfinite(mean)] = np.nan
+    cols = pd.MultiIndex.from_product([target_cols, hs], names=["Target", "Horizon"])
+    return pd.DataFrame({
+        "n":       count,
+        "Mean":    mean,
+        "Boot lo": _pctl(boot, a),
+        "Boot hi": _pctl(boot, 100 - a),
+        "Base lo": _pctl(base, a),
+        "Base hi": _pctl(base, 100 - a),
+        "Pctile":  pct,
+    }, index=cols)
+
+
+# ── resampling engine ───────────────────────────────────────────────
+def _draw_chunk(M: np.ndarray, k: int, draws: int, seed) -> np.ndarray:
+    """Means of `draws` samples of k rows of M (with replacement), per column."""
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, len(M), size=(draws, k))
+    return _nanmean(M[idx], axis=1)                   # draws × k × cols → draws × cols
+
+
+def _resample(M: np.ndarray, k: int, draws: int, ss: np.random.SeedSequence,
+              workers: int | None) -> np.ndarray:
+    if k == 0 or len(M) == 0 or draws <= 0:
+        return np.full((max(draws, 0), M.shape[1]), np.nan)
+    sizes = [min(CHUNK, draws - s) for s in range(0, draws, CHUNK)]
+    seeds = ss.spawn(len(sizes))
+    args = [(M, k, n, s) for n, s in zip(sizes, seeds)]
+    if len(sizes) > 1 and draws * k * M.shape[1] >= POOL_MIN_CELLS:
+        pool = _pool(workers)
+        if pool is not None:
+            with spawn_guard():                   # map submits (and spawns) eagerly
+                parts = pool.map(_draw_chunk, *zip(*args))
+            return np.concatenate(list(parts))
+    return np.concatenate([_draw_chunk(*a) for a in args])
+
+
+def _nanmean(a: np.ndarray, axis: int) -> np.ndarray:
+    ok = np.isfinite(a)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(ok, a, 0.0).sum(axis) / ok.sum(axis)
+
+
+def _pctl(a: np.ndarray, q: float) -> np.ndarray:
+    out = np.full(a.shape[1], np.nan)
+    ok = np.isfinite(a).any(0)
+    out[ok] = np.nanpercentile(a[:, ok], q, axis=0)
+    return out
+
+
+_POOL: ProcessPoolExecutor | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def _pool(workers: int | None) -> ProcessPoolExecutor | None:
+    """Process pool shared by every session; None on a single‑core host."""
+    global _POOL
+    n = workers or os.cpu_count() or 1
+    if n < 2:
+        return None
+    with _POOL_LOCK:
+        if _POOL is None:
+            # spawn: Streamlit runs script threads, so forking is not safe
+            _POOL = ProcessPoolExecutor(max_workers=n, mp_context=mp.get_context("spawn"))
+    return _POOL
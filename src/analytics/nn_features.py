@@ -13,6 +13,9 @@ from __future__ import annotations
 import pandas as pd, numpy as np
 from typing import Dict, Callable, List
 
+from .curve_pca import rolling_curve_pca
+from ..perf import timed
+
 # ── feature builders ──────────────────────────────────────────────────
 def fwd_curve_slopes(df: pd.DataFrame) -> pd.DataFrame:
     """M1‑M3, M3‑M6, M6‑M12 $/bbl slopes."""
@@ -41,15 +44,26 @@ def cushing_momentum(df: pd.DataFrame) -> pd.Series:
                  "Cushing Stocks (Mbbl) (Release)",
                  "Cushing Stocks (Mbbl)"]:
         if cand in df.columns:
-            return df[cand].diff(7).rename("ΔCush_1w")
+            s = df[cand]                   # 7 calendar days back, daily or trading rows
+            prev = s.reindex(pd.DatetimeIndex(df.index) - pd.Timedelta(days=7), method="ffill")
+            return (s - prev.to_numpy()).rename("ΔCush_1w")
     # fallback empty series (gets dropped later)
     return pd.Series(dtype=float, name="ΔCush_1w")
 
+def curve_pca_factors(df: pd.DataFrame, pca=None) -> pd.DataFrame:
+    """Rolling 1‑yr PCA level / slope / curvature scores of %CL 1‑12."""
+    pca = rolling_curve_pca(df) if pca is None else pca
+    scores = pca.scores_frame().add_prefix("PCA_")
+    dates = (pd.DatetimeIndex(df["Date (Day)"]) if "Date (Day)" in df.columns
+             else pd.DatetimeIndex(df.index))
+    return scores.reindex(dates).set_axis(df.index)
+
 FEATURE_FUNCS: Dict[str, Callable[[pd.DataFrame], pd.DataFrame | pd.Series]] = {
     "slopes":    fwd_curve_slopes,
     "level_z":   curve_level_z,
     "cush_mom":  cushing_momentum,
 }
+# opt‑in: the scores need a year of warm‑up rows, which dropna() then loses
 
 # headline columns shown in the neighbour table (keep if present)
 HEADLINE_CANDIDATES: List[str] = [
@@ -75,15 +89,19 @@ def limited_features(df: pd.DataFrame) -> pd.DataFrame:
     return X
 
 # ----------------------------------------------------------------------
+@timed()
 def build_feature_matrix(
     df: pd.DataFrame,
-    mode: str = "full"          # "full" | "limited"
+    mode: str = "full",         # "full" | "limited" | "full+pca"
+    pca=None,                   # prebuilt CurvePCA for "full+pca"
 ) -> tuple[pd.DataFrame, pd.DataFrame]:
 
     if mode == "limited":
         X = limited_features(df)
     else:                       # default "full"
         parts = [f(df) for f in FEATURE_FUNCS.values()]
+        if mode == "full+pca":
+            parts.append(curve_pca_factors(df, pca))
         X = pd.concat(parts, axis=1)
         X = (X - X.mean()) / X.std()
 
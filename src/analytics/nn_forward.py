@@ -4,7 +4,9 @@ Compute forward Δ and Sharpe for each neighbour.
 
 import pandas as pd, numpy as np
 from typing import List
+from ..perf import timed
 
+@timed()
 def forward_outcomes(df: pd.DataFrame,
                      neighbours: pd.Index,
                      target_cols: List[str],
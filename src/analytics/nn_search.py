@@ -1,7 +1,11 @@
 # src/analytics/nn_search.py
 import pandas as pd
-from sklearn.neighbors import NearestNeighbors
+from ..perf import timed
+from ..lazy import lazy_module
 
+neighbors = lazy_module("sklearn.neighbors")   # imported on first search
+
+@timed()
 def knn_search(
     X: pd.DataFrame,
     query_date: pd.Timestamp,
@@ -17,7 +21,7 @@ def knn_search(
     base_mask = abs((X.index - qts).days) >= min_gap
     X_train = X.loc[base_mask]
 
-    nbrs = NearestNeighbors(n_neighbors=min(k * 5, len(X_train)))
+    nbrs = neighbors.NearestNeighbors(n_neighbors=min(k * 5, len(X_train)))
     nbrs.fit(X_train.values)
 
     dists, idxs = nbrs.kneighbors(X.loc[[qts]].values)
@@ -0,0 +1,190 @@
+# src/analytics/nn_trajectory.py
+"""
+Trajectory analogues: match the last `window` rows of the feature matrix
+ending on the query date against every other window in history.
+
+    euclid  – lock‑step distance, Σ_t ‖x_t − q_t‖², all windows at once
+    dtw     – dynamic time warping inside a Sakoe‑Chiba band of ±band rows
+
+DTW is made interactive on the full history by
+    • LB_Keogh (query envelope over the band) and LB_Kim (end points)
+      lower bounds, computed for every window with vectorised diagonals;
+    • visiting candidates in lower‑bound order and stopping as soon as the
+      next bound exceeds the k‑th de‑duplicated distance found so far;
+    • batched DTW with early abandoning of rows whose running minimum
+      already exceeds that threshold.
+The pruning is exact – results equal a brute‑force DTW scan.
+
+`min_gap` / `dedup_gap` follow ``knn_search``: window ends within ±min_gap
+days of the query are excluded and neighbours are ≥dedup_gap days apart.
+Windows that straddle a hole in the feature matrix (> `max_step` days
+between rows) are skipped.
+"""
+
+from __future__ import annotations
+import pandas as pd, numpy as np
+from ..perf import timed
+
+_BATCH = 64
+
+
+@timed()
+def trajectory_search(
+    X: pd.DataFrame,
+    query_date: pd.Timestamp,
+    window: int = 20,
+    k: int = 5,
+    min_gap: int = 30,
+    dedup_gap: int = 7,
+    metric: str = "dtw",        # "dtw" | "euclid"
+    band: int | None = None,    # DTW warp radius in rows (default ≈10 % of window)
+    max_step: int = 5,
+    progress=None,              # progress(done, total, msg) – see src.jobs
+) -> pd.DataFrame:
+    """
+    Returns DataFrame indexed by window end ``Date`` with ``Start`` and
+    ``Distance``; ``.attrs["searched"]`` / ``["candidates"]`` count the DTW
+    evaluations versus the windows eligible.
+    """
+    if metric not in ("dtw", "euclid"):
+        raise ValueError(f"unknown metric {metric!r}")
+    qts = pd.Timestamp(query_date)
+    if qts not in X.index:
+        raise ValueError("query_date not in feature matrix")
+
+    A = X.to_numpy(dtype=float)
+    n, w = len(A), int(window)
+    dates = X.index
+    qi = int(dates.get_loc(qts))
+    ends = _valid_ends(dates, w, max_step)
+    if qi < w - 1 or not ends[qi]:
+        raise ValueError(f"need {w} contiguous rows ending on the query date")
+
+    cand = ends & (np.abs((dates - qts).days) >= min_gap)
+    cand = np.flatnonzero(cand)
+
+    Q = A[qi - w + 1: qi + 1]
+    C = _cost(A, Q)                                   # n × w  ‖a_t − q_j‖²
+
+    if metric == "euclid":
+        dist = _diag_sum(C, w)[cand]
+        order = np.argsort(dist, kind="stable")
+        picks = _dedup(dates, cand[order], dist[order], k, dedup_gap)
+        return _frame(dates, w, picks, len(cand), len(cand))
+
+    r = max(1, round(0.1 * w)) if band is None else int(band)
+    r = min(r, w - 1)
+    lb = np.maximum(_diag_sum(_keogh(A, Q, r), w)[cand],
+                    C[cand - w + 1, 0] + C[cand, w - 1] if w > 1 else C[cand, 0])
+    order = np.argsort(lb, kind="stable")
+    cand, lb = cand[order], lb[order]
+
+    got_i, got_d = [cand[:0]], [lb[:0]]
+    tau, searched = np.inf, 0
+    for s in range(0, len(cand), _BATCH):
+        if lb[s] >= tau:
+            break                                     # every later bound is larger
+        if progress is not None:
+            progress(s, len(cand), "DTW")
+        sel = slice(s, s + _BATCH)
+        e = cand[sel][lb[sel] < tau]
+        searched += len(e)
+        d = _dtw_batch(C, e, w, r, tau)
+        keep = np.isfinite(d)
+        got_i.append(e[keep]); got_d.append(d[keep])
+        ei, di = np.concatenate(got_i), np.concatenate(got_d)
+        o = np.argsort(di, kind="stable")
+        picks = _dedup(dates, ei[o], di[o], k, dedup_gap)
+        if len(picks) == k:
+            tau = picks[-1][1]
+
+    ei, di = np.concatenate(got_i), np.concatenate(got_d)
+    o = np.argsort(di, kind="stable")
+    picks = _dedup(dates, ei[o], di[o], k, dedup_gap)
+    return _frame(dates, w, picks, searched, len(cand))
+
+
+# ── helpers ─────────────────────────────────────────────────────────
+def _valid_ends(dates: pd.DatetimeIndex, w: int, max_step: int) -> np.ndarray:
+    """Row i ends a usable window iff rows i‑w+1 … i have no hole > max_step days."""
+    steps = np.diff(dates.asi8) > max_step * 86_400 * 10**9
+    holes = np.concatenate([[0], np.cumsum(steps)])
+    ok = np.zeros(len(dates), dtype=bool)
+    ok[w - 1:] = holes[w - 1:] == holes[: len(dates) - w + 1]
+    return ok
+
+
+def _cost(A: np.ndarray, Q: np.ndarray) -> np.ndarray:
+    """Squared distance of every row of A to every query row (via one GEMM)."""
+    C = (A * A).sum(1)[:, None] + (Q * Q).sum(1)[None, :] - 2.0 * A @ Q.T
+    return np.maximum(C, 0.0, out=C)
+
+
+def _diag_sum(C: np.ndarray, w: int) -> np.ndarray:
+    """out[i] = Σ_j C[i‑w+1+j, j] – per‑window sums; NaN for i < w‑1."""
+    n = len(C)
+    out = np.full(n, np.nan)
+    acc = np.zeros(n - w + 1)
+    for j in range(w):
+        acc += C[j: n - w + 1 + j, j]
+    out[w - 1:] = acc
+    return out
+
+
+def _keogh(A: np.ndarray, Q: np.ndarray, r: int) -> np.ndarray:
+    """n × w LB_Keogh terms: distance of row t to the envelope of query rows j±r."""
+    w = len(Q)
+    out = np.empty((len(A), w))
+    for j in range(w):
+        lo, hi = max(0, j - r), min(w, j + r + 1)
+        U, L = Q[lo:hi].max(0), Q[lo:hi].min(0)
+        out[:, j] = (np.maximum(A - U, 0.0) ** 2 + np.maximum(L - A, 0.0) ** 2).sum(1)
+    return out
+
+
+def _dtw_batch(C: np.ndarray, ends: np.ndarray, w: int, r: int, tau: float) -> np.ndarray:
+    """Banded DTW (squared costs) for windows ending at `ends`; inf once ≥ tau."""
+    if len(ends) == 0:
+        return np.empty(0)
+    rows = ends[:, None] - w + 1 + np.arange(w)        # b × w row positions
+    cost = C[rows]                                     # b × w(cand) × w(query)
+    b = len(ends)
+    prev = np.full((b, w), np.inf)
+    live = np.ones(b, dtype=bool)
+    for i in range(w):
+        cur = np.full((b, w), np.inf)
+        for j in range(max(0, i - r), min(w, i + r + 1)):
+            if i == 0 and j == 0:
+                best = np.zeros(b)
+            else:
+                best = prev[:, j]
+                if j > 0:
+                    best = np.minimum(best, np.minimum(prev[:, j - 1], cur[:, j - 1]))
+            cur[:, j] = cost[:, i, j] + best
+        live &= cur.min(1) < tau                       # early abandon
+        if not live.any():
+            return np.full(b, np.inf)
+        prev = cur
+    out = prev[:, w - 1]
+    out[~live] = np.inf
+    return out
+
+
+def _dedup(dates, idx, dist, k: int, gap: int) -> list:
+    """Greedy ≥gap‑day de‑duplication in distance order (as ``knn_search``)."""
+    keep: list = []
+    for i, d in zip(idx, dist):
+        if all(abs((dates[i] - dates[j]).days) >= gap for j, _ in keep):
+            keep.append((int(i), float(d)))
+            if len(keep) == k:
+                break
+    return keep
+
+
+def _frame(dates, w: int, picks: list, searched: int, total: int) -> pd.DataFrame:
+    idx = [i for i, _ in picks]
+    out = pd.DataFrame({"Date": dates[idx],
+                        "Start": dates[[i - w + 1 for i in idx]],
+                        "Distance": np.sqrt([d for _, d in picks])}).set_index("Date")
+    out.attrs.update(searched=searched, candidates=total)
+    return out
@@ -1,5 +1,8 @@
-import numpy as np, pandas as pd, statsmodels.api as sm
+import numpy as np, pandas as pd
 from itertools import combinations
+from ..lazy import lazy_module
+
+sm = lazy_module("statsmodels.api")          # imported on first OLS / ADF call
 
 # ------------------------------------------------------------------ #
 def pair_data(df: pd.DataFrame, x_col: str, y_col: str, beta: float | None):
@@ -52,10 +55,16 @@ def backtest(df, x_col, y_col,
     return pd.DataFrame({"pos": pos, "equity": equity, "z": z})
 
 # ------------------------------------------------------------------ #
-def batch_scan(df, universe, p_thres=0.05, z_thres=2.0):
-    """Return DataFrame of pairs with |z| > z_thres & p < p_thres."""
+def batch_scan(df, universe, p_thres=0.05, z_thres=2.0, progress=None):
+    """
+    Return DataFrame of pairs with |z| > z_thres & p < p_thres.
+    `progress(done, total, msg)` is called per pair (see ``src.jobs``).
+    """
     results = []
-    for x, y in combinations(universe, 2):
+    pairs = list(combinations(universe, 2))
+    for k, (x, y) in enumerate(pairs):
+        if progress is not None:
+            progress(k, len(pairs), f"{x} / {y}")
         try:
             β, p, resid = engle_granger(df, x, y)
         except Exception:
@@ -65,4 +74,7 @@ def batch_scan(df, universe, p_thres=0.05, z_thres=2.0):
         z_now = zscore(resid).iloc[-1]
         if abs(z_now) >= z_thres:
             results.append({"X": x, "Y": y, "β": β, "ADF_p": p, "z": z_now})
-    return pd.DataFrame(results).sort_values("z", key=np.abs, ascending=False)
+    if progress is not None:
+        progress(len(pairs), len(pairs))
+    out = pd.DataFrame(results, columns=["X", "Y", "β", "ADF_p", "z"])
+    return out.sort_values("z", key=np.abs, ascending=False)
@@ -0,0 +1,87 @@
+"""
+rolling_rank.py  – trailing percentile rank for every spread, every day
+-----------------------------------------------------------------------
+"Where does today sit in its last N observations?"  Each series keeps a
+sorted window (bisect insert / delete), so one step costs O(log w) for
+the search plus a short memmove, instead of re‑ranking the whole window.
+
+Percentiles use the same convention as ``scipy.stats.percentileofscore``
+(kind="rank"), so a window equal to the full history reproduces the
+"Percentile" field of ``summary_stats``.
+"""
+
+from __future__ import annotations
+import pandas as pd, numpy as np
+from bisect import bisect_left, bisect_right, insort
+from typing import Iterable, List
+
+from .term_structure import list_spreads
+from ..perf import timed
+
+DEFAULT_WINDOWS = (63, 252, 756)      # ≈ 3 m, 1 y, 3 y of observations
+
+
+def _rank_path(vals: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+    """Percentile rank of vals[t] inside vals[t-window+1 : t+1]."""
+    out = np.full(len(vals), np.nan)
+    xs = vals.tolist()
+    win: List[float] = []
+    for t, x in enumerate(xs):
+        if t >= window:                                   # drop oldest
+            del win[bisect_left(win, xs[t - window])]
+        insort(win, x)
+        n = len(win)
+        if n >= min_periods:
+            left, right = bisect_left(win, x), bisect_right(win, x)
+            out[t] = (left + right + (left < right)) * 50.0 / n
+    return out
+
+
+def rolling_percentile_rank(
+    s: pd.Series,
+    window: int = 252,
+    min_periods: int | None = None,
+) -> pd.Series:
+    """
+    Trailing percentile rank (0–100) of each observation.
+
+    NaNs are skipped — the window counts real observations — and the
+    result is re‑aligned to the original index (NaN where input is NaN).
+    """
+    if min_periods is None:
+        min_periods = window
+    obs = s.dropna()
+    ranks = _rank_path(obs.to_numpy(dtype=float), window, min_periods)
+    return pd.Series(ranks, index=obs.index, name=s.name).reindex(s.index)
+
+
+@timed()
+def percentile_rank_panel(
+    df: pd.DataFrame,
+    cols: Iterable[str] | None = None,
+    windows: Iterable[int] = DEFAULT_WINDOWS,
+    min_periods: int | None = None,
+) -> pd.DataFrame:
+    """
+    Rolling percentile ranks for a whole spread universe.
+
+    Parameters
+    ----------
+    df : DataFrame with a 'Date (Day)' column
+    cols : series to rank (default = every spread column, see list_spreads)
+    windows : look‑back lengths in observations
+    min_periods : minimum observations before a rank is emitted
+                  (default = window)
+
+    Returns
+    -------
+    DataFrame indexed by date with MultiIndex columns (window, series).
+    """
+    cols = list_spreads(df) if cols is None else list(cols)
+    dfi = df.set_index("Date (Day)")[cols]
+    parts = {
+        w: pd.DataFrame({c: rolling_percentile_rank(dfi[c], w, min_periods)
+                         for c in cols}, index=dfi.index)
+        for w in windows
+    }
+    return pd.concat(parts, axis=1, names=["Window", "Series"])
@@ -0,0 +1,112 @@
+"""
+seasonal.py  – year‑over‑year overlays of any spread / contract series
+---------------------------------------------------------------------
+Each series is reshaped once into a (year × day‑of‑year) matrix and kept
+in a per‑series cache; bands, envelopes and overlays are then plain
+reductions over the year axis.
+
+Day‑of‑year uses a leap‑year calendar (0 … 365) so that 1 Mar is the
+same column in every year and 29 Feb is simply NaN in non‑leap years.
+"""
+
+from __future__ import annotations
+import pandas as pd, numpy as np, warnings
+from typing import Dict, Iterable, Tuple
+from ..perf import timed
+
+N_DOY = 366
+BAND_QUANTILES = (10, 25, 50, 75, 90)
+
+
+def _doy(idx: pd.DatetimeIndex) -> np.ndarray:
+    """0‑based leap‑calendar day‑of‑year."""
+    shift = (~idx.is_leap_year) & (idx.month > 2)
+    return np.asarray(idx.dayofyear - 1 + shift, dtype=np.int64)
+
+
+def doy_axis() -> pd.DatetimeIndex:
+    """Dates in a reference leap year (2000) for plotting the doy axis."""
+    return pd.date_range("2000-01-01", periods=N_DOY, freq="D")
+
+
+class SeasonalEngine:
+    """
+    Seasonal views over the loader frame; matrices cached by column.
+
+    >>> eng = SeasonalEngine(daily_df)
+    >>> eng.bands("Dec Red", exclude_years=[2025])
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+        dates = pd.DatetimeIndex(pd.to_datetime(df["Date (Day)"]))
+        self._year = np.asarray(dates.year, dtype=np.int64)
+        self._doy = _doy(dates)
+        self.years = np.unique(self._year)
+        self._cache: Dict[Tuple[str, bool], np.ndarray] = {}
+
+    # ── core reshape ─────────────────────────────────────────────────
+    @timed()
+    def matrix(self, col: str, rebase: bool = False) -> np.ndarray:
+        """
+        (len(years) × 366) array of `col`; NaN where no observation.
+        rebase=True subtracts each year's first valid value, so paths
+        are compared as changes since 1 Jan.
+        """
+        key = (col, rebase)
+        if key not in self._cache:
+            M = np.full((len(self.years), N_DOY), np.nan)
+            rows = np.searchsorted(self.years, self._year)
+            M[rows, self._doy] = self._df[col].to_numpy(dtype=float)
+            if rebase:
+                valid = ~np.isnan(M)
+                first = np.argmax(valid, axis=1)
+                base = M[np.arange(len(M)), first]
+                M = M - np.where(valid.any(axis=1), base, np.nan)[:, None]
+            self._cache[key] = M
+        return self._cache[key]
+
+    # ── reductions ──────────────────────────────────────────────────
+    def bands(
+        self,
+        col: str,
+        exclude_years: Iterable[int] = (),
+        quantiles: Iterable[int] = BAND_QUANTILES,
+        rebase: bool = False,
+    ) -> pd.DataFrame:
+        """Per‑doy min / max envelope, mean and percentile bands."""
+        M = self.matrix(col, rebase)
+        hist = M[~np.isin(self.years, list(exclude_years))]
+        if not len(hist):                                   # no past years: empty bands
+            hist = np.full((1, N_DOY), np.nan)
+        quantiles = list(quantiles)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)   # all‑NaN doy
+            out = {
+                "min":  np.nanmin(hist, axis=0),
+                "max":  np.nanmax(hist, axis=0),
+                "mean": np.nanmean(hist, axis=0),
+                "n":    (~np.isnan(hist)).sum(axis=0),
+            }
+            pct = np.nanpercentile(hist, quantiles, axis=0)
+        out.update({f"p{q}": pct[i] for i, q in enumerate(quantiles)})
+        return pd.DataFrame(out, index=doy_axis())
+
+    def overlay(self, col: str, years: Iterable[int], rebase: bool = False) -> pd.DataFrame:
+        """doy × year paths for the chosen years."""
+        M = self.matrix(col, rebase)
+        years = [y for y in years if y in set(self.years.tolist())]
+        rows = np.searchsorted(self.years, years)
+        return pd.DataFrame(M[rows].T, index=doy_axis(), columns=years)
+
+    def rank_today(self, col: str, rebase: bool = False) -> float:
+        """Percentile of the latest value vs the same doy in past years."""
+        M = self.matrix(col, rebase)
+        yr, d = self._year[-1], self._doy[-1]
+        now = M[np.searchsorted(self.years, yr), d]
+        past = M[self.years < yr, d]
+        past = past[~np.isnan(past)]
+        if np.isnan(now) or not len(past):
+            return np.nan
+        left, right = (past < now).sum(), (past <= now).sum()
+        return (left + right + (left < right)) * 50.0 / len(past)
@@ -0,0 +1,276 @@
+"""
+spread_expr.py  – linear spread expressions compiled to weight vectors
+-----------------------------------------------------------------------
+    "%CL 1! - 2*%CL 2! + %CL 3!"          M1/M2/M3 butterfly
+    "(CL Z25 - CL Z26) / 2"               half a Dec red
+    "0.5 %CL 1! + 0.5 %CL 2! - %CL 3!"    weighted strip
+
+An expression is parsed once into {leg: weight}.  A ``SpreadEngine``
+stacks many of them into one (legs × expressions) matrix W and evaluates
+them all as P @ W over the outright matrix P (dates × legs), so scanning
+every fly and condor on the curve costs a single matmul.  Results are
+cached per weight vector, so "2*(a - b)" and "2a - 2b" share one column.
+
+Leg names are ``%CL n!`` and ``CL Myy``; the named strips are quoted
+("Prompt Spread", `Dec Red`).  Only linear combinations are
+accepted – a product of two legs is an error.
+"""
+
+from __future__ import annotations
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Sequence
+
+import pandas as pd, numpy as np
+
+from .term_structure import list_legs, _SPECIAL_SPREADS
+from ..perf import timed
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<leg>%CL\ \d+!|CL\ [FGHJKMNQUVXZ]\d{2})
+      | "(?P<dq>[^"]+)" | `(?P<bq>[^`]+)`
+      | (?P<num>(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?)
+      | (?P<op>[-+*/()·×])
+    )""", re.VERBOSE)
+
+
+class ExprError(ValueError):
+    """Malformed or non‑linear spread expression."""
+
+
+# ── parsing ─────────────────────────────────────────────────────────
+def _tokens(text: str) -> List[tuple[str, object]]:
+    out, pos, text = [], 0, text.strip()
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if m is None or m.end() == pos:
+            raise ExprError(f"cannot parse {text[pos:]!r} in {text!r}")
+        pos = m.end()
+        kind = m.lastgroup
+        val = m.group(kind)
+        if kind in ("dq", "bq"):
+            kind = "leg"
+        elif kind == "num":
+            val = float(val)
+        elif val in "·×":
+            val = "*"
+        out.append((kind, val))
+    return out
+
+
+class _Parser:
+    """Recursive descent over linear forms: a form is ({leg: w}, constant)."""
+
+    def __init__(self, text: str):
+        self.text, self.toks, self.i = text, _tokens(text), 0
+
+    def peek(self):
+        return self.toks[self.i] if self.i < len(self.toks) else (None, None)
+
+    def take(self):
+        tok = self.peek(); self.i += 1
+        return tok
+
+    def parse(self):
+        form = self.expr()
+        if self.i != len(self.toks):
+            raise ExprError(f"unexpected {self.peek()[1]!r} in {self.text!r}")
+        return form
+
+    def expr(self):
+        w, c = self.term()
+        while self.peek() in (("op", "+"), ("op", "-")):
+            sign = 1.0 if self.take()[1] == "+" else -1.0
+            w2, c2 = self.term()
+            w = _add(w, w2, sign); c += sign * c2
+        return w, c
+
+    def term(self):
+        w, c = self.factor()
+        while True:
+            kind, val = self.peek()
+            if (kind, val) in (("op", "*"), ("op", "/")):
+                self.take()
+                w2, c2 = self.factor()
+            elif kind in ("leg", "num") or (kind, val) == ("op", "("):
+                val = "*"                                   # implicit: "2 %CL 2!"
+                w2, c2 = self.factor()
+            else:
+                return w, c
+            if val == "/":
+                if w2:
+                    raise ExprError(f"division by a leg in {self.text!r}")
+                if c2 == 0:
+                    raise ExprError(f"division by zero in {self.text!r}")
+                w, c = _scale(w, 1 / c2), c / c2
+            elif w and w2:
+                raise ExprError(f"product of legs is not linear in {self.text!r}")
+            elif w2:
+                w, c = _scale(w2, c), 0.0
+            else:
+                w, c = _scale(w, c2), c * c2
+
+    def factor(self):
+        kind, val = self.take()
+        if kind == "num":
+            return {}, val
+        if kind == "leg":
+            return {val: 1.0}, 0.0
+        if (kind, val) == ("op", "-"):
+            w, c = self.factor()
+            return _scale(w, -1.0), -c
+        if (kind, val) == ("op", "+"):
+            return self.factor()
+        if (kind, val) == ("op", "("):
+            form = self.expr()
+            if self.take() != ("op", ")"):
+                raise ExprError(f"missing ')' in {self.text!r}")
+            return form
+        raise ExprError(f"unexpected {'end' if kind is None else repr(val)} in {self.text!r}")
+
+
+def _add(a: Dict[str, float], b: Dict[str, float], sign: float) -> Dict[str, float]:
+    out = dict(a)
+    for k, v in b.items():
+        out[k] = out.get(k, 0.0) + sign * v
+    return out
+
+
+def _scale(a: Dict[str, float], f: float) -> Dict[str, float]:
+    return {k: v * f for k, v in a.items()}
+
+
+def parse(text: str) -> Dict[str, float]:
+    """{leg: weight} of a linear expression (zero weights dropped)."""
+    w, c = _Parser(text).parse()
+    if c != 0:
+        raise ExprError(f"constant term in {text!r}")
+    w = {k: v for k, v in w.items() if v != 0}
+    if not w:
+        raise ExprError(f"no legs in {text!r}")
+    return w
+
+
+def weight_key(weights: Dict[str, float]) -> tuple:
+    """Exact, order‑free key of a weight dict (the engine's cache key)."""
+    return tuple(sorted(weights.items()))
+
+
+def canonical(weights: Dict[str, float]) -> str:
+    """
+    Stable display text of a weight dict; parses back to the same weights.
+
+    >>> w = {"CL Z25": 1 / 3, "%CL 1!": 1e-05, "%CL 2!": -2.0}
+    >>> canonical(w)
+    '1e-05*%CL 1! - 2*%CL 2! + 0.3333333333333333*CL Z25'
+    >>> parse(canonical(w)) == w
+    True
+    """
+    parts = []
+    for leg, v in sorted(weights.items()):
+        sign = "-" if v < 0 else "+"
+        mag = abs(v)
+        num = repr(float(mag))                     # shortest text that round‑trips
+        coef = "" if mag == 1 else f"{num[:-2] if num.endswith('.0') else num}*"
+        name = leg if _TOKEN.fullmatch(leg) else f'"{leg}"'
+        parts.append(f"{sign} {coef}{name}")
+    s = " ".join(parts)
+    return s[2:] if s.startswith("+ ") else "-" + s[2:]
+
+
+# ── generators ──────────────────────────────────────────────────────
+def flies(legs: Sequence[str], step: int = 1) -> List[str]:
+    """a − 2b + c for every run of three legs `step` apart."""
+    return [f"{legs[i]} - 2*{legs[i + step]} + {legs[i + 2 * step]}"
+            for i in range(len(legs) - 2 * step)]
+
+
+def condors(legs: Sequence[str], step: int = 1) -> List[str]:
+    """a − b − c + d for every run of four legs `step` apart."""
+    return [f"{legs[i]} - {legs[i + step]} - {legs[i + 2 * step]} + {legs[i + 3 * step]}"
+            for i in range(len(legs) - 3 * step)]
+
+
+# ── engine ──────────────────────────────────────────────────────────
+class SpreadEngine:
+    """Evaluate many expressions over one outright matrix with one matmul."""
+
+    def __init__(self, df: pd.DataFrame, legs: Iterable[str] | None = None,
+                 max_cached: int = 1024):
+        if legs is None:
+            legs = list_legs(df) + [c for c in _SPECIAL_SPREADS if c in df.columns]
+        cols = list(legs)
+        self.legs = cols
+        self._col = {c: j for j, c in enumerate(cols)}
+        self.index = (pd.DatetimeIndex(df["Date (Day)"]) if "Date (Day)" in df.columns
+                      else pd.DatetimeIndex(df.index))
+        P = df[cols].to_numpy(dtype=float)
+        self._nan = np.isnan(P).astype(np.float32)         # which cells poison a product
+        self._P = np.nan_to_num(P, nan=0.0)
+        self._parsed: Dict[str, Dict[str, float]] = {}
+        self._cache: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._max = max_cached
+        self._lock = threading.Lock()
+
+    def weights(self, expr: str) -> Dict[str, float]:
+        w = self._parsed.get(expr)
+        if w is None:
+            w = self._parsed[expr] = parse(expr)
+            missing = [k for k in w if k not in self._col]
+            if missing:
+                del self._parsed[expr]
+                raise ExprError(f"unknown leg(s) {missing} in {expr!r}")
+        return w
+
+    def matrix(self, exprs: Sequence[str | Dict[str, float]]) -> np.ndarray:
+        """legs × expressions weight matrix (expressions or parsed weight dicts)."""
+        W = np.zeros((len(self.legs), len(exprs)))
+        for k, e in enumerate(exprs):
+            for leg, v in (self.weights(e) if isinstance(e, str) else e).items():
+                W[self._col[leg], k] = v
+        return W
+
+    @timed("spread_expr.evaluate")
+    def evaluate(self, exprs: Sequence[str] | str) -> pd.DataFrame:
+        """dates × expressions; NaN wherever a leg with non‑zero weight is."""
+        exprs = [exprs] if isinstance(exprs, str) else list(exprs)
+        weights = [self.weights(e) for e in exprs]
+        keys = [weight_key(w) for w in weights]
+        with self._lock:                                   # hits held here survive eviction
+            hits = {k: self._cache[k] for k in keys if k in self._cache}
+            for k in hits:
+                self._cache.move_to_end(k)
+        todo = {k: w for k, w in zip(keys, weights) if k not in hits}
+        fresh: Dict[tuple, np.ndarray] = {}
+        if todo:
+            W = self.matrix(list(todo.values()))
+            out = self._P @ W
+            out[(self._nan @ (W != 0)) > 0] = np.nan
+            for j, k in enumerate(todo):
+                col = out[:, j].copy()
+                col.flags.writeable = False
+                fresh[k] = col
+        cols = [fresh[k] if k in fresh else hits[k] for k in keys]
+        if fresh:
+            with self._lock:
+                self._cache.update(fresh)
+                for k in fresh:
+                    self._cache.move_to_end(k)
+                while len(self._cache) > self._max:
+                    self._cache.popitem(last=False)
+        return pd.DataFrame(np.column_stack(cols) if cols else np.empty((len(self.index), 0)),
+                            index=self.index, columns=exprs)
+
+
+_LOCK = threading.Lock()
+
+
+def engine_for(ds) -> SpreadEngine:
+    """The SpreadEngine of a shared Dataset (built once, cache shared by sessions)."""
+    with _LOCK:
+        eng = getattr(ds, "_spread_engine", None)
+        if eng is None:
+            eng = ds._spread_engine = SpreadEngine(ds.frame)
+    return eng
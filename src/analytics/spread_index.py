@@ -0,0 +1,208 @@
+"""
+spread_index.py  – range‑query index over one spread's history
+--------------------------------------------------------------
+*Built once per (near, far) — every date window is then a cheap query*
+
+The index answers the same questions as ``summary_stats`` for any
+[start, end] window (optionally with excluded sub‑windows, e.g. COVID):
+
+• mean / std          – prefix sums of values and squares      O(1)
+• high / low + dates  – sparse tables of arg‑max / arg‑min      O(1)
+• median / percentile – wavelet matrix over value ranks         O(log n)
+• window → positions  – binary search on the sorted date array  O(log n)
+"""
+
+from __future__ import annotations
+import pandas as pd, numpy as np
+from typing import List, Tuple
+from ..perf import timed
+
+Range = Tuple[int, int]                # half‑open [lo, hi) row positions
+
+
+# ── sparse table (first arg‑max / arg‑min) ────────────────────────────
+def _sparse_table(vals: np.ndarray, better) -> List[np.ndarray]:
+    """
+    table[j][i] = position of the best value in vals[i : i + 2**j].
+    Ties keep the earlier position (matches Series.idxmax / idxmin).
+    """
+    n = len(vals)
+    table = [np.arange(n)]
+    j = 1
+    while (1 << j) <= n:
+        prev, half = table[-1], 1 << (j - 1)
+        left, right = prev[: n - (1 << j) + 1], prev[half: half + n - (1 << j) + 1]
+        table.append(np.where(better(vals[right], vals[left]), right, left))
+        j += 1
+    return table
+
+
+def _sparse_query(table: List[np.ndarray], vals: np.ndarray, better,
+                  lo: int, hi: int) -> int:
+    j = (hi - lo).bit_length() - 1
+    a, b = table[j][lo], table[j][hi - (1 << j)]
+    return int(b) if better(vals[b], vals[a]) else int(a)
+
+
+# ── wavelet matrix over dense value codes ─────────────────────────────
+class _WaveletMatrix:
+    """Rank / k‑th smallest over arbitrary position ranges in O(log σ)."""
+
+    def __init__(self, codes: np.ndarray, sigma: int):
+        self.bits = max(1, int(sigma - 1).bit_length())
+        n = len(codes)
+        self.zeros = np.empty((self.bits, n + 1), dtype=np.int64)
+        self.nz = np.empty(self.bits, dtype=np.int64)
+        cur = codes.astype(np.int64)
+        for lvl, b in enumerate(range(self.bits - 1, -1, -1)):
+            is_zero = ((cur >> b) & 1) == 0
+            self.zeros[lvl, 0] = 0
+            np.cumsum(is_zero, out=self.zeros[lvl, 1:])
+            self.nz[lvl] = self.zeros[lvl, -1]
+            cur = np.concatenate([cur[is_zero], cur[~is_zero]])
+
+    def count_less(self, ranges: List[Range], code: int) -> int:
+        """Number of codes < `code` inside the union of `ranges`."""
+        if code <= 0:
+            return 0
+        if code >= (1 << self.bits):
+            return sum(hi - lo for lo, hi in ranges)
+        total = 0
+        for lvl, b in enumerate(range(self.bits - 1, -1, -1)):
+            z, nz = self.zeros[lvl], self.nz[lvl]
+            nxt = []
+            for lo, hi in ranges:
+                zl, zh = int(z[lo]), int(z[hi])
+                if (code >> b) & 1:
+                    total += zh - zl
+                    nxt.append((nz + lo - zl, nz + hi - zh))
+                else:
+                    nxt.append((zl, zh))
+            ranges = nxt
+        return total
+
+    def kth(self, ranges: List[Range], k: int) -> int:
+        """Code of the k‑th smallest (0‑based) inside the union of `ranges`."""
+        code = 0
+        for lvl, b in enumerate(range(self.bits - 1, -1, -1)):
+            z, nz = self.zeros[lvl], self.nz[lvl]
+            zs = [(int(z[lo]), int(z[hi])) for lo, hi in ranges]
+            n_zero = sum(zh - zl for zl, zh in zs)
+            if k < n_zero:
+                ranges = [(zl, zh) for zl, zh in zs]
+            else:
+                k -= n_zero
+                code |= 1 << b
+                ranges = [(nz + lo - zl, nz + hi - zh)
+                          for (lo, hi), (zl, zh) in zip(ranges, zs)]
+        return code
+
+
+# ── public index ──────────────────────────────────────────────────────
+class SpreadIndex:
+    """
+    Static index over a date‑indexed spread Series (NaNs dropped).
+
+    >>> idx = SpreadIndex(compute_spread(df, near, far)
+    ...                   .set_axis(df["Date (Day)"]))
+    >>> idx.summary(start, end, exclude=[(covid_start, covid_end)])
+    """
+
+    def __init__(self, spread: pd.Series):
+        s = spread.dropna().sort_index()
+        self.dates = s.index.to_numpy(dtype="datetime64[ns]")
+        self.values = s.to_numpy(dtype=float)
+        v = self.values
+
+        # prefix sums (centred → less cancellation in the variance)
+        self._shift = v.mean() if len(v) else 0.0
+        c = v - self._shift
+        self._cs  = np.concatenate([[0.0], np.cumsum(c)])
+        self._cs2 = np.concatenate([[0.0], np.cumsum(c * c)])
+
+        # sparse tables for high / low
+        self._max = _sparse_table(v, np.greater)
+        self._min = _sparse_table(v, np.less)
+
+        # value ranks → wavelet matrix
+        self._uniq, codes = np.unique(v, return_inverse=True)
+        self._wm = _WaveletMatrix(codes, max(len(self._uniq), 1))
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    # ── window → position ranges ─────────────────────────────────────
+    def _pos(self, start, end) -> Range:
+        lo = np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start), "ns"), "left")
+        hi = np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end), "ns"), "right")
+        return int(lo), int(max(hi, lo))
+
+    def ranges(self, start, end, exclude=()) -> List[Range]:
+        """Position ranges for [start, end] minus each (x0, x1) in `exclude`."""
+        out = [self._pos(start, end)]
+        for x0, x1 in exclude:
+            cut_lo, cut_hi = self._pos(x0, x1)
+            nxt = []
+            for lo, hi in out:
+                if cut_hi <= lo or cut_lo >= hi:
+                    nxt.append((lo, hi))
+                    continue
+                if lo < cut_lo:
+                    nxt.append((lo, cut_lo))
+                if cut_hi < hi:
+                    nxt.append((cut_hi, hi))
+            out = nxt
+        return [(lo, hi) for lo, hi in out if hi > lo]
+
+    # ── queries ──────────────────────────────────────────────────────
+    def summary(self, start, end, exclude=()) -> pd.Series:
+        """Same fields as ``spread_summary.summary_stats`` for the window."""
+        rng = self.ranges(start, end, exclude)
+        n = sum(hi - lo for lo, hi in rng)
+        if n == 0:
+            raise ValueError("no observations in selected window")
+
+        v = self.values
+        s1 = sum(self._cs[hi] - self._cs[lo] for lo, hi in rng)
+        s2 = sum(self._cs2[hi] - self._cs2[lo] for lo, hi in rng)
+        mean = self._shift + s1 / n
+        ss = s2 - s1 * s1 / n
+        if ss <= 1e-12 * max(s2, 1.0):          # flat window → exact zero
+            ss = 0.0
+        std = np.sqrt(ss / (n - 1)) if n > 1 else np.nan
+
+        hi_pos = [_sparse_query(self._max, v, np.greater, lo, hi) for lo, hi in rng]
+        lo_pos = [_sparse_query(self._min, v, np.less, lo, hi) for lo, hi in rng]
+        i_max = max(hi_pos, key=lambda p: (v[p], -p))
+        i_min = min(lo_pos, key=lambda p: (v[p], p))
+
+        last = v[rng[-1][1] - 1]
+        code = int(np.searchsorted(self._uniq, last))
+        left = self._wm.count_less(rng, code)
+        right = self._wm.count_less(rng, code + 1)
+        pct = (left + right + (left < right)) * 50.0 / n
+
+        mid = self._uniq[self._wm.kth(rng, (n - 1) // 2)]
+        if n % 2 == 0:
+            mid = (mid + self._uniq[self._wm.kth(rng, n // 2)]) / 2
+
+        return pd.Series({
+            "Last":           last,
+            "Mean":           mean,
+            "Off Avg":        last - mean,
+            "Median":         mid,
+            "StDev":          std,
+            "StDev from Mean": (last - mean) / std if std else np.nan,
+            "Percentile":     pct,
+            "High":           v[i_max],
+            "High Date":      pd.Timestamp(self.dates[i_max]).date(),
+            "Low":            v[i_min],
+            "Low Date":       pd.Timestamp(self.dates[i_min]).date(),
+        })
+
+
+@timed()
+def build_spread_index(df: pd.DataFrame, near: str, far: str) -> SpreadIndex:
+    """Index the ``near - far`` spread of a frame with a 'Date (Day)' column."""
+    s = (df[near] - df[far]).set_axis(pd.to_datetime(df["Date (Day)"]))
+    return SpreadIndex(s)
@@ -1,5 +1,7 @@
 import pandas as pd, numpy as np
-from scipy import stats
+from ..lazy import lazy_module
+
+stats = lazy_module("scipy.stats")           # only summary_stats needs it
 
 def compute_spread(df: pd.DataFrame, near: str, far: str) -> pd.Series:
     return df[near] - df[far]
@@ -1,6 +1,7 @@
 # src/analytics/term_structure.py
 import pandas as pd
 import re
+from ..perf import timed
 
 _LEG_RE_PCT = re.compile(r"%CL (\d+)!")            # %CL 1! … %CL 24!
 _LEG_RE_CAL = re.compile(r"CL [FGHJKMNQUVXZ]\d{2}") # e.g. CL Z25
@@ -13,17 +14,48 @@ def list_legs(df, max_pct_leg=24):
     cal_legs = [c for c in df.columns if _LEG_RE_CAL.fullmatch(c)]
     return sorted(pct_legs, key=lambda c: int(_LEG_RE_PCT.fullmatch(c).group(1))) + sorted(cal_legs)
 
-def curve_on_date(df: pd.DataFrame, date: pd.Timestamp, max_leg: int = 12):
-    """Return Series of curve values for the chosen date."""
-    legs = list_legs(df, max_leg)
-    row = df.loc[date, legs]
-    # if date isn’t trading day → forward-fill so slider shows last known curve
-    return row.ffill().bfill()
+_SPECIAL_SPREADS = ["Prompt Spread", "Dec Red", "Red/Blue", "Blue/Green"]
+
+def list_spreads(df):
+    """Every spread column: loader "near - far" pairs plus the named strips."""
+    return [c for c in df.columns if " - " in c or c in _SPECIAL_SPREADS]
+
+def _by_date(df):
+    return df.set_index("Date (Day)") if "Date (Day)" in df.columns else df
+
+def curve_on_date(df, date: pd.Timestamp, max_leg: int = 12, cube=None):
+    """
+    Return Series of curve values for the chosen date: %CL legs from the
+    curve cube, then the CL Zyy calendar legs when `df` is a DataFrame.
+    """
+    from .curve_cube import as_curve_cube
+    cube = as_curve_cube(df) if cube is None else cube
+    # if date isn’t in the calendar → last known curve, gaps filled across tenors
+    i = cube.row(date)
+    out = pd.Series(cube.curve_at(i, max_leg), index=cube.tenor_names(max_leg),
+                    name=cube.date(i))
+    if isinstance(df, pd.DataFrame):
+        cal = [c for c in list_legs(df, max_leg) if _LEG_RE_CAL.fullmatch(c)]
+        if cal:
+            row = _by_date(df).loc[cube.date(i), cal]
+            out = pd.concat([out, row.astype(float)]).ffill().bfill().rename(cube.date(i))
+    return out
 
 # src/analytics/term_structure.py  (add)
-def kink_radar(df: pd.DataFrame, lookback=90, max_leg=12):
-    legs = list_legs(df, max_leg)
-    diff = df.set_index("Date (Day)")[legs].diff()
+@timed()
+def kink_radar(df, lookback=90, max_leg=12, cube=None):
+    """
+    60‑day z‑score of daily changes per leg (%CL from the curve cube plus
+    the CL Zyy calendar legs when `df` is a DataFrame), last `lookback` rows.
+    """
+    from .curve_cube import as_curve_cube
+    cube = as_curve_cube(df) if cube is None else cube
+    curve = cube.frame(max_leg)
+    if isinstance(df, pd.DataFrame):
+        cal = [c for c in list_legs(df, max_leg) if _LEG_RE_CAL.fullmatch(c)]
+        if cal:
+            curve = curve.join(_by_date(df)[cal])
+    diff = curve.diff()
     z = (diff - diff.rolling(60).mean()) / diff.rolling(60).std()
     z = z.tail(lookback).clip(-3, 3)        # bound so colours pop
     return z
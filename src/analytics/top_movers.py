@@ -1,6 +1,8 @@
 import pandas as pd
 from .term_structure import list_legs
+from ..perf import timed
 
+@timed()
 def top_movers(df: pd.DataFrame, window: int = 60,
                max_leg: int = 12, k: int = 5) -> pd.DataFrame:
     """
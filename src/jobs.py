@@ -0,0 +1,226 @@
+# ─────────────────────────────── src/jobs.py ─────────────────────────────────
+"""
+Cancellable background jobs for heavy analytics.
+
+    job = submit("pairs.batch_scan", frame, legs, key=(ds.fingerprint, tuple(legs)))
+    job_status(job, "Cointegration scan")        # live progress + Cancel button
+    if job.status == "done":
+        table = job.result()
+
+A job runs in a local process pool, so the Streamlit script thread never
+blocks and a widget change does not kill it.  Jobs are keyed by
+(name, key) – normally the dataset fingerprint plus the parameters – and
+kept in one registry for the whole server: a rerun (or another session)
+asking for the same work gets the in‑flight or finished handle back.
+
+A job target is any importable function with a ``progress`` keyword.  It
+calls ``progress(done, total, msg)`` as it goes; the call raises
+``JobCancelled`` once the job has been cancelled, so running work stops at
+its next progress tick.
+"""
+
+from __future__ import annotations
+import importlib, os, sys, threading, time, types, uuid
+import multiprocessing as mp
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Hashable
+
+# name → "module:function"; imported inside the worker
+JOBS: Dict[str, str] = {
+    "pairs.batch_scan":     "src.analytics.pairs:batch_scan",
+    "analogues.trajectory": "src.analytics.nn_trajectory:trajectory_search",
+    "alerts.run":           "src.alerts.engine:run_alerts",
+}
+
+KEEP_FINISHED = 32          # finished jobs kept for reuse
+
+
+class JobCancelled(Exception):
+    """Raised inside a job by ``progress`` after ``Job.cancel()``."""
+
+
+# ── worker side ─────────────────────────────────────────────────────
+class _Reporter:
+    """The ``progress`` callable handed to a job (runs in the worker)."""
+
+    def __init__(self, state, job_id: str):
+        self._state, self._id, self._last = state, job_id, 0.0
+
+    def __call__(self, done: int, total: int, msg: str = "") -> None:
+        now = time.monotonic()
+        if now - self._last < 0.2 and done < total:      # throttle IPC round trips
+            return
+        self._last = now
+        self._state[self._id] = (done, total, msg)
+        if self._state.get(self._id + ":cancel"):
+            raise JobCancelled(self._id)
+
+
+def _run(target: str, job_id: str, state, args, kwargs):
+    mod, fn = target.split(":")
+    func = getattr(importlib.import_module(mod), fn)
+    return func(*args, progress=_Reporter(state, job_id), **kwargs)
+
+
+# ── client side ─────────────────────────────────────────────────────
+class Job:
+    """Handle of one submitted job."""
+
+    def __init__(self, name: str, key: Hashable, future: Future, job_id: str, state):
+        self.name, self.key, self.id = name, key, job_id
+        self.started = time.time()
+        self._future, self._state = future, state
+
+    @property
+    def status(self) -> str:
+        f = self._future
+        if f.cancelled():
+            return "cancelled"
+        if not f.done():
+            return "running" if f.running() else "queued"
+        exc = f.exception()
+        if exc is None:
+            return "done"
+        return "cancelled" if isinstance(exc, JobCancelled) else "failed"
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def progress(self) -> tuple[int, int, str]:
+        """(done, total, message) as last reported by the job."""
+        try:
+            return self._state.get(self.id, (0, 0, ""))
+        except (OSError, EOFError):                       # manager gone at shutdown
+            return 0, 0, ""
+
+    def cancel(self) -> None:
+        if not self._future.cancel():                     # already running → cooperative
+            self._state[self.id + ":cancel"] = True
+
+    def result(self, timeout: float | None = None):
+        """The job's return value; re‑raises its exception."""
+        return self._future.result(timeout)
+
+    def error(self) -> BaseException | None:
+        if not self._future.done() or self._future.cancelled():
+            return None
+        return self._future.exception()
+
+
+_LOCK = threading.Lock()
+_SPAWN_LOCK = threading.Lock()
+_POOL: ProcessPoolExecutor | None = None
+_MANAGER = None
+_REGISTRY: "OrderedDict[tuple, Job]" = OrderedDict()
+
+
+@contextmanager
+def spawn_guard():
+    """
+    Start spawned processes inside this block.  Streamlit executes the page
+    as ``__main__``; a spawned child re‑runs ``__main__`` from its file
+    on start‑up, i.e. it would execute the page (and fail on its
+    session state).  The block swaps in an empty ``__main__`` meanwhile.
+    """
+    with _SPAWN_LOCK:
+        main = sys.modules.get("__main__")
+        if getattr(main, "__spec__", None) is not None or not hasattr(main, "__file__"):
+            yield                                         # a real program: leave it
+            return
+        sys.modules["__main__"] = types.ModuleType("__main__")
+        try:
+            yield
+        finally:
+            sys.modules["__main__"] = main
+
+
+def _pool_and_state():
+    global _POOL, _MANAGER
+    if _POOL is None:
+        ctx = mp.get_context("spawn")          # never fork the threaded Streamlit server
+        with spawn_guard():
+            _MANAGER = ctx.Manager()
+        _POOL = ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) - 1),
+                                    mp_context=ctx)
+    return _POOL, _MANAGER.dict()
+
+
+def _reset_pool() -> None:
+    """Drop a broken pool (a worker died); the next submit starts a fresh one."""
+    global _POOL
+    if _POOL is not None:
+        _POOL.shutdown(wait=False, cancel_futures=True)
+        _POOL = None
+
+
+def submit(name: str, *args, key: Hashable = None, **kwargs) -> Job:
+    """Start job `name` (see ``JOBS``) or return the live / finished one for `key`."""
+    if name not in JOBS:
+        raise KeyError(f"unknown job {name!r}; known: {sorted(JOBS)}")
+    rk = (name, key)
+    with _LOCK:
+        job = _REGISTRY.get(rk)
+        if job is not None and job.status not in ("cancelled", "failed"):
+            _REGISTRY.move_to_end(rk)
+            return job
+        job_id = uuid.uuid4().hex
+        for attempt in (0, 1):
+            pool, state = _pool_and_state()
+            try:
+                with spawn_guard():                       # workers start on demand
+                    fut = pool.submit(_run, JOBS[name], job_id, state, args, kwargs)
+                break
+            except BrokenProcessPool:
+                _reset_pool()
+                if attempt:
+                    raise
+        job = _REGISTRY[rk] = Job(name, key, fut, job_id, state)
+        _evict()
+    return job
+
+
+def find(name: str, key: Hashable = None) -> Job | None:
+    """The registered job for (name, key), if any – never starts one."""
+    with _LOCK:
+        return _REGISTRY.get((name, key))
+
+
+def _evict() -> None:
+    finished = [k for k, j in _REGISTRY.items() if j.done()]
+    for k in finished[: max(0, len(finished) - KEEP_FINISHED)]:
+        del _REGISTRY[k]
+
+
+# ── Streamlit helper ────────────────────────────────────────────────
+def job_status(job: Job, label: str) -> None:
+    """Progress bar + Cancel button that polls `job`; reruns the page when it ends."""
+    import streamlit as st
+
+    was_running = not job.done()
+
+    @st.fragment(run_every=0.5 if was_running else None)
+    def _poll():
+        status = job.status
+        if status in ("queued", "running"):
+            done, total, msg = job.progress()
+            frac = done / total if total else 0.0
+            text = f"{label} — {status} {done}/{total} {msg}".rstrip() if total \
+                else f"{label} — {status} …"
+            c1, c2 = st.columns([5, 1])
+            c1.progress(frac, text=text)
+            if c2.button("Cancel", key=f"cancel_{job.id}"):
+                job.cancel()
+            return
+        if was_running:
+            st.rerun()                                    # hand the result to the page
+        if status == "cancelled":
+            st.caption(f"{label} cancelled.")
+        elif status == "failed":
+            st.error(f"{label} failed: {job.error()}")
+        else:
+            st.caption(f"{label} finished in the background ✔︎")
+
+    _poll()
@@ -0,0 +1,47 @@
+# ─────────────────────────────── src/lazy.py ─────────────────────────────────
+"""
+Module‑level lazy accessors for the heavy scientific dependencies.
+
+    sm = lazy_module("statsmodels.api")      # nothing imported yet
+    sm.OLS(...)                              # first attribute → real import
+
+statsmodels / scikit‑learn / scipy each cost hundreds of ms and tens of MB
+on a cold Streamlit worker; behind a proxy they are only paid by the page
+that actually calls into them.
+"""
+
+from __future__ import annotations
+import importlib
+import threading
+from types import ModuleType
+
+
+class _LazyModule(ModuleType):
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lock"] = threading.Lock()
+        self.__dict__["_mod"] = None
+
+    def _load(self) -> ModuleType:
+        mod = self.__dict__["_mod"]
+        if mod is None:
+            with self.__dict__["_lock"]:            # warm‑up threads may race
+                mod = self.__dict__["_mod"]
+                if mod is None:
+                    mod = self.__dict__["_mod"] = importlib.import_module(self.__name__)
+        return mod
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_mod"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_module(name: str) -> ModuleType:
+    """Proxy for `name` that imports it on first attribute access."""
+    return _LazyModule(name)
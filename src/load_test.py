@@ -0,0 +1,298 @@
+# ─────────────────────────────── src/load_test.py ────────────────────────────
+"""
+Multi‑session load test: N simulated users driving Home.py and every page.
+
+    python -m src.load_test                       # 1, 2, 4, 8 users
+    python -m src.load_test --users 4,16 --rounds 5 --pages Curves,Seasonality
+    python -m src.load_test --json                # one JSON object per level
+
+Every user is a thread with its own headless session (Streamlit's
+``AppTest``) in this one process, so they share ``st.cache_resource``,
+the Dataset and the warm‑up pool exactly like sessions on one server.
+A user uploads the synthetic workbook on Home, then visits the pages in
+random order and on each makes `rounds` random slider / select‑slider /
+multiselect / selectbox / radio changes – one script rerun each.
+
+Per concurrency level the report gives per‑page rerun latency
+percentiles, errors, process CPU seconds (and cores used), and RSS at
+start / peak / end, so cache and memory changes can be checked under
+realistic concurrency.  Buttons are never pressed (no background jobs).
+"""
+
+from __future__ import annotations
+import argparse, datetime as dt, io, json, resource, sys, threading, time, warnings
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd, numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+SESSION_KEYS = ("dataset", "daily_df", "calendar", "intraday_glob")
+TIMEOUT = 300                # seconds per script run (first Home run loads the workbook)
+
+
+# ── synthetic workbook (loader layout) ──────────────────────────────
+def synthetic_workbook(start: str = "2008-01-01", end: str | None = None,
+                       seed: int = 0) -> bytes:
+    """An .xlsx in the layout ``load_daily`` expects: %CL 1–12, CL Zyy, weekly EIA."""
+    rng = np.random.default_rng(seed)
+    end = end or pd.Timestamp.today().normalize() - pd.Timedelta(days=1)
+    dates = pd.bdate_range(start, end)
+    n = len(dates)
+    base = 70 + np.cumsum(rng.normal(0, 1, n))
+    daily = {"Date (Day)": dates}
+    for i in range(1, 13):
+        daily[f"%CL {i}!"] = base - 0.3 * i + np.cumsum(rng.normal(0, 0.05, n))
+    for y in range(dates[0].year, dates[-1].year + 5):
+        col = base - 0.5 * (y - dates[0].year) + rng.normal(0, 0.2, n)
+        col[dates.year > y] = np.nan                         # expired
+        daily[f"CL Z{str(y)[-2:]}"] = col
+    wk = pd.date_range(start, end, freq="W-FRI")
+    weekly = {"Date": wk,
+              "Cushing Stocks (Mbbl)": 40_000 + np.cumsum(rng.normal(0, 500, len(wk))),
+              "Crude Stocks (Mbbl)": 400_000 + np.cumsum(rng.normal(0, 3_000, len(wk)))}
+    weekly.update({f"Metric {j}": 100 + np.cumsum(rng.normal(0, 1, len(wk))) for j in range(13)})
+
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf) as xw:
+        pd.DataFrame(daily).to_excel(xw, sheet_name="Daily Data", startrow=5, index=False)
+        pd.DataFrame(weekly).to_excel(xw, sheet_name="EIA WEEKLY DATA", startrow=2, index=False)
+    return buf.getvalue()
+
+
+# ── random widget interactions ──────────────────────────────────────
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+    except OSError:                                  # macOS: peak, in bytes
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**20
+
+
+def _slider_value(w, rng: np.random.Generator):
+    """Random value (or range, if the slider holds one) inside its bounds."""
+    p = w.proto
+    kinds = {0: int, 1: float, 2: "datetime", 3: "date"}
+    kind = kinds.get(p.data_type)
+    if kind is None or p.max <= p.min:
+        return None
+    steps = max(int((p.max - p.min) / p.step), 1) if p.step else 100
+    picks = sorted(rng.choice(steps + 1, size=2 if len(p.default) > 1 else 1, replace=False))
+    raw = [min(p.min + k * (p.step or (p.max - p.min) / steps), p.max) for k in picks]
+    if kind in (int, float):
+        vals = [kind(v) for v in raw]
+    else:                                            # serialised as µs since the epoch
+        ts = [dt.datetime.fromtimestamp(v / 1e6, tz=dt.timezone.utc).replace(tzinfo=None)
+              for v in raw]
+        vals = [t.date() for t in ts] if kind == "date" else ts
+    return vals if len(vals) > 1 else vals[0]
+
+
+def _raw(w, label: str, kind: type):
+    """A widget value that displays as `label` (options arrive formatted); None if unknown."""
+    for cast in dict.fromkeys((kind, str, int, float)):
+        try:
+            cand = cast(label)
+            if str(w.format_func(cand)) == label:
+                return cand
+        except (TypeError, ValueError, KeyError):
+            continue
+    return None
+
+
+def interact(at, rng: np.random.Generator) -> str | None:
+    """Change one random widget on the current page; returns its kind (None: nothing done)."""
+    widgets = (list(at.slider) + list(at.select_slider) + list(at.multiselect)
+               + list(at.selectbox) + list(at.radio))
+    widgets = [w for w in widgets if not w.proto.disabled]
+    if not widgets:
+        return None
+    w = widgets[rng.integers(len(widgets))]
+    if w.type == "slider":
+        v = _slider_value(w, rng)
+    else:
+        cur = w.value
+        kind = type(cur[0] if isinstance(cur, (list, tuple)) and cur else cur)
+        kind = kind if kind in (str, int, float) else str
+        opts = [o for o in (_raw(w, o, kind) for o in w.options) if o is not None]
+        if len(opts) < 2:
+            return None
+        if w.type == "multiselect":
+            k = int(rng.integers(1, min(len(opts), 6) + 1))
+            v = [opts[i] for i in sorted(rng.choice(len(opts), k, replace=False))]
+        elif w.type == "select_slider" and isinstance(w.value, (tuple, list)):
+            v = [opts[i] for i in sorted(rng.choice(len(opts), 2, replace=False))]
+        else:                                        # selectbox / radio / select_slider
+            v = opts[rng.integers(len(opts))]
+    if v is None:
+        return None
+    w.set_value(v)
+    return w.type
+
+
+# ── simulated users ─────────────────────────────────────────────────
+def pages(only: List[str] | None = None) -> List[Path]:
+    found = sorted((ROOT / "pages").glob("*.py"))
+    if only:
+        found = [p for p in found if any(o.lower() in p.stem.lower() for o in only)]
+    return found
+
+
+class _Recorder:
+    """Thread‑safe (page → latencies, errors) table."""
+
+    def __init__(self):
+        self.lat: Dict[str, List[float]] = defaultdict(list)
+        self.err: Dict[str, List[str]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def run(self, at, page: str) -> bool:
+        t0 = time.perf_counter()
+        try:
+            at.run(timeout=TIMEOUT)
+            errors = [e.message.splitlines()[0][:200] for e in at.exception]
+        except Exception as exc:                      # timeout, AppTest failure
+            errors = [f"{type(exc).__name__}: {exc}"[:200]]
+        wall = time.perf_counter() - t0
+        with self._lock:
+            self.lat[page].append(wall)
+            self.err[page].extend(errors)
+        return not errors
+
+    def error(self, page: str, msg: str) -> None:
+        with self._lock:
+            self.err[page].append(msg[:200])
+
+
+def _share_runtime() -> None:
+    """
+    AppTest assumes one test at a time: each run installs a mock Runtime
+    and clears it when done, which pulls it from under the other sessions'
+    script threads.  Hand them the last installed one meanwhile.
+    """
+    from streamlit.runtime.runtime import Runtime
+    if getattr(Runtime.instance, "_load_test", False):
+        return
+    original = Runtime.instance.__func__
+    last = []
+
+    def instance(cls):
+        if cls._instance is not None:
+            last[:] = [cls._instance]
+            return cls._instance
+        return last[0] if last else original(cls)
+
+    instance._load_test = True
+    Runtime.instance = classmethod(instance)
+
+
+def _user(uid: int, raw: bytes, key: str, scripts: List[Path], rounds: int,
+          seed: int, rec: _Recorder) -> None:
+    from streamlit.testing.v1 import AppTest
+    rng = np.random.default_rng([seed, uid])
+
+    home = AppTest.from_file(str(ROOT / "Home.py"), default_timeout=TIMEOUT)
+    home.session_state["xls_bytes"] = raw
+    home.session_state["xls_key"] = key
+    home.session_state["xls_file_id"] = f"load-test-{key}"
+    if not rec.run(home, "Home.py") or "dataset" not in home.session_state:
+        return
+    shared = {k: home.session_state[k] for k in SESSION_KEYS if k in home.session_state}
+
+    for i in rng.permutation(len(scripts)):
+        script = scripts[i]
+        at = AppTest.from_file(str(script), default_timeout=TIMEOUT)
+        for k, v in shared.items():
+            at.session_state[k] = v
+        if not rec.run(at, script.name):
+            continue
+        for _ in range(rounds):
+            try:
+                if interact(at, rng) is None:
+                    break
+            except Exception as exc:                  # widget value the page rejects
+                rec.error(script.name, f"interact: {type(exc).__name__}: {exc}")
+                break
+            rec.run(at, script.name)
+
+
+def run_level(users: int, raw: bytes, key: str, scripts: List[Path],
+              rounds: int, seed: int) -> dict:
+    """Run `users` concurrent sessions once; the report for this level."""
+    _share_runtime()
+    rec = _Recorder()
+    rss = {"start": _rss_mb()}
+    peak = [rss["start"]]
+    stop = threading.Event()
+
+    def _sample():
+        while not stop.wait(0.2):
+            peak[0] = max(peak[0], _rss_mb())
+
+    sampler = threading.Thread(target=_sample, daemon=True)
+    sampler.start()
+    cpu0, t0 = time.process_time(), time.perf_counter()
+    threads = [threading.Thread(target=_user, args=(u, raw, key, scripts, rounds, seed, rec),
+                                name=f"load-user-{u}") for u in range(users)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall, cpu = time.perf_counter() - t0, time.process_time() - cpu0
+    stop.set(); sampler.join()
+    rss["end"] = _rss_mb()
+    rss["peak"] = max(peak[0], rss["end"])
+
+    table = {}
+    for page in sorted(rec.lat):
+        a = np.array(rec.lat[page])
+        p50, p90, p99 = np.percentile(a, [50, 90, 99])
+        table[page] = {"runs": len(a), "p50_s": p50, "p90_s": p90, "p99_s": p99,
+                       "max_s": a.max(), "errors": len(rec.err[page]),
+                       "first_error": rec.err[page][0] if rec.err[page] else None}
+    return {"users": users, "wall_s": wall, "cpu_s": cpu, "cores": cpu / wall if wall else 0.0,
+            "rss_mb": rss, "pages": table}
+
+
+def _print(rep: dict) -> None:
+    r = rep["rss_mb"]
+    print(f"\n── {rep['users']} user(s) · wall {rep['wall_s']:.1f}s · CPU {rep['cpu_s']:.1f}s "
+          f"({rep['cores']:.2f} cores) · RSS {r['start']:.0f} → peak {r['peak']:.0f} "
+          f"→ {r['end']:.0f} MB")
+    print(f"{'page':34s} {'runs':>5s} {'p50 ms':>8s} {'p90 ms':>8s} {'p99 ms':>8s} "
+          f"{'max ms':>8s} {'err':>4s}")
+    for page, s in rep["pages"].items():
+        print(f"{page:34s} {s['runs']:5d} {s['p50_s'] * 1e3:8.0f} {s['p90_s'] * 1e3:8.0f} "
+              f"{s['p99_s'] * 1e3:8.0f} {s['max_s'] * 1e3:8.0f} {s['errors']:4d}")
+        if s["first_error"]:
+            print(f"{'':34s} ↳ {s['first_error']}")
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    ap.add_argument("--users", default="1,2,4,8", help="comma‑separated concurrency levels")
+    ap.add_argument("--rounds", type=int, default=3, help="widget changes per page visit")
+    ap.add_argument("--pages", default="", help="comma‑separated page name filters")
+    ap.add_argument("--start", default="2008-01-01", help="first date of the synthetic workbook")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", action="store_true", help="JSON lines instead of tables")
+    args = ap.parse_args(argv)
+
+    sys.path.insert(0, str(ROOT))
+    warnings.filterwarnings("ignore")
+    from src.preprocessing.dataset import dataset_key
+
+    raw = synthetic_workbook(args.start, seed=args.seed)
+    key = dataset_key(raw)
+    scripts = pages([p for p in args.pages.split(",") if p])
+    for users in (int(u) for u in args.users.split(",") if u):
+        rep = run_level(users, raw, key, scripts, args.rounds, args.seed)
+        if args.json:
+            print(json.dumps(rep, default=float))
+        else:
+            _print(rep)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# ─────────────────────────────── src/perf.py ─────────────────────────────────
+"""
+Hot‑path instrumentation.
+
+    @timed()                          # decorator – stage = module.function
+    def build_feature_matrix(...): ...
+
+    with timed("load.read_daily"):    # context manager – one stage
+        df = pd.read_excel(...)
+
+Every call adds its wall time to a process‑wide table (calls, total, max,
+last).  While ``trace_memory(True)`` is on, the peak bytes allocated
+inside the block are recorded too (tracemalloc; attribution is approximate
+while warm‑up threads overlap).  Each call is also kept in a ring buffer
+for the sidebar panel and emitted as one JSON line on the ``wti.perf``
+logger — set ``WTI_PERF_LOG=<path>`` to append them to a file.
+"""
+
+from __future__ import annotations
+import json, logging, os, threading, time, tracemalloc
+from collections import deque
+from contextlib import ContextDecorator
+from dataclasses import dataclass, replace
+from typing import Dict, List
+
+log = logging.getLogger("wti.perf")
+if os.environ.get("WTI_PERF_LOG"):
+    _h = logging.FileHandler(os.environ["WTI_PERF_LOG"])
+    _h.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(_h)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
+EVENT_BUFFER = 2000          # recent calls kept for download
+
+
+@dataclass
+class Stat:
+    calls: int = 0
+    total: float = 0.0       # seconds
+    max: float = 0.0
+    last: float = 0.0
+    peak: int = 0            # bytes, max over memory‑traced calls
+
+
+_STATS: Dict[str, Stat] = {}
+_EVENTS: deque = deque(maxlen=EVENT_BUFFER)
+_LOCK = threading.Lock()
+_local = threading.local()   # per‑thread stack of open stages
+
+
+# ── memory tracing switch ───────────────────────────────────────────────
+def trace_memory(on: bool) -> None:
+    if on and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not on and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def tracing_memory() -> bool:
+    return tracemalloc.is_tracing()
+
+
+# ── timer ───────────────────────────────────────────────────────────────
+class timed(ContextDecorator):
+    """Time a block or every call of a function under stage `name`."""
+
+    def __init__(self, name: str | None = None):
+        self.name = name
+
+    def __call__(self, fn):
+        if self.name is None:
+            self.name = f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__qualname__}"
+        return super().__call__(fn)
+
+    def __enter__(self):
+        stack = _local.__dict__.setdefault("stack", [])
+        frame = {"mem": None, "hi": 0}
+        if tracemalloc.is_tracing():
+            cur, peak = tracemalloc.get_traced_memory()
+            if stack:                                   # parent keeps its peak so far
+                stack[-1]["hi"] = max(stack[-1]["hi"], peak)
+            tracemalloc.reset_peak()
+            frame["mem"] = cur
+        stack.append(frame)
+        frame["t0"] = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - _local.stack[-1]["t0"]
+        frame = _local.stack.pop()
+        peak = None
+        if frame["mem"] is not None and tracemalloc.is_tracing():
+            peak = max(tracemalloc.get_traced_memory()[1], frame["hi"]) - frame["mem"]
+        _record(self.name, wall, peak, ok=exc_type is None)
+        return False
+
+
+def _record(name: str, wall: float, peak: int | None, ok: bool) -> None:
+    ev = {"ts": round(time.time(), 3), "stage": name,
+          "wall_ms": round(wall * 1e3, 3),
+          "peak_kb": None if peak is None else round(peak / 1024, 1),
+          "thread": threading.current_thread().name, "ok": ok}
+    with _LOCK:
+        s = _STATS.setdefault(name, Stat())
+        s.calls += 1
+        s.total += wall
+        s.max = max(s.max, wall)
+        s.last = wall
+        if peak is not None:
+            s.peak = max(s.peak, peak)
+        _EVENTS.append(ev)
+    if log.isEnabledFor(logging.INFO):
+        log.info(json.dumps(ev))
+
+
+# ── read‑out ────────────────────────────────────────────────────────────
+def snapshot() -> Dict[str, Stat]:
+    with _LOCK:
+        return {k: replace(v) for k, v in _STATS.items()}
+
+
+def events() -> List[dict]:
+    with _LOCK:
+        return list(_EVENTS)
+
+
+def reset() -> None:
+    with _LOCK:
+        _STATS.clear()
+        _EVENTS.clear()
@@ -0,0 +1,144 @@
+# ─────────────────────────── src/preprocessing/contracts.py ──────────────────────
+"""
+Sparse long‑format store for the full calendar contract grid.
+
+Every listed monthly contract (``CL F08`` … ``CL Z35``) over many years is
+hundreds of columns that are empty outside each contract's few years of
+trading.  Instead of widening **daily_df** the loader keeps them here as
+one observation per (date, contract):
+
+    dates      DatetimeIndex of trading days         (shared calendar)
+    contracts  names ordered by expiry               (categorical codes)
+    _start     offsets: contract k owns rows _start[k] : _start[k+1]
+    _day       int32 position into ``dates``        (sorted per contract)
+    _px        float64 price
+
+≈ 12 bytes per quote instead of 8 bytes per (day × contract) cell, and a
+contract's history is a contiguous slice.  Pages get wide frames on
+demand with ``wide(contracts, start, end, index=…)``.
+"""
+
+from __future__ import annotations
+import re
+from typing import Iterable, List
+
+import pandas as pd, numpy as np
+
+_CAL_RE = re.compile(r"CL ([FGHJKMNQUVXZ])(\d{2})")
+MONTH_CODES = "FGHJKMNQUVXZ"
+
+
+def contract_key(name: str) -> tuple[int, int]:
+    """(year, month) of 'CL H26' → (2026, 3); sorts contracts by expiry."""
+    m = _CAL_RE.fullmatch(name)
+    if m is None:
+        raise ValueError(f"not a calendar contract: {name!r}")
+    return 2000 + int(m.group(2)), MONTH_CODES.index(m.group(1)) + 1
+
+
+class ContractStore:
+    """Read‑only (date, contract) → price store; see module docstring."""
+
+    def __init__(self, dates: pd.DatetimeIndex, contracts: List[str],
+                 start: np.ndarray, day: np.ndarray, px: np.ndarray):
+        self.dates = dates
+        self.contracts = contracts
+        self._code = {c: k for k, c in enumerate(contracts)}
+        self._start, self._day, self._px = start, day, px
+        self._t = _ns(dates)
+        for a in (start, day, px):
+            a.flags.writeable = False
+
+    # ── construction ────────────────────────────────────────────────────
+    @classmethod
+    def from_wide(cls, frame: pd.DataFrame, cols: Iterable[str] | None = None) -> "ContractStore":
+        """Observed (non‑NaN, non‑zero) prices of `cols` from a date‑indexed wide frame."""
+        cols = [c for c in (frame.columns if cols is None else cols) if _CAL_RE.fullmatch(c)]
+        cols = sorted(cols, key=contract_key)
+        dates = pd.DatetimeIndex(frame.index)
+        block = frame[cols].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float, copy=True).T
+        block[block == 0] = np.nan                           # loader: zeros are missing
+        ok = np.isfinite(block)                              # contracts × dates
+        counts = ok.sum(axis=1)
+        start = np.zeros(len(cols) + 1, dtype=np.int64)
+        np.cumsum(counts, out=start[1:])
+        k_idx, d_idx = np.nonzero(ok)                        # row‑major ⇒ grouped by contract
+        return cls(dates, cols, start, d_idx.astype(np.int32), block[k_idx, d_idx])
+
+    # ── size ───────────────────────────────────────────────────────────
+    def __len__(self) -> int:
+        return len(self._px)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._code
+
+    @property
+    def nbytes(self) -> int:
+        return self._start.nbytes + self._day.nbytes + self._px.nbytes
+
+    # ── lookups ────────────────────────────────────────────────────────
+    def list_contracts(self, months: str | None = None,
+                       years: Iterable[int] | None = None) -> List[str]:
+        """Contracts filtered by month codes (e.g. 'HMUZ') and/or years."""
+        ys = None if years is None else set(years)
+        out = []
+        for c in self.contracts:
+            y, m = contract_key(c)
+            if months is not None and MONTH_CODES[m - 1] not in months:
+                continue
+            if ys is not None and y not in ys:
+                continue
+            out.append(c)
+        return out
+
+    def _slice(self, name: str) -> slice:
+        k = self._code[name]
+        return slice(int(self._start[k]), int(self._start[k + 1]))
+
+    def life(self, name: str) -> tuple[pd.Timestamp, pd.Timestamp] | None:
+        """First / last quoted date of `name`."""
+        sl = self._slice(name)
+        if sl.start == sl.stop:
+            return None
+        return self.dates[self._day[sl.start]], self.dates[self._day[sl.stop - 1]]
+
+    def series(self, name: str) -> pd.Series:
+        sl = self._slice(name)
+        return pd.Series(self._px[sl], index=self.dates[self._day[sl]], name=name)
+
+    def on_date(self, date, contracts: Iterable[str] | None = None) -> pd.Series:
+        """Last quote on or before `date` of every contract still trading then."""
+        cols = list(self.contracts if contracts is None else contracts)
+        row = self.wide(cols, index=pd.DatetimeIndex([pd.Timestamp(date)])).iloc[0]
+        return row.dropna()
+
+    # ── wide views ─────────────────────────────────────────────────────
+    def wide(self, contracts: Iterable[str] | None = None, start=None, end=None,
+             index: pd.DatetimeIndex | None = None, ffill: bool = True) -> pd.DataFrame:
+        """
+        Dates × contracts frame for [start, end] on `index` (default: the
+        store's trading days).  With `ffill` every date carries the last
+        quote – only inside each contract's life, never after expiry.
+        """
+        cols = list(self.contracts if contracts is None else contracts)
+        idx = self.dates if index is None else pd.DatetimeIndex(index)
+        lo = 0 if start is None else int(idx.searchsorted(pd.Timestamp(start), "left"))
+        hi = len(idx) if end is None else int(idx.searchsorted(pd.Timestamp(end), "right"))
+        idx = idx[lo:hi]
+        t = _ns(idx)
+        out = np.full((len(idx), len(cols)), np.nan)
+        for j, c in enumerate(cols):
+            sl = self._slice(c)
+            if sl.stop == sl.start:
+                continue
+            q = self._t[self._day[sl]]                       # quote times, ascending
+            i = np.searchsorted(q, t, "right") - 1           # last quote ≤ each date
+            ok = (i >= 0) & (t <= q[-1])
+            if not ffill:
+                ok &= q[np.maximum(i, 0)] == t
+            out[ok, j] = self._px[sl][i[ok]]
+        return pd.DataFrame(out, index=idx, columns=cols)
+
+
+def _ns(idx: pd.DatetimeIndex) -> np.ndarray:
+    return idx.as_unit("ns").asi8
@@ -5,6 +5,8 @@ Return **daily_df** ready for the dashboard.
 Key features
 ------------
 • Keeps only %CL 1–12 outrights, plus all CL Zyy December contracts  
+• Every other calendar contract (CL F08 … CL X35) goes to a sparse
+  ``ContractStore`` instead of a mostly‑empty wide column (``load_daily``)
 • Builds every intra‑curve spread, and re‑creates **Prompt Spread** if absent  
 • Adds rolling colour spreads: **Dec Red**, **Red / Blue**, **Blue / Green**  
 • Ingests **EIA WEEKLY DATA** sheet — every weekly metric gets
@@ -14,15 +16,25 @@ Key features
 • Drops legacy helper columns and trims any future‑dated blank rows  
 • All price‑like columns are coerced to numeric, zeros → NaN, then
   ffill + bfill so weekend rows carry the last trading‑day price.
+• Every cell's origin (observed / zero / ffill / bfill / interp /
+  calendar) is kept as packed flag codes in a ``Provenance``
 """
 
 from pathlib import Path
 import pandas as pd, numpy as np, re
 from itertools import combinations
+from src.perf import timed
+from .contracts import ContractStore
+from .provenance import Provenance, Fill, fill_codes, weekly_codes, combine
+from .trading_calendar import row_index
+
+# bump whenever the loader output changes – part of every dataset fingerprint
+LOADER_VERSION = "3"
 
 # ── helpers --------------------------------------------------------------------
 _CL_NUM = re.compile(r"%CL (\d+)!")
 _Z_CON  = re.compile(r"CL Z\d{2}$")
+_CAL_CON = re.compile(r"CL [FGHJKMNQUVXZ]\d{2}$")
 
 def _dec_contract(year: int) -> str:        # 2025 → "CL Z25"
     return f"CL Z{str(year)[-2:]}"
@@ -36,10 +48,27 @@ def load_daily_xlsx(
     xlsx: str | Path,
     daily_sheet: str = "Daily Data",
     weekly_sheet: str = "EIA WEEKLY DATA",
+    calendar: str = "daily",
 ) -> pd.DataFrame:
+    return load_daily(xlsx, daily_sheet, weekly_sheet, calendar)[0]
+
+
+@timed("load_daily")
+def load_daily(
+    xlsx: str | Path,
+    daily_sheet: str = "Daily Data",
+    weekly_sheet: str = "EIA WEEKLY DATA",
+    calendar: str = "daily",
+) -> tuple[pd.DataFrame, ContractStore, Provenance]:
+    """
+    daily_df, the sparse store of every calendar contract and fill provenance.
+    `calendar` = "daily" (every day) or "trading" (CME sessions) – see
+    ``trading_calendar``.
+    """
 
     # 1 ▸ read Daily sheet
-    df = pd.read_excel(xlsx, daily_sheet, skiprows=5, header=0)
+    with timed("load.read_daily"):
+        df = pd.read_excel(xlsx, daily_sheet, skiprows=5, header=0)
     df.columns = df.columns.str.strip()
 
     # ── ensure the date column is called "Date (Day)" ───────────────────
@@ -71,8 +100,9 @@ def load_daily_xlsx(
     # 2 ▸ intra‑curve spreads
     cl_cols = sorted([c for c in df.columns if _CL_NUM.fullmatch(c)],
                      key=lambda c: int(_CL_NUM.fullmatch(c).group(1)))
-    for near, far in combinations(cl_cols, 2):
-        df[f"{near} - {far}"] = df[near] - df[far]
+    with timed("load.spreads"):
+        for near, far in combinations(cl_cols, 2):
+            df[f"{near} - {far}"] = df[near] - df[far]
 
     
 
@@ -89,27 +119,39 @@ def load_daily_xlsx(
 
     df = df.loc[:pd.Timestamp.today().normalize()]   # drop future blanks
 
+    # 5b ▸ calendar contracts → sparse store (Dec Z stays wide for colour spreads)
+    cal_cols = [c for c in df.columns if _CAL_CON.fullmatch(c)]
+    with timed("load.contract_store"):
+        contracts = ContractStore.from_wide(df, cal_cols)
+    df = df.drop(columns=[c for c in cal_cols if not _Z_CON.fullmatch(c)])
+
     # 6 ▸ read EIA WEEKLY DATA
-    weekly = pd.read_excel(xlsx, weekly_sheet, skiprows=2, header=0, usecols="A:P")
+    with timed("load.read_weekly"):
+        weekly = pd.read_excel(xlsx, weekly_sheet, skiprows=2, header=0, usecols="A:P")
     weekly.rename(columns={weekly.columns[0]: "Date"}, inplace=True)
     weekly.columns = weekly.columns.str.strip()
     weekly["Date"] = pd.to_datetime(weekly["Date"])
     weekly = weekly.set_index("Date").sort_index()
 
+    prov: dict[str, np.ndarray] = {}        # column → Fill codes on df.index
+
     def _add_weekly(series: pd.Series, label: str):
         rel = series.copy(); rel.index = rel.index.map(_next_wed)
         df[f"{label} (Release)"] = rel.reindex(df.index).ffill()
         interp = (series.reindex(df.index).interpolate("time").ffill().bfill())
         df[f"{label} (Interp)"] = interp
+        prov[f"{label} (Release)"] = weekly_codes(df.index, rel.index, interp=False)
+        prov[f"{label} (Interp)"] = weekly_codes(df.index, series.index, interp=True)
 
-    for col in weekly.columns:
-        _add_weekly(weekly[col].dropna(), col)
+    with timed("load.add_weekly"):
+        for col in weekly.columns:
+            _add_weekly(weekly[col].dropna(), col)
 
-    # ensure Cushing series exists
-    if "Cushing Stocks (Mbbl)" in df.columns:
-        _add_weekly(df["Cushing Stocks (Mbbl)"].dropna(), "Cushing Stocks (Mbbl)")
-    elif "Cushing Stocks (Mbbl)" in weekly.columns:
-        _add_weekly(weekly["Cushing Stocks (Mbbl)"].dropna(), "Cushing Stocks (Mbbl)")
+        # ensure Cushing series exists
+        if "Cushing Stocks (Mbbl)" in df.columns:
+            _add_weekly(df["Cushing Stocks (Mbbl)"].dropna(), "Cushing Stocks (Mbbl)")
+        elif "Cushing Stocks (Mbbl)" in weekly.columns:
+            _add_weekly(weekly["Cushing Stocks (Mbbl)"].dropna(), "Cushing Stocks (Mbbl)")
 
     # 7 ▸ forward/back‑fill price‑like columns (zeros → NaN)
     special = ["Prompt Spread", "Dec Red", "Red/Blue", "Blue/Green"]
@@ -117,38 +159,60 @@ def load_daily_xlsx(
                   if _CL_NUM.fullmatch(c) or _Z_CON.fullmatch(c)
                   or " - " in c or c in special]
 
-    df[price_like] = (df[price_like]
-                      .replace(0, np.nan)
-                      .ffill()
-                      .bfill())
-
-    # 8 ▸ calendar reindex (fill holidays/weekends)
-    full_idx = pd.date_range(df.index.min(), df.index.max(), freq="D")
-    df = df.reindex(full_idx)
-    df[price_like] = df[price_like].ffill().bfill()
+    with timed("load.fill"):
+        prov.update(zip(price_like, fill_codes(df[price_like]).T))
+        df[price_like] = (df[price_like]
+                          .replace(0, np.nan)
+                          .ffill()
+                          .bfill())
+
+    # 8 ▸ calendar reindex (fill holidays/weekends – or only missing sessions)
+    with timed("load.calendar_reindex"):
+        full_idx = row_index(df.index.min(), df.index.max(), calendar).union(df.index)
+        pos = df.index.get_indexer(full_idx)
+        added = pos < 0
+        for c in df.columns:
+            base = prov.get(c)
+            if base is None:                  # untouched column: observed iff present
+                base = np.where(df[c].notna(), Fill.OBSERVED, 0).astype(np.uint8)
+            filled = c in price_like and bool((base & Fill.OBSERVED).any())
+            prov[c] = np.where(added, Fill.CALENDAR | (Fill.FFILL if filled else 0),
+                               base[pos]).astype(np.uint8)
+        df = df.reindex(full_idx)
+        df[price_like] = df[price_like].ffill().bfill()
 
     # 3 ▸ Prompt Spread
     if "Prompt Spread" not in df.columns and {"%CL 1!", "%CL 2!"}.issubset(df.columns):
         df["Prompt Spread"] = df["%CL 1!"] - df["%CL 2!"]
+        prov["Prompt Spread"] = combine(prov["%CL 1!"], prov["%CL 2!"])
 
     # 4 ▸ December colour spreads
     df.reset_index(inplace=True)
     df.rename(columns={"index": "Date (Day)"}, inplace=True)
     df["__YearTmp"] = pd.to_datetime(df["Date (Day)"]).dt.year
-    for name, o1, o2 in [("Dec Red", 0, 1),
-                         ("Red/Blue", 1, 2),
-                         ("Blue/Green", 2, 3)]:
-        lhs = [_dec_contract(y + o1) for y in df["__YearTmp"]]
-        rhs = [_dec_contract(y + o2) for y in df["__YearTmp"]]
-
-        lut = {c: i for i, c in enumerate(df.columns)}
-        lhs_idx = np.array([lut.get(c, -1) for c in lhs])
-        rhs_idx = np.array([lut.get(c, -1) for c in rhs])
-
-        mat = df.to_numpy()
-        row = np.arange(len(df))
-        df[name] = np.where(lhs_idx >= 0, mat[row, lhs_idx], np.nan) - \
-                   np.where(rhs_idx >= 0, mat[row, rhs_idx], np.nan)
+    with timed("load.colour_spreads"):
+        for name, o1, o2 in [("Dec Red", 0, 1),
+                             ("Red/Blue", 1, 2),
+                             ("Blue/Green", 2, 3)]:
+            lhs = [_dec_contract(y + o1) for y in df["__YearTmp"]]
+            rhs = [_dec_contract(y + o2) for y in df["__YearTmp"]]
+
+            lut = {c: i for i, c in enumerate(df.columns)}
+            lhs_idx = np.array([lut.get(c, -1) for c in lhs])
+            rhs_idx = np.array([lut.get(c, -1) for c in rhs])
+
+            mat = df.to_numpy()
+            row = np.arange(len(df))
+            df[name] = np.where(lhs_idx >= 0, mat[row, lhs_idx], np.nan) - \
+                       np.where(rhs_idx >= 0, mat[row, rhs_idx], np.nan)
+
+            codes = np.zeros(len(df), dtype=np.uint8)
+            for a, b in set(zip(lhs, rhs)):
+                if a in prov and b in prov:
+                    rows = (np.asarray(lhs) == a) & (np.asarray(rhs) == b)
+                    codes[rows] = combine(prov[a], prov[b])[rows]
+            prov[name] = codes
     df.drop(columns="__YearTmp", inplace=True, errors="ignore")
 
-    return df
+    provenance = Provenance(df["Date (Day)"], {c: prov[c] for c in df.columns if c in prov})
+    return df, contracts, provenance
@@ -0,0 +1,144 @@
+# ─────────────────────────── src/preprocessing/dataset.py ────────────────────────
+"""
+Read‑only wrapper around the processed **daily_df**.
+
+One ``Dataset`` is built per upload and shared by every page (and, via
+``st.cache_resource``, every session).  Pages never copy or mutate it:
+
+• ``columns`` / ``rows`` / ``by_date`` hand out pandas views — under
+  pandas 3 Copy‑on‑Write a view only materialises the columns a page
+  writes to (on older pandas pages must not write to them at all)
+• ``array`` returns non‑writeable numpy views
+• derived columns (e.g. the Spread Summary "Spread") live in a
+  per‑session ``Overlay`` instead of being added to the shared frame
+
+``fingerprint`` (workbook hash + loader version, computed once at upload)
+is the cache key for anything derived from the data, so lookups never
+rehash the frame.
+"""
+
+from __future__ import annotations
+import hashlib
+import pandas as pd, numpy as np
+from typing import Dict, Iterable, MutableMapping
+
+
+def dataset_key(raw: bytes) -> str:
+    """Fingerprint of an uploaded workbook under the current loader."""
+    from .daily import LOADER_VERSION
+    return f"v{LOADER_VERSION}-{hashlib.blake2b(raw, digest_size=16).hexdigest()}"
+
+
+class Dataset:
+    """Shared, read‑only access to the loader frame."""
+
+    def __init__(self, frame: pd.DataFrame, fingerprint: str | None = None,
+                 contracts=None, provenance=None, calendar: str = "daily"):
+        self._frame = frame
+        self.calendar = calendar            # row calendar: "daily" | "trading"
+        self.contracts = contracts          # ContractStore of the full calendar grid
+        self.provenance = provenance        # Provenance fill codes, row‑aligned with frame
+        self._fingerprint = fingerprint
+        self.dates = pd.DatetimeIndex(pd.to_datetime(frame["Date (Day)"]))
+        self._by_date: pd.DataFrame | None = None
+
+    def __len__(self) -> int:
+        return len(self._frame)
+
+    @property
+    def fingerprint(self) -> str:
+        """Stable content key (hashed from the frame once if not given)."""
+        if self._fingerprint is None:
+            h = hashlib.blake2b(digest_size=16)
+            h.update(repr(list(self._frame.columns)).encode())
+            h.update(pd.util.hash_pandas_object(self._frame, index=True).to_numpy().tobytes())
+            self._fingerprint = "frame-" + h.hexdigest()
+        return self._fingerprint
+
+    # ── frames (views, never copies) ─────────────────────────────────
+    @property
+    def frame(self) -> pd.DataFrame:
+        """The loader frame itself — treat as read‑only."""
+        return self._frame
+
+    @property
+    def by_date(self) -> pd.DataFrame:
+        """Same data indexed by 'Date (Day)' (built once, shares columns)."""
+        if self._by_date is None:
+            fr = self._frame.set_index("Date (Day)")
+            self._by_date = fr if fr.index.is_monotonic_increasing else fr.sort_index()
+        return self._by_date
+
+    def columns(self, cols: Iterable[str]) -> pd.DataFrame:
+        return self._frame[list(cols)]
+
+    def span(self, start=None, end=None) -> slice:
+        """Positional slice of rows with start ≤ date ≤ end (binary search)."""
+        lo = 0 if start is None else self.dates.searchsorted(pd.Timestamp(start), "left")
+        hi = len(self) if end is None else self.dates.searchsorted(pd.Timestamp(end), "right")
+        return slice(int(lo), int(hi))
+
+    def rows(self, start=None, end=None, cols: Iterable[str] | None = None,
+             by_date: bool = False) -> pd.DataFrame:
+        """Contiguous date range as a row slice of the shared frame."""
+        base = self.by_date if by_date else self._frame
+        if cols is not None:
+            base = base[list(cols)]
+        return base.iloc[self.span(start, end)]
+
+    def array(self, cols: Iterable[str], start=None, end=None) -> np.ndarray:
+        """Non‑writeable float block (rows × cols)."""
+        arr = self._frame[list(cols)].iloc[self.span(start, end)].to_numpy(dtype=float)
+        arr.flags.writeable = False
+        return arr
+
+
+class Overlay:
+    """
+    Per‑session derived columns layered over a shared Dataset.
+
+    >>> ov = overlay_for(st.session_state, ds)
+    >>> ov["Spread"] = ds.frame[near] - ds.frame[far]
+    >>> ov.rows(start, end, ["Date (Day)", near, far, "Spread"])
+    """
+
+    def __init__(self, ds: Dataset):
+        self.ds = ds
+        self._cols: Dict[str, pd.Series] = {}
+        self._keys: Dict[str, object] = {}
+
+    def __setitem__(self, name: str, values) -> None:
+        self._cols[name] = pd.Series(np.asarray(values, dtype=float),
+                                     index=self.ds.frame.index, name=name)
+
+    def __getitem__(self, name: str) -> pd.Series:
+        return self._cols[name] if name in self._cols else self.ds.frame[name]
+
+    def derive(self, name: str, key, fn) -> pd.Series:
+        """Column `name` = fn(), recomputed only when `key` changes."""
+        if name not in self._cols or self._keys.get(name) != key:
+            self[name] = fn()
+            self._keys[name] = key
+        return self._cols[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._cols or name in self.ds.frame.columns
+
+    def rows(self, start=None, end=None, cols: Iterable[str] | None = None) -> pd.DataFrame:
+        """Row slice mixing shared and overlay columns (only overlay data is new)."""
+        sl = self.ds.span(start, end)
+        cols = list(self.ds.frame.columns) + list(self._cols) if cols is None else list(cols)
+        base = [c for c in cols if c not in self._cols]
+        out = self.ds.frame[base].iloc[sl]
+        extra = {c: self._cols[c].iloc[sl] for c in cols if c in self._cols}
+        if extra:
+            out = out.assign(**extra)[cols]
+        return out
+
+
+def overlay_for(state: MutableMapping, ds: Dataset) -> Overlay:
+    """The session's overlay for `ds` (a fresh one after a new upload)."""
+    ov = state.get("_overlay")
+    if ov is None or ov.ds is not ds:
+        ov = state["_overlay"] = Overlay(ds)
+    return ov
@@ -0,0 +1,427 @@
+# ─────────────────────────── src/preprocessing/intraday.py ───────────────────────
+"""
+Streaming intraday ingest on top of the uploaded **daily_df**.
+
+Intraday leg prints arrive as CSV files (one or many, appended to while
+the session runs)::
+
+    timestamp,leg,price,volume
+    2025-06-12 14:31:05,%CL 1!,68.42,3
+    2025-06-12 14:31:05,CL Z25,66.10,1
+
+Pipeline (generators end to end, nothing re‑read):
+
+    CsvTail.rows()  →  ticks()  →  IntradayAggregator.update()  →  LiveDaily
+
+• CsvTail remembers its byte offset, so each poll only parses the lines
+  appended since the last one (a truncated / rotated file starts over)
+• the aggregator keeps last / high / low / VWAP per (day, leg); under the
+  trading calendar a print's day is its session (Sunday evening → Monday)
+• LiveDaily keeps the current day's row in the ``load_daily_xlsx`` schema:
+  a tick updates its leg, the ``near - far`` spreads that use it, Prompt
+  Spread and the December colour spreads – nothing else is recomputed.
+  ``dataset()`` stitches the base rows and the live row(s) into a
+  ``LiveDataset`` (one concat per new version, no workbook parsing).
+
+The live analytics patch the base Dataset's warm‑up results instead of
+re‑running them: the curve cube swaps its tail rows, the rolling PCA
+pushes only those rows through its window, alerts and top movers read
+the recent rows they look back over.  One LiveDaily per (dataset, file
+pattern) is shared by every session, and a new version cancels what is
+still queued for the one it supersedes.
+"""
+
+from __future__ import annotations
+import csv, glob, re, threading, time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np, pandas as pd
+import streamlit as st
+
+from .daily import _Z_CON, _dec_contract
+from .dataset import Dataset
+from .trading_calendar import row_index, trading_days
+from .warmup import warmup_for
+
+# header aliases accepted in the CSV files
+_FIELDS = {
+    "time":   ("timestamp", "time", "datetime", "date"),
+    "leg":    ("leg", "symbol", "contract", "ticker"),
+    "price":  ("price", "last", "px", "trade"),
+    "volume": ("volume", "qty", "size", "vol"),
+}
+_SHORT_LEG = re.compile(r"%?CL\s?(\d+)!?")       # "CL1", "CL 1", "%CL1!" → "%CL 1!"
+_COLOURS = [("Dec Red", 0, 1), ("Red/Blue", 1, 2), ("Blue/Green", 2, 3)]
+
+
+
+@dataclass(frozen=True)
+class Tick:
+    ts: pd.Timestamp
+    leg: str
+    price: float
+    volume: float = 1.0
+
+
+# ── 1 ▸ tail CSV files ──────────────────────────────────────────────────
+class CsvTail:
+    """Incremental reader of one growing CSV file."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.pos = 0
+        self.header: List[str] | None = None
+        self._partial = ""
+
+    def rows(self) -> Iterator[Dict[str, str]]:
+        """Rows appended since the previous call (incomplete last line held back)."""
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size < self.pos:                              # truncated / rotated
+            self.pos, self.header, self._partial = 0, None, ""
+        if size == self.pos:
+            return
+        with open(self.path, "r", encoding="utf-8", newline="") as f:
+            f.seek(self.pos)
+            chunk = f.read()
+            self.pos = f.tell()
+        lines = (self._partial + chunk).split("\n")
+        self._partial = lines.pop()
+        for rec in csv.reader(lines):
+            if not rec or not any(x.strip() for x in rec):
+                continue
+            if self.header is None:
+                self.header = [_canonical(h) for h in rec]
+                continue
+            yield dict(zip(self.header, rec))
+
+
+def _canonical(name: str) -> str:
+    key = name.strip().lower()
+    for field, aliases in _FIELDS.items():
+        if key in aliases:
+            return field
+    return key
+
+
+def follow(pattern: str, poll: float = 1.0) -> Iterator[Dict[str, str]]:
+    """Endless row stream from every file matching `pattern` (for scripts)."""
+    tails: Dict[str, CsvTail] = {}
+    while True:
+        yield from poll_rows(pattern, tails)
+        time.sleep(poll)
+
+
+def poll_rows(pattern: str, tails: Dict[str, CsvTail]) -> Iterator[Dict[str, str]]:
+    """One pass over the files matching `pattern`; new files are picked up."""
+    for p in sorted(glob.glob(pattern)):
+        tail = tails.setdefault(p, CsvTail(p))
+        yield from tail.rows()
+
+
+# ── 2 ▸ rows → ticks ────────────────────────────────────────────────────
+def leg_name(sym: str) -> str:
+    """Normalise short symbols to the daily_df column names."""
+    sym = sym.strip()
+    m = _SHORT_LEG.fullmatch(sym)
+    return f"%CL {int(m.group(1))}!" if m else sym
+
+
+def ticks(rows: Iterable[Dict[str, str]]) -> Iterator[Tick]:
+    """Parse rows, silently skipping malformed prints."""
+    for r in rows:
+        try:
+            price = float(r["price"])
+            ts = pd.Timestamp(r["time"])
+        except (KeyError, ValueError, TypeError):
+            continue
+        if not np.isfinite(price) or price == 0:     # loader treats 0 as missing
+            continue
+        try:
+            vol = float(r.get("volume") or 1.0)
+        except ValueError:
+            vol = 1.0
+        yield Tick(ts, leg_name(r.get("leg", "")), price, vol)
+
+
+# ── 3 ▸ per‑day bars ────────────────────────────────────────────────────
+class IntradayAggregator:
+    """
+    Running last / high / low / VWAP per (day, leg).  `session` maps a
+    print's calendar day to the row it belongs to (default: itself).
+    """
+
+    def __init__(self, session: Callable[[pd.Timestamp], pd.Timestamp] | None = None):
+        self._bars: Dict[Tuple[pd.Timestamp, str], list] = {}
+        self._session = session
+
+    def update(self, t: Tick) -> pd.Timestamp:
+        day = t.ts.normalize()
+        if self._session is not None:
+            day = self._session(day)
+        b = self._bars.get((day, t.leg))
+        if b is None:
+            # last, high, low, Σpv, Σv, n, time of last
+            self._bars[(day, t.leg)] = [t.price, t.price, t.price,
+                                        t.price * t.volume, t.volume, 1, t.ts]
+        else:
+            if t.ts >= b[6]:
+                b[0], b[6] = t.price, t.ts
+            b[1] = max(b[1], t.price)
+            b[2] = min(b[2], t.price)
+            b[3] += t.price * t.volume
+            b[4] += t.volume
+            b[5] += 1
+        return day
+
+    def last(self, day: pd.Timestamp, leg: str) -> float:
+        return self._bars[(day, leg)][0]
+
+    def bars(self, day: pd.Timestamp | None = None) -> pd.DataFrame:
+        """Leg × [last, high, low, vwap, volume, prints, time] for `day` (latest if None)."""
+        if not self._bars:
+            return pd.DataFrame(columns=["last", "high", "low", "vwap", "volume", "prints", "time"])
+        day = max(d for d, _ in self._bars) if day is None else pd.Timestamp(day).normalize()
+        rows = {leg: [b[0], b[1], b[2], b[3] / b[4] if b[4] else np.nan, b[4], b[5], b[6]]
+                for (d, leg), b in self._bars.items() if d == day}
+        return pd.DataFrame.from_dict(
+            rows, orient="index",
+            columns=["last", "high", "low", "vwap", "volume", "prints", "time"]).sort_index()
+
+
+# ── 4 ▸ live daily rows ─────────────────────────────────────────────────
+class LiveDaily:
+    """`base` plus the current day's row(s), kept current from ticks."""
+
+    def __init__(self, base: Dataset, pattern: str):
+        self.base = base
+        self.pattern = pattern
+        # trading calendar: a Sunday‑evening Globex print is Monday's session
+        self._sessions: Dict[pd.Timestamp, pd.Timestamp] = {}
+        self.agg = IntradayAggregator(self._session if base.calendar == "trading" else None)
+        self.version = 0
+        self._tails: Dict[str, CsvTail] = {}
+        cols = list(base.frame.columns)
+        self._pos = {c: i for i, c in enumerate(cols)}
+        # spreads touched by each leg: leg → [(col, near, far)]
+        self._spreads: Dict[str, List[Tuple[int, int, int]]] = {}
+        for c in cols:
+            if " - " in c:
+                near, far = c.split(" - ", 1)
+                if near in self._pos and far in self._pos:
+                    for leg in (near, far):
+                        self._spreads.setdefault(leg, []).append(
+                            (self._pos[c], self._pos[near], self._pos[far]))
+        self._rows: Dict[pd.Timestamp, np.ndarray] = {}       # live day → row values
+        self._ds: LiveDataset | None = None
+        self._lock = threading.Lock()                          # shared by sessions
+
+    def _session(self, day: pd.Timestamp) -> pd.Timestamp:
+        """First trading day on or after `day`."""
+        s = self._sessions.get(day)
+        if s is None:
+            s = self._sessions[day] = trading_days(day, day + pd.Timedelta(days=10))[0]
+        return s
+
+    # ── ingest ─────────────────────────────────────────────────────────
+    def poll(self) -> int:
+        """Drain new prints from the CSV files; returns ticks applied."""
+        with self._lock:
+            return self._ingest(ticks(poll_rows(self.pattern, self._tails)))
+
+    def ingest(self, stream: Iterable[Tick]) -> int:
+        with self._lock:
+            return self._ingest(stream)
+
+    def _ingest(self, stream: Iterable[Tick]) -> int:
+        n = 0
+        last_base = self.base.dates[-1]
+        for t in stream:
+            if t.leg not in self._pos:
+                continue
+            day = self.agg.update(t)
+            if day < last_base:                            # history is the workbook's
+                continue
+            row = self._row_for(day)
+            self._set_leg(row, t.leg, self.agg.last(day, t.leg), day)
+            n += 1
+        if n:
+            self.version += 1
+            self._supersede()
+        return n
+
+    def _supersede(self) -> None:
+        """Forget the current version; its queued live tasks are dropped."""
+        old, self._ds = self._ds, None
+        if old is not None:
+            warmup_for(old).cancel()
+
+    def _row_for(self, day: pd.Timestamp) -> np.ndarray:
+        row = self._rows.get(day)
+        if row is not None:
+            return row
+        # seed from the previous calendar day (= loader's ffill semantics)
+        prev_days = [d for d in self._rows if d < day]
+        if prev_days:
+            seed = self._rows[max(prev_days)]
+        else:
+            i = self.base.dates.searchsorted(day, "right") - 1
+            seed = self.base.frame.iloc[max(i, 0)].to_numpy(dtype=object)
+        d = (max(prev_days) if prev_days else self.base.dates[-1]) + pd.Timedelta(days=1)
+        if d < day:                                        # fill skipped rows of the calendar
+            for gap in row_index(d, day - pd.Timedelta(days=1), self.base.calendar):
+                self._rows[gap] = seed.copy()
+        row = self._rows[day] = seed.copy()
+        return row
+
+    def _set_leg(self, row: np.ndarray, leg: str, px: float, day: pd.Timestamp) -> None:
+        row[self._pos[leg]] = px
+        for s, near, far in self._spreads.get(leg, ()):
+            row[s] = row[near] - row[far]
+        if leg in ("%CL 1!", "%CL 2!") and "Prompt Spread" in self._pos:
+            row[self._pos["Prompt Spread"]] = row[self._pos["%CL 1!"]] - row[self._pos["%CL 2!"]]
+        if _Z_CON.fullmatch(leg):
+            for name, o1, o2 in _COLOURS:
+                lhs, rhs = _dec_contract(day.year + o1), _dec_contract(day.year + o2)
+                if name in self._pos and lhs in self._pos and rhs in self._pos:
+                    row[self._pos[name]] = row[self._pos[lhs]] - row[self._pos[rhs]]
+
+    # ── output ─────────────────────────────────────────────────────────
+    @property
+    def live_days(self) -> List[pd.Timestamp]:
+        with self._lock:
+            return sorted(self._rows)
+
+    def bars(self, day: pd.Timestamp | None = None) -> pd.DataFrame:
+        with self._lock:
+            return self.agg.bars(day)
+
+    def dataset(self) -> Dataset:
+        """Base rows before the first live day + the live rows (one per version)."""
+        with self._lock:
+            if not self._rows:
+                return self.base
+            if self._ds is None:
+                days = sorted(self._rows)
+                k = int(self.base.dates.searchsorted(days[0], "left"))
+                live = pd.DataFrame([self._rows[d] for d in days], columns=self.base.frame.columns)
+                live["Date (Day)"] = days
+                live = live.astype(self.base.frame.dtypes.to_dict())
+                frame = pd.concat([self.base.frame.iloc[:k], live], ignore_index=True)
+                self._ds = LiveDataset(self.base, k, frame,
+                                       f"{self.base.fingerprint}+live{self.version}")
+                warmup_for(self._ds, LIVE_TASKS)            # live pages only
+            return self._ds
+
+
+_LIVE_LOCK = threading.Lock()
+
+
+def live_daily(ds: Dataset, pattern: str) -> LiveDaily:
+    """The LiveDaily of (ds, pattern), shared by every session."""
+    with _LIVE_LOCK:
+        lives = getattr(ds, "_live", None)
+        if lives is None:
+            lives = ds._live = {}
+        live = lives.get(pattern)
+        if live is None:
+            live = lives[pattern] = LiveDaily(ds, pattern)
+    return live
+
+
+# ── 5 ▸ live analytics (patch the base warm‑up) ─────────────────────────
+class LiveDataset(Dataset):
+    """Rows [0, k) of `base` followed by live rows."""
+
+    def __init__(self, base: Dataset, k: int, frame: pd.DataFrame, fingerprint: str):
+        super().__init__(frame, fingerprint=fingerprint, contracts=base.contracts,
+                         calendar=base.calendar)
+        self.base, self.k = base, k
+
+    def base_result(self, name: str):
+        return warmup_for(self.base).result(name)
+
+
+def _live_curve_cube(w):
+    ds = w.ds
+    cube = ds.base_result("curve_cube")
+    tail = ds.frame[cube.tenors].iloc[ds.k:].to_numpy(dtype=float)
+    return cube.with_tail(ds.k, ds.dates[ds.k:].to_numpy(), tail)
+
+
+def _live_alerts(w):
+    from src.alerts.engine import run_alerts, LOOKBACK
+    return run_alerts(w.ds.frame.iloc[-LOOKBACK:])
+
+
+def _live_top_movers(w):
+    from src.analytics.top_movers import top_movers
+    return top_movers(w.ds.frame.iloc[-61:], window=60, k=7)     # 60 diffs
+
+
+def _live_curve_pca(w):
+    from src.analytics.curve_pca import extend_curve_pca
+    return extend_curve_pca(w.ds.base_result("curve_pca"), w.result("curve_cube"), w.ds.k)
+
+
+# analytics the live pages need, per intraday version
+LIVE_TASKS = {
+    "curve_cube": _live_curve_cube,
+    "alerts":     _live_alerts,
+    "top_movers": _live_top_movers,
+    "curve_pca":  _live_curve_pca,
+}
+
+
+# ── Streamlit helpers ───────────────────────────────────────────────────
+def live_for(state, ds: Dataset) -> LiveDaily | None:
+    """The shared LiveDaily when the session has an intraday file pattern set."""
+    pattern = (state.get("intraday_glob") or "").strip()
+    return live_daily(ds, pattern) if pattern else None
+
+
+def current_dataset() -> Dataset:
+    """Uploaded dataset, with today's intraday row when a feed is configured."""
+    ds = st.session_state["dataset"]
+    live = live_for(st.session_state, ds)
+    if live is None:
+        return ds
+    live.poll()
+    st.session_state["_live_version"] = live.version
+    return live.dataset()
+
+
+def live_bars() -> pd.DataFrame | None:
+    """Latest day's intraday bars of the session's feed (None when not live)."""
+    live = live_for(st.session_state, st.session_state["dataset"])
+    if live is None or not live.live_days:
+        return None
+    return live.bars()
+
+
+def live_refresh(every: float = 15.0) -> None:
+    """Poll the intraday files every `every` s; rerun the page on new prints."""
+    live = live_for(st.session_state, st.session_state["dataset"])
+    if live is None:
+        return
+
+    @st.fragment(run_every=every)
+    def _poll():
+        live.poll()                                # prints may come from any session's poll
+        days = live.live_days
+        if days:
+            bars = live.bars(days[-1])
+            st.caption(f"🔴 Live {days[-1]:%d %b} · {len(bars)} legs · "
+                       f"last print {bars['time'].max():%H:%M:%S}")
+        else:
+            st.caption("🔴 Live feed – waiting for prints …")
+        if live.version != st.session_state.get("_live_version"):
+            st.rerun()
+
+    with st.sidebar:
+        _poll()
+
@@ -0,0 +1,190 @@
+# ─────────────────────────── src/preprocessing/provenance.py ─────────────────────
+"""
+Where every value in **daily_df** came from.
+
+The loader replaces zeros with NaN, forward/back‑fills prices, interpolates
+the weekly EIA series and reindexes onto a full calendar.  It records each
+step in one ``uint8`` per cell — six flag bits packed together, so the
+whole frame costs 1 byte per cell next to the 8‑byte float:
+
+    OBSERVED  value is a real settle / release on that row
+    ZERO      the source had 0 (treated as missing)
+    FFILL     carried forward from an earlier row
+    BFILL     carried back from a later row (before the first observation)
+    INTERP    linear weekly interpolation
+    CALENDAR  row added by the calendar reindex (weekend, holiday, COVID gap)
+
+Derived columns (Prompt Spread, colour spreads) are observed only when
+both legs are; otherwise they inherit the legs' fill bits.
+
+``quality_report`` scans every column at once for stale runs, gaps and
+outliers in the observed points.
+"""
+
+from __future__ import annotations
+import enum, warnings
+from typing import Dict, Iterable, List
+
+import pandas as pd, numpy as np
+
+
+class Fill(enum.IntFlag):
+    OBSERVED = 1
+    ZERO     = 2
+    FFILL    = 4
+    BFILL    = 8
+    INTERP   = 16
+    CALENDAR = 32
+
+
+SYNTHETIC = Fill.FFILL | Fill.BFILL | Fill.INTERP | Fill.CALENDAR
+
+
+# ── code builders (used by the loader) ──────────────────────────────
+def fill_codes(raw: pd.DataFrame) -> np.ndarray:
+    """Codes of `raw` (before zeros → NaN, ffill, bfill) as rows × cols uint8."""
+    v = raw.to_numpy(dtype=float)
+    zero = v == 0
+    valid = np.isfinite(v) & ~zero
+    seen = np.logical_or.accumulate(valid, axis=0)
+    any_ = valid.any(axis=0)
+    codes = np.where(valid, Fill.OBSERVED, 0).astype(np.uint8)
+    codes[zero] |= np.uint8(Fill.ZERO)
+    codes[~valid & seen] |= np.uint8(Fill.FFILL)
+    codes[~valid & ~seen & any_] |= np.uint8(Fill.BFILL)
+    return codes
+
+
+def weekly_codes(index: pd.DatetimeIndex, obs_dates: pd.DatetimeIndex,
+                 interp: bool) -> np.ndarray:
+    """Codes of a weekly series placed on `index` at `obs_dates`."""
+    hit = index.isin(obs_dates)
+    codes = np.where(hit, Fill.OBSERVED, 0).astype(np.uint8)
+    if not hit.any():
+        return codes
+    first, last = np.flatnonzero(hit)[[0, -1]]
+    pos = np.arange(len(index))
+    if interp:
+        codes[~hit & (pos > first) & (pos < last)] |= np.uint8(Fill.INTERP)
+        codes[pos > last] |= np.uint8(Fill.FFILL)
+        codes[pos < first] |= np.uint8(Fill.BFILL)
+    else:
+        codes[~hit & (pos > first)] |= np.uint8(Fill.FFILL)
+    return codes
+
+
+def combine(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Codes of a − b: observed iff both legs are, else the union of fill bits."""
+    both = (a & b & Fill.OBSERVED).astype(bool)
+    return np.where(both, Fill.OBSERVED, (a | b) & ~np.uint8(Fill.OBSERVED)).astype(np.uint8)
+
+
+# ── store ───────────────────────────────────────────────────────────
+class Provenance:
+    """Read‑only rows × columns flag codes, row‑aligned with the loader frame."""
+
+    def __init__(self, dates: pd.DatetimeIndex, codes: Dict[str, np.ndarray]):
+        self.dates = pd.DatetimeIndex(dates)
+        self.columns: List[str] = list(codes)
+        self._pos = {c: j for j, c in enumerate(self.columns)}
+        self._codes = (np.column_stack([codes[c] for c in self.columns]).astype(np.uint8)
+                       if codes else np.zeros((len(self.dates), 0), np.uint8))
+        self._codes.flags.writeable = False
+
+    def __contains__(self, col: str) -> bool:
+        return col in self._pos
+
+    @property
+    def nbytes(self) -> int:
+        return self._codes.nbytes
+
+    def codes(self, cols: Iterable[str] | None = None) -> np.ndarray:
+        """rows × cols uint8 codes (columns without provenance count as observed)."""
+        cols = self.columns if cols is None else list(cols)
+        out = np.full((len(self.dates), len(cols)), Fill.OBSERVED, np.uint8)
+        for j, c in enumerate(cols):
+            if c in self._pos:
+                out[:, j] = self._codes[:, self._pos[c]]
+        return out
+
+    def mask(self, cols: Iterable[str] | None = None, flags: Fill = SYNTHETIC) -> np.ndarray:
+        """rows × cols bool: any of `flags` set."""
+        return (self.codes(cols) & flags).astype(bool)
+
+    def observed(self, cols: Iterable[str] | None = None) -> np.ndarray:
+        """rows × cols bool: value is a real observation."""
+        return self.mask(cols, Fill.OBSERVED)
+
+    def frame(self, cols: Iterable[str] | None = None, flags: Fill = SYNTHETIC) -> pd.DataFrame:
+        cols = self.columns if cols is None else list(cols)
+        return pd.DataFrame(self.mask(cols, flags), index=self.dates, columns=cols)
+
+    def where_observed(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """`frame` (row‑aligned with the loader frame) with synthetic points → NaN."""
+        cols = [c for c in frame.columns if c in self._pos]
+        return frame.assign(**{c: frame[c].where(self.observed([c])[:, 0]) for c in cols})
+
+    def summary(self) -> pd.DataFrame:
+        """Share of rows carrying each flag, per column."""
+        c = self._codes
+        return pd.DataFrame({f.name.title(): (c & f).astype(bool).mean(0) for f in Fill},
+                            index=self.columns)
+
+
+# ── quality report ──────────────────────────────────────────────────
+def _runs(b: np.ndarray) -> np.ndarray:
+    """Length of the current True‑run at every cell, along axis 0."""
+    c = np.cumsum(b, axis=0)
+    reset = np.maximum.accumulate(np.where(b, 0, c), axis=0)
+    return c - reset
+
+
+def quality_report(frame: pd.DataFrame, prov: Provenance,
+                   cols: Iterable[str] | None = None,
+                   stale_days: int = 5, z: float = 8.0) -> pd.DataFrame:
+    """
+    One row per column, on the workbook's own trading rows
+    (calendar‑added rows are skipped):
+
+        Observed %       share of trading rows holding a real value
+        Longest gap      most consecutive trading rows without one
+        Longest stale    most consecutive observed rows with the same value
+        Stale runs       runs of ≥ `stale_days` unchanged observations
+        Outliers         observed day‑on‑day changes beyond `z` robust σ
+        Worst Δ date     date of the largest such change
+    """
+    cols = [c for c in (prov.columns if cols is None else cols)
+            if c in prov and c in frame.columns]
+    codes = prov.codes(cols)
+    trading = ~(codes & Fill.CALENDAR).astype(bool).all(axis=1)
+    codes, dates = codes[trading], prov.dates[trading]
+    if not len(dates):
+        raise ValueError("no trading rows to report on")
+    v = frame[cols].to_numpy(dtype=float)[trading]
+    obs = (codes & Fill.OBSERVED).astype(bool)
+
+    gap = _runs(~obs & np.logical_or.accumulate(obs, axis=0))   # after first obs
+
+    vo = np.where(obs, v, np.nan)
+    prev = pd.DataFrame(vo).ffill().shift(1).to_numpy()          # last observed before
+    same = obs & (vo == prev)
+    stale = _runs(same) + same                                    # rows incl. the first
+
+    d = np.where(obs, vo - prev, np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)           # all‑NaN columns
+        med = np.nanmedian(d, axis=0)
+        mad = 1.4826 * np.nanmedian(np.abs(d - med), axis=0)
+        rz = np.nan_to_num(np.abs(d - med) / np.where(mad > 0, mad, np.nan), nan=0.0)
+    jump = rz > z
+
+    rep = pd.DataFrame({
+        "Observed %":    obs.mean(axis=0) * 100,
+        "Longest gap":   gap.max(axis=0),
+        "Longest stale": stale.max(axis=0),
+        "Stale runs":    (stale == stale_days).sum(axis=0),
+        "Outliers":      jump.sum(axis=0),
+        "Worst Δ date":  np.where(jump.any(axis=0), dates[rz.argmax(axis=0)].date, None),
+    }, index=cols)
+    rep.loc[~obs.any(axis=0), "Longest gap"] = len(dates)
+    return rep
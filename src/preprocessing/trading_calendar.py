@@ -0,0 +1,61 @@
+# ─────────────────────────── src/preprocessing/trading_calendar.py ───────────────
+"""
+Row calendars for **daily_df**.
+
+    "daily"    every calendar day; weekends / holidays are ffilled rows
+    "trading"  CME crude trading days only
+
+In "trading" mode one row is one session, so every row‑count window in
+the analytics (252 ≈ 1 y, 756 ≈ 3 y, 60, 30 …) means trading days, and
+the frame is roughly 30 % smaller.  The CME schedule comes from
+``pandas_market_calendars`` – holiday rules are computed locally, no
+network.  Without it, Monday–Friday business days are used.
+"""
+
+from __future__ import annotations
+import functools
+import warnings
+
+import pandas as pd
+
+CALENDARS = ("daily", "trading")
+
+# crude‑oil calendar name across pandas_market_calendars releases
+_CME_NAMES = ("CMEGlobex_Crude", "CMEGlobex_Energy", "CME_Energy", "NYMEX")
+
+
+@functools.lru_cache(maxsize=1)
+def _cme_calendar():
+    try:
+        import pandas_market_calendars as mcal
+    except ImportError:
+        warnings.warn("pandas_market_calendars not installed – "
+                      "trading calendar falls back to Mon–Fri business days")
+        return None
+    for name in _CME_NAMES:
+        try:
+            return mcal.get_calendar(name)
+        except (RuntimeError, KeyError, ValueError):
+            continue
+    return None
+
+
+def trading_days(start, end) -> pd.DatetimeIndex:
+    """CME crude trading days in [start, end] (naive, midnight‑normalised)."""
+    start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+    cal = _cme_calendar()
+    if cal is None:
+        return pd.bdate_range(start, end)
+    days = pd.DatetimeIndex(cal.valid_days(start, end))
+    if days.tz is not None:
+        days = days.tz_localize(None)
+    return days.normalize()
+
+
+def row_index(start, end, calendar: str = "daily") -> pd.DatetimeIndex:
+    """Row dates of daily_df for `calendar` between start and end."""
+    if calendar == "daily":
+        return pd.date_range(start, end, freq="D")
+    if calendar == "trading":
+        return trading_days(start, end)
+    raise ValueError(f"unknown calendar {calendar!r}; expected one of {CALENDARS}")
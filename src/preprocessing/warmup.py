@@ -0,0 +1,167 @@
+# ─────────────────────────── src/preprocessing/warmup.py ─────────────────────────
+"""
+Background warm‑up of the heavy analytics after an upload.
+
+As soon as Home has a ``Dataset`` the tasks below are queued on a small
+thread pool (numpy / pandas release the GIL, and threads share the
+read‑only frame instead of pickling it into worker processes).  One
+warm‑up runs per Dataset, so every session reuses the same results.
+
+Pages ask for a single artefact with ``artefact(name)`` and block only
+until *that* task is done; ``sidebar_progress()`` shows the overall state.
+"""
+
+from __future__ import annotations
+import os, threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+import streamlit as st
+from .dataset import Dataset
+
+
+# ── tasks (a task may depend only on tasks listed before it) ──────────
+def _quality(w: "Warmup"):
+    from .provenance import quality_report
+    if w.ds.provenance is None:                      # e.g. the intraday live dataset
+        return None
+    return quality_report(w.ds.by_date, w.ds.provenance)
+
+
+def _curve_cube(w: "Warmup"):
+    from src.analytics.curve_cube import build_curve_cube
+    return build_curve_cube(w.ds.frame)
+
+
+def _alerts(w: "Warmup"):
+    from src.alerts.engine import run_alerts
+    return run_alerts(w.ds.frame)
+
+
+def _features(mode: str):
+    def task(w: "Warmup"):
+        from src.analytics.nn_features import build_feature_matrix
+        return build_feature_matrix(w.ds.by_date, mode=mode)
+    return task
+
+
+def _features_pca(w: "Warmup"):
+    from src.analytics.nn_features import build_feature_matrix
+    return build_feature_matrix(w.ds.by_date, mode="full+pca", pca=w.result("curve_pca"))
+
+
+def _top_movers(w: "Warmup"):
+    from src.analytics.top_movers import top_movers
+    return top_movers(w.ds.frame, window=60, k=7)
+
+
+def _kink_radar(w: "Warmup"):
+    from src.analytics.term_structure import kink_radar
+    return kink_radar(w.ds.frame, cube=w.result("curve_cube"))
+
+
+def _curve_pca(w: "Warmup"):
+    from src.analytics.curve_pca import rolling_curve_pca
+    return rolling_curve_pca(w.result("curve_cube"))
+
+
+TASKS: Dict[str, Callable[["Warmup"], object]] = {
+    "quality":          _quality,
+    "curve_cube":       _curve_cube,
+    "alerts":           _alerts,
+    "features:full":    _features("full"),
+    "features:limited": _features("limited"),
+    "top_movers":       _top_movers,
+    "kink_radar":       _kink_radar,
+    "curve_pca":        _curve_pca,
+    "features:full+pca": _features_pca,
+}
+
+
+class Warmup:
+    """Futures for every task in `tasks`, computed on `ds` in submit order."""
+
+    def __init__(self, ds: Dataset, tasks: Dict[str, Callable] = TASKS,
+                 workers: int | None = None):
+        self.ds = ds
+        self._tasks = tasks
+        self._lock = threading.RLock()
+        pool = ThreadPoolExecutor(max_workers=workers or min(4, os.cpu_count() or 1),
+                                  thread_name_prefix="warmup")
+        # FIFO queue ⇒ a dependency is always running or done before its users
+        self._futures: Dict[str, Future] = {n: pool.submit(fn, self) for n, fn in tasks.items()}
+        pool.shutdown(wait=False)
+
+    def result(self, name: str, timeout: float | None = None):
+        """Block until task `name` is done; re‑raises its exception."""
+        f = self._futures[name]
+        if f.cancelled():                                # superseded, yet still asked for
+            with self._lock:
+                f = self._futures[name]
+                if f.cancelled():
+                    f = Future()
+                    try:
+                        f.set_result(self._tasks[name](self))
+                    except Exception as exc:
+                        f.set_exception(exc)
+                    self._futures[name] = f
+        return f.result(timeout)
+
+    def done(self, name: str) -> bool:
+        return self._futures[name].done()
+
+    def cancel(self) -> None:
+        """Drop the tasks not started yet (the dataset was superseded)."""
+        for f in self._futures.values():
+            f.cancel()
+
+    def progress(self) -> tuple[int, int]:
+        return sum(f.done() for f in self._futures.values()), len(self._futures)
+
+    def failed(self) -> List[str]:
+        return [n for n, f in self._futures.items()
+                if f.done() and not f.cancelled() and f.exception() is not None]
+
+
+_LOCK = threading.Lock()
+
+
+def warmup_for(ds: Dataset, tasks: Dict[str, Callable] | None = None) -> Warmup:
+    """The (single) warm‑up of `ds`, started on first call with `tasks`."""
+    with _LOCK:
+        w = getattr(ds, "_warmup", None)
+        if w is None:
+            w = ds._warmup = Warmup(ds, TASKS if tasks is None else tasks)
+    return w
+
+
+# ── Streamlit helpers ───────────────────────────────────────────────────
+def artefact(name: str, ds: Dataset | None = None):
+    """Warm‑up result `name` for `ds` / the session's dataset (waits only for it)."""
+    w = warmup_for(st.session_state["dataset"] if ds is None else ds)
+    if not w.done(name):
+        with st.spinner(f"Waiting for {name} …"):
+            return w.result(name)
+    return w.result(name)
+
+
+def sidebar_progress() -> None:
+    """Sidebar bar that polls the warm‑up once a second until it finishes."""
+    ds = st.session_state.get("dataset")
+    if ds is None:
+        return
+    w = warmup_for(ds)
+    done, total = w.progress()
+
+    @st.fragment(run_every=1.0 if done < total else None)
+    def _bar():
+        done, total = w.progress()
+        if done < total:
+            st.progress(done / total, text=f"Warming up analytics … {done}/{total}")
+        elif w.failed():
+            st.caption("⚠️ Warm‑up failed: " + ", ".join(w.failed()))
+        else:
+            st.caption("Analytics ready ✔︎")
+
+    with st.sidebar:
+        _bar()
@@ -0,0 +1,80 @@
+# ─────────────────────────── src/startup_bench.py ────────────────────────────
+"""
+Cold‑start benchmark: import time and RSS of Home.py and every page.
+
+    python -m src.startup_bench            # table
+    python -m src.startup_bench --json     # one JSON object per script
+
+Each script is measured in a fresh interpreter.  Streamlit, pandas and
+numpy are imported first as the baseline every worker pays anyway; then
+only the script's top‑level imports are executed (the page body needs a
+Streamlit session), and the extra wall time / RSS is reported together
+with the heavy libraries the script pulled in beyond the baseline.
+"""
+
+from __future__ import annotations
+import argparse, json, subprocess, sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY = ("plotly", "scipy", "sklearn", "statsmodels")
+
+_PROBE = r"""
+import ast, json, resource, sys, time
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+    except OSError:                                  # macOS: peak, in bytes
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**20
+sys.path.insert(0, ROOT)
+t0 = time.perf_counter()
+import streamlit, pandas, numpy
+base_s, base_mb = time.perf_counter() - t0, rss_mb()
+preloaded = {m for m in HEAVY if m in sys.modules}
+tree = ast.parse(open(SCRIPT, encoding="utf-8").read())
+imports = ast.Module([n for n in tree.body if isinstance(n, (ast.Import, ast.ImportFrom))], [])
+t1 = time.perf_counter()
+exec(compile(imports, SCRIPT, "exec"), {"__name__": "__bench__"})
+print(json.dumps({"baseline_s": base_s, "baseline_mb": base_mb,
+                  "import_s": time.perf_counter() - t1, "import_mb": rss_mb() - base_mb,
+                  "heavy": [m for m in HEAVY if m in sys.modules and m not in preloaded]}))
+"""
+
+
+def scripts() -> list[Path]:
+    return [ROOT / "Home.py"] + sorted((ROOT / "pages").glob("*.py"))
+
+
+def measure(script: Path) -> dict:
+    code = (f"ROOT = {str(ROOT)!r}; SCRIPT = {str(script)!r}; HEAVY = {HEAVY!r}\n" + _PROBE)
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                         capture_output=True, text=True, check=True)
+    res = json.loads(out.stdout.strip().splitlines()[-1])
+    res["script"] = str(script.relative_to(ROOT))
+    return res
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    ap.add_argument("--json", action="store_true", help="JSON lines instead of a table")
+    ap.add_argument("--repeat", type=int, default=1, help="runs per script (best kept)")
+    args = ap.parse_args(argv)
+
+    if not args.json:
+        print(f"{'script':34s} {'import ms':>10s} {'+RSS MB':>8s}  heavy libs added")
+    for script in scripts():
+        res = min((measure(script) for _ in range(max(args.repeat, 1))),
+                  key=lambda r: r["import_s"])
+        if args.json:
+            print(json.dumps(res))
+        else:
+            print(f"{res['script']:34s} {res['import_s'] * 1e3:10.0f} "
+                  f"{res['import_mb']:8.1f}  {', '.join(res['heavy']) or '—'}")
+    if not args.json:
+        print(f"{'(baseline: streamlit+pandas+numpy)':34s} {res['baseline_s'] * 1e3:10.0f} "
+              f"{res['baseline_mb']:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
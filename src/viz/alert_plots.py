@@ -30,6 +30,10 @@ def plot_alert_ts(alert_name: str, ts):
         elif alert_name == "DecRed":
             fig.add_hline(0, line_dash="dash", line_color="gray",
                           annotation_text="Mean")
+        elif alert_name == "Pctl":
+            for lvl in (2.5, 97.5):
+                fig.add_hline(lvl, line_dash="dash", line_color="gray")
+            fig.update_yaxes(range=[0, 100])
 
     # --- Multi-series (kink radar) ------------------------------------
     else:
@@ -1,28 +1,19 @@
 # src/viz/curve.py
 import plotly.graph_objects as go
-import pandas as pd
-from src.analytics.term_structure import list_legs
+import numpy as np
+from src.analytics.curve_cube import as_curve_cube
 
-# src/viz/curve.py
-import plotly.graph_objects as go
-import pandas as pd
-import re
-from src.analytics.term_structure import list_legs
-
-_NUM_RE = re.compile(r"%CL (\d+)!")    # keep only numeric legs
-
-def make_curve_figure(df: pd.DataFrame, date: pd.Timestamp, max_leg: int = 12):
-    # pick only %CL n! legs
-    legs = [c for c in list_legs(df, max_leg) if _NUM_RE.fullmatch(c)]
-    y = df.loc[date, legs].ffill().bfill()
+def make_curve_figure(data, date, max_leg: int = 12):
+    """Forward curve (%CL n! legs only) for `date`; data = CurveCube or DataFrame."""
+    cube = as_curve_cube(data)
+    i = cube.row(date)
+    y = cube.curve_at(i, max_leg)
 
     # x-axis = sequential M-leg number (1-, 2-, …)
-    x = list(range(1, len(legs) + 1))
+    x = list(range(1, len(y) + 1))
 
     # colour by slope sign
-    colours = ["green"]
-    colours += ["green" if y.iloc[i] > y.iloc[i+1] else "red"
-                for i in range(len(y) - 1)]
+    colours = np.where(np.r_[True, y[:-1] > y[1:]], "green", "red").tolist()
 
     fig = go.Figure()
     fig.add_trace(
@@ -31,7 +22,7 @@ def make_curve_figure(df: pd.DataFrame, date: pd.Timestamp, max_leg: int = 12):
             mode="lines+markers",
             marker=dict(color=colours, size=10),
             line=dict(width=2),
-            name=str(date.date())
+            name=str(cube.date(i).date())
         )
     )
     fig.update_layout(
@@ -41,3 +32,52 @@ def make_curve_figure(df: pd.DataFrame, date: pd.Timestamp, max_leg: int = 12):
         showlegend=False
     )
     return fig
+
+
+def curve_animation(frames, title: str = "Forward curve playback", duration: int = 120):
+    """
+    One figure holding every frame of a ``CurveFrames``; play / pause and
+    the date slider switch frames in the browser (no server round trip).
+    Frames only carry y and marker colours – x and the layout are shared.
+    """
+    x = list(range(1, len(frames.tenors) + 1))
+    colours = np.where(frames.back, "green", "red")
+    names = [str(d)[:10] for d in frames.dates]
+
+    def _trace(i):
+        return go.Scatter(x=x, y=frames.values[i], mode="lines+markers",
+                          marker=dict(color=colours[i].tolist(), size=10),
+                          line=dict(width=2), name=names[i])
+
+    lo, hi = float(np.nanmin(frames.values)), float(np.nanmax(frames.values))
+    pad = max((hi - lo) * 0.05, 0.5)
+    last = len(frames) - 1
+    fig = go.Figure(
+        data=[_trace(last)],
+        frames=[dict(data=[dict(type="scatter", y=frames.values[i].tolist(),
+                                marker=dict(color=colours[i].tolist()))],
+                     traces=[0], name=names[i]) for i in range(len(frames))],
+    )
+    play = dict(frame=dict(duration=duration, redraw=False), transition=dict(duration=0),
+                fromcurrent=True, mode="immediate")
+    fig.update_layout(
+        title=title,
+        xaxis_title="Contract Month (M-leg)",
+        yaxis_title="Price ($/bbl)",
+        yaxis_range=[lo - pad, hi + pad],
+        showlegend=False,
+        updatemenus=[dict(type="buttons", direction="left", x=0, y=-0.12,
+                          xanchor="left", yanchor="top", showactive=False,
+                          buttons=[dict(label="▶ Play", method="animate", args=[None, play]),
+                                   dict(label="❚❚ Pause", method="animate",
+                                        args=[[None], dict(play, frame=dict(duration=0,
+                                                                            redraw=False))])])],
+        sliders=[dict(active=last, x=0.15, len=0.85, y=-0.05, pad=dict(t=30),
+                      currentvalue=dict(prefix="", font=dict(size=14)),
+                      steps=[dict(label=n, method="animate",
+                                  args=[[n], dict(mode="immediate", transition=dict(duration=0),
+                                                  frame=dict(duration=0, redraw=False))])
+                             for n in names])],
+        margin=dict(b=110),
+    )
+    return fig
@@ -0,0 +1,34 @@
+# src/viz/curve_factors.py
+import plotly.graph_objects as go
+import pandas as pd
+from plotly.subplots import make_subplots
+from src.viz.downsample import downsample
+
+def factor_panel(pca, date: pd.Timestamp):
+    """
+    Rolling-PCA factor panel for the Curves page.
+    • left  – level / slope / curvature scores over time (marker at `date`)
+    • right – tenor loadings of each factor on `date`
+    """
+    scores = pca.scores_frame().dropna()
+    load = pca.loadings_on(date)
+    x_legs = list(range(1, len(load) + 1))
+
+    fig = make_subplots(rows=1, cols=2, column_widths=[0.65, 0.35],
+                        subplot_titles=["Factor scores", f"Loadings {date.date()}"])
+    colours = ["#1f77b4", "#ff7f0e", "#2ca02c", "#9467bd", "#8c564b"]
+    for i, name in enumerate(scores.columns):
+        clr = colours[i % len(colours)]
+        xs, ys = downsample(scores.index, scores[name])
+        fig.add_trace(go.Scatter(x=xs, y=ys, mode="lines",
+                                 name=name, line=dict(color=clr, width=1.5)),
+                      row=1, col=1)
+        fig.add_trace(go.Scatter(x=x_legs, y=load[name], mode="lines+markers",
+                                 name=name, line=dict(color=clr), showlegend=False),
+                      row=1, col=2)
+    fig.add_vline(x=date, line_dash="dot", line_color="gray", row=1, col=1)
+    fig.update_xaxes(title_text="M-leg", row=1, col=2)
+    fig.update_layout(height=380, hovermode="x unified",
+                      legend=dict(orientation="h", y=-0.15),
+                      margin=dict(l=60, r=40, t=40, b=40))
+    return fig
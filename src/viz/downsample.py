@@ -0,0 +1,142 @@
+# src/viz/downsample.py
+"""
+Server‑side thinning of long time‑series before they reach Plotly.
+
+• lttb      – Largest‑Triangle‑Three‑Buckets (shape preserving) plus the
+              global high / low, so spikes survive
+• minmax    – first / min / max / last of every pixel bucket
+
+Targets are sized to the chart width (≈ 2 points per pixel).  Charts
+that support box‑select zoom re‑query the selected x‑range at full
+resolution via ``selected_x_range``.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+DEFAULT_WIDTH_PX = 1400
+POINTS_PER_PX = 2
+
+
+def points_for_width(width_px: int = DEFAULT_WIDTH_PX,
+                     per_px: int = POINTS_PER_PX) -> int:
+    return int(width_px * per_px)
+
+
+def _as_float(x) -> np.ndarray:
+    """Numeric x for geometry (datetimes → ns since epoch)."""
+    arr = np.asarray(x)
+    if np.issubdtype(arr.dtype, np.number):
+        return arr.astype(float)
+    return pd.DatetimeIndex(pd.to_datetime(arr)).asi8.astype(float)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Row positions kept by LTTB (x, y finite, x ascending)."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)   # n_out‑2 buckets
+    starts, stops = edges[:-1], edges[1:]
+    # average point of every bucket (the "next bucket" term), last = final point
+    cnt = np.maximum(stops - starts, 1)
+    avg_x = np.add.reduceat(x, starts)[: len(starts)] / cnt
+    avg_y = np.add.reduceat(y, starts)[: len(starts)] / cnt
+    avg_x = np.append(avg_x[1:], x[-1])
+    avg_y = np.append(avg_y[1:], y[-1])
+
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for b, (lo, hi) in enumerate(zip(starts, stops)):
+        if hi <= lo:
+            keep[b + 1] = lo
+            continue
+        area = np.abs((x[a] - avg_x[b]) * (y[lo:hi] - y[a])
+                      - (x[a] - x[lo:hi]) * (avg_y[b] - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[b + 1] = a
+    return keep
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """First / argmin / argmax / last of each of n_out // 4 buckets."""
+    n = len(y)
+    n_buckets = max(n_out // 4, 1)
+    if n <= n_out:
+        return np.arange(n)
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+    size = int(np.max(np.diff(edges)))
+    # pad to a (buckets × size) block so argmin/argmax are single calls
+    pos = edges[:-1, None] + np.arange(size)
+    valid = pos < edges[1:, None]
+    pos = np.where(valid, pos, edges[1:, None] - 1)
+    block = y[pos]
+    rows = np.arange(n_buckets)
+    picks = np.concatenate([
+        edges[:-1], edges[1:] - 1,
+        pos[rows, np.argmin(block, axis=1)],
+        pos[rows, np.argmax(block, axis=1)],
+    ])
+    return np.unique(picks)
+
+
+def downsample(x, y, n_out: int | None = None, method: str = "lttb"):
+    """
+    Return (x, y) thinned to ≈ n_out points.  Global extremes are always
+    kept, and a NaN is kept wherever the original line had a gap.
+    """
+    n_out = points_for_width() if n_out is None else n_out
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    ok = np.isfinite(y)
+    pos = np.flatnonzero(ok)
+    if len(pos) <= n_out:
+        return x, y
+    xv, yv = x[pos], y[pos]
+    if method == "minmax":
+        idx = minmax_indices(yv, n_out)
+    else:
+        idx = lttb_indices(_as_float(xv), yv, n_out)
+        idx = np.union1d(idx, [np.argmin(yv), np.argmax(yv)])
+    kept = pos[idx]
+
+    if not ok.all():                                  # re‑insert line breaks
+        nan_cum = np.cumsum(~ok)
+        gap = np.flatnonzero(nan_cum[kept[1:]] - nan_cum[kept[:-1]] > 0)
+        if len(gap):
+            nan_pos = np.flatnonzero(~ok)
+            brk = nan_pos[np.searchsorted(nan_pos, kept[gap])]
+            kept = np.sort(np.concatenate([kept, brk]))
+    return x[kept], y[kept]
+
+
+def thin_figure(fig, n_out: int | None = None, method: str = "lttb"):
+    """Downsample every long line trace of an already-built figure in place."""
+    n_out = points_for_width() if n_out is None else n_out
+    for tr in fig.data:
+        if tr.type not in ("scatter", "scattergl") or tr.x is None or tr.y is None:
+            continue
+        if len(tr.y) <= n_out or "lines" not in (tr.mode or "lines"):
+            continue
+        tr.x, tr.y = downsample(tr.x, tr.y, n_out, method)
+    return fig
+
+
+def selected_x_range(key: str):
+    """
+    (x0, x1) Timestamps of the last box selection on chart `key`
+    (st.plotly_chart(..., key=key, on_select="rerun", selection_mode="box")),
+    or None when nothing is selected.
+    """
+    state = st.session_state.get(key)
+    try:
+        boxes = state["selection"]["box"]
+    except (KeyError, TypeError):
+        return None
+    if not boxes:
+        return None
+    x0, x1 = boxes[-1]["x"][:2]
+    x0, x1 = pd.Timestamp(x0), pd.Timestamp(x1)
+    return min(x0, x1), max(x0, x1)
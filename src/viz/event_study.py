@@ -0,0 +1,27 @@
+# src/viz/event_study.py
+import plotly.graph_objects as go
+import plotly.express as px
+import pandas as pd
+
+def event_profile_figure(profile: pd.DataFrame, title: str):
+    """
+    Mean path around the release per surprise bucket (one line each),
+    the all‑events mean dashed; x = offset from the release row.
+    """
+    palette = px.colors.diverging.RdBu[1:-1]
+    buckets = [c for c in profile.columns if c != "All"]
+    fig = go.Figure()
+    for i, b in enumerate(buckets):
+        colour = palette[round(i * (len(palette) - 1) / max(len(buckets) - 1, 1))]
+        fig.add_trace(go.Scatter(x=profile.index, y=profile[b], mode="lines+markers",
+                                 name=b, line=dict(color=colour)))
+    fig.add_trace(go.Scatter(x=profile.index, y=profile["All"], mode="lines", name="All",
+                             line=dict(color="black", dash="dash")))
+    fig.add_vline(x=0, line=dict(color="grey", width=1, dash="dot"))
+    fig.add_hline(y=0, line=dict(color="black", width=1, dash="dot"))
+    fig.update_layout(
+        title=title, xaxis_title="Rows from release", yaxis_title="Δ vs base ($/bbl)",
+        height=450, hovermode="x unified",
+        legend=dict(orientation="h", y=-0.2),
+        margin=dict(l=60, r=40, t=50, b=40))
+    return fig
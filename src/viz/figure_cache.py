@@ -0,0 +1,112 @@
+# src/viz/figure_cache.py
+"""
+Figure layer shared by the pages.
+
+• scatter_trace  – go.Scattergl once a series is long enough that SVG
+                   rendering becomes the bottleneck, go.Scatter otherwise
+• marker_trace / band_trace
+                 – one trace for N markers / N shaded x‑windows instead of
+                   N traces or N add_vrect shapes
+• plotly_chart   – st.plotly_chart timed as the "plotly.render" stage
+                   (figure serialisation dominates for long traces)
+• memo_figure    – per‑session LRU of built figures keyed by a data
+                   fingerprint + parameters, so an unchanged chart is not
+                   rebuilt on rerun; pass ``data_key`` (e.g. the dataset
+                   fingerprint + selection) to skip hashing the data
+"""
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+from src.perf import timed
+
+GL_THRESHOLD = 1500          # points per trace before switching to WebGL
+MEMO_SIZE = 32               # figures kept per session
+
+
+def scatter_trace(x, y, **kw):
+    """Line/marker trace; WebGL for long series."""
+    cls = go.Scattergl if len(x) > GL_THRESHOLD else go.Scatter
+    return cls(x=x, y=y, **kw)
+
+
+def marker_trace(x, y, **kw):
+    """All markers in one trace."""
+    kw.setdefault("mode", "markers")
+    kw.setdefault("showlegend", False)
+    return go.Scatter(x=list(x), y=list(y), **kw)
+
+
+def band_trace(x0s, x1s, y0: float, y1: float, **kw):
+    """
+    Shaded x‑windows [x0, x1] × [y0, y1] as one filled trace
+    (None‑separated rectangles) — replaces one add_vrect per window.
+    """
+    xs, ys = [], []
+    for a, b in zip(x0s, x1s):
+        xs += [a, a, b, b, a, None]
+        ys += [y0, y1, y1, y0, y0, None]
+    kw.setdefault("showlegend", False)
+    kw.setdefault("hoverinfo", "skip")
+    return go.Scatter(x=xs, y=ys, mode="lines", fill="toself",
+                      line=dict(width=0), **kw)
+
+
+def plotly_chart(fig, **kw):
+    """st.plotly_chart, timed (serialisation + send) for the perf panel."""
+    with timed("plotly.render"):
+        return st.plotly_chart(fig, **kw)
+
+
+# ── fingerprints & memo ─────────────────────────────────────────────────
+def _feed(h, obj):
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        _feed(h, list(obj.columns) if isinstance(obj, pd.DataFrame) else obj.name)
+        _feed(h, obj.index)
+        _feed(h, obj.to_numpy())
+    elif isinstance(obj, pd.Index):
+        _feed(h, obj.to_numpy())
+    elif isinstance(obj, np.ndarray):
+        h.update(str((obj.dtype, obj.shape)).encode())
+        h.update(np.ascontiguousarray(obj).tobytes() if obj.dtype != object
+                 else repr(obj.tolist()).encode())
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"[")
+        for o in obj:
+            _feed(h, o)
+        h.update(b"]")
+    elif isinstance(obj, dict):
+        _feed(h, sorted(obj.items(), key=lambda kv: str(kv[0])))
+    else:
+        h.update(repr(obj).encode())
+
+
+def fingerprint(*parts) -> str:
+    """Content hash of arrays / frames / plain values."""
+    h = hashlib.blake2b(digest_size=16)
+    for p in parts:
+        _feed(h, p)
+    return h.hexdigest()
+
+
+def memo_figure(tag: str, builder, *data, data_key=None, **params):
+    """
+    Return builder(*data, **params), reusing the figure built for the
+    same (tag, data fingerprint, params) earlier in this session.
+    `data_key` stands in for the data fingerprint when the caller already
+    knows what the data was derived from.
+    """
+    cache = st.session_state.setdefault("_figure_memo", OrderedDict())
+    dkey = fingerprint(data) if data_key is None else data_key
+    key = (tag, dkey, fingerprint(params))
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+    fig = builder(*data, **params)
+    cache[key] = fig
+    while len(cache) > MEMO_SIZE:
+        cache.popitem(last=False)
+    return fig
@@ -1,4 +1,7 @@
 import plotly.express as px, pandas as pd
+from src.viz.downsample import downsample
+from src.viz.figure_cache import scatter_trace, marker_trace, band_trace
+import plotly.graph_objects as go
 
 def neighbour_table(meta: pd.DataFrame, dist: pd.Series):
     tbl = meta.copy()
@@ -10,3 +13,60 @@ def outcome_bar(mean_ret: pd.Series):
                                                       "y": "Avg Δ ($/bbl)"})
     fig.update_layout(height=300)
     return fig
+
+def bands_figure(bands: pd.DataFrame, target: str):
+    """
+    Analogue mean Δ by horizon with its bootstrap interval (error bars)
+    over the random‑date baseline interval (grey band).
+    """
+    b = bands.xs(target, level="Target")
+    h = list(b.index)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=h + h[::-1], y=list(b["Base hi"]) + list(b["Base lo"])[::-1],
+                             fill="toself", fillcolor="rgba(128,128,128,0.25)",
+                             line=dict(width=0), hoverinfo="skip",
+                             name="Random dates"))
+    fig.add_trace(go.Scatter(
+        x=h, y=b["Mean"], mode="lines+markers", name="Analogue mean",
+        line=dict(color="royalblue"),
+        error_y=dict(type="data", symmetric=False,
+                     array=b["Boot hi"] - b["Mean"],
+                     arrayminus=b["Mean"] - b["Boot lo"])))
+    fig.add_hline(y=0, line=dict(color="black", width=1, dash="dot"))
+    fig.update_layout(
+        title=f"{target} — forward Δ by horizon (bars = bootstrap, grey = random dates)",
+        xaxis_title="Forward days", yaxis_title="Δ ($/bbl)",
+        height=350, margin=dict(l=60, r=40, t=50, b=40))
+    return fig
+
+def history_figure(ts: pd.Series, nbr_dates: pd.Index, name: str,
+                   zoom=None, pad_days: int = 7, starts: pd.Index | None = None):
+    """
+    Full history of one target spread with every neighbour shaded ±pad_days
+    (one band trace) and marked (one marker trace).  With `starts` the band
+    covers each matched window [start, date] instead.
+    """
+    ts_plot = ts.loc[zoom[0]:zoom[1]] if zoom else ts
+    xs, ys = downsample(ts_plot.index, ts_plot.values)       # ≈2 pts / px
+
+    lo, hi = ts_plot.min(), ts_plot.max()
+    pad = pd.Timedelta(days=pad_days)
+    fig = go.Figure()
+    x0, x1 = (nbr_dates - pad, nbr_dates + pad) if starts is None else (starts, nbr_dates)
+    fig.add_trace(band_trace(x0, x1, lo, hi,
+                             fillcolor="rgba(255,165,0,0.25)"))
+    fig.add_trace(scatter_trace(xs, ys, mode="lines", name=name,
+                                line=dict(color="royalblue")))
+    fig.add_trace(marker_trace(nbr_dates, ts.reindex(nbr_dates),
+                               marker=dict(color="red", size=6)))
+
+    fig.update_layout(
+        title=f"{name} — full history  (orange = "
+              + (f"±{pad_days} d around neighbours)" if starts is None else "matched windows)"),
+        height=400,
+        margin=dict(l=60, r=40, t=50, b=40),
+        hovermode="x unified"
+    )
+    if zoom:
+        fig.update_xaxes(range=[zoom[0], zoom[1]])
+    return fig
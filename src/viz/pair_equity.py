@@ -1,5 +1,6 @@
 # src/viz/pair_equity.py
 import plotly.express as px, pandas as pd
+from src.viz.downsample import thin_figure
 
 def equity_chart(bt: pd.DataFrame):
     eq = bt["equity"].dropna()                 # remove leading NaNs
@@ -11,4 +12,4 @@ def equity_chart(bt: pd.DataFrame):
         title="Back-test equity (notional 1-spread)",
         labels={"index": "Date", "equity": "Equity"}
     )
-    return fig
+    return thin_figure(fig)
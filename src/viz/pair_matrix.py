@@ -0,0 +1,18 @@
+import plotly.express as px
+import pandas as pd
+
+def stretch_heatmap(summary: pd.DataFrame, field: str = "StDev from Mean"):
+    """Near × far heatmap of one all-pairs statistic (default: z from mean)."""
+    order = list(dict.fromkeys(list(summary["Near"]) + list(summary["Far"])))
+    mat = (summary.pivot(index="Near", columns="Far", values=field)
+                  .reindex(index=order, columns=order))
+    mat = mat.dropna(how="all").dropna(axis=1, how="all")
+    fig = px.imshow(
+        mat,
+        color_continuous_scale="RdBu_r",
+        zmin=-3, zmax=3,
+        aspect="auto",
+        labels=dict(x="Far leg", y="Near leg", color=field),
+    )
+    fig.update_layout(height=650, margin=dict(l=40, r=40, t=40, b=40))
+    return fig
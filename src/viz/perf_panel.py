@@ -0,0 +1,39 @@
+# src/viz/perf_panel.py
+import json
+import pandas as pd
+import streamlit as st
+from src import perf
+
+
+def perf_panel():
+    """Optional sidebar 'Performance' panel: per‑stage timings + JSON log."""
+    with st.sidebar.expander("⏱ Performance", expanded=False):
+        mem = st.checkbox("Trace peak memory", value=perf.tracing_memory(),
+                          help="tracemalloc — slows allocation‑heavy code while on")
+        if mem != perf.tracing_memory():
+            perf.trace_memory(mem)
+
+        snap = perf.snapshot()
+        if not snap:
+            st.caption("No timings recorded yet.")
+            return
+        tbl = pd.DataFrame(
+            {name: {"calls": s.calls,
+                    "total ms": s.total * 1e3,
+                    "mean ms": s.total / s.calls * 1e3,
+                    "max ms": s.max * 1e3,
+                    "last ms": s.last * 1e3,
+                    "peak MB": s.peak / 2**20 if s.peak else None}
+             for name, s in snap.items()}
+        ).T.sort_values("total ms", ascending=False)
+        tbl["calls"] = tbl["calls"].astype(int)
+        st.dataframe(tbl.style.format({"total ms": "{:,.1f}", "mean ms": "{:,.1f}",
+                                       "max ms": "{:,.1f}", "last ms": "{:,.1f}",
+                                       "peak MB": "{:,.1f}"}, na_rep="—"),
+                     use_container_width=True)
+
+        c1, c2 = st.columns(2)
+        c1.download_button("JSON log", "\n".join(json.dumps(e) for e in perf.events()),
+                           file_name="perf.jsonl", mime="application/json")
+        if c2.button("Reset"):
+            perf.reset()
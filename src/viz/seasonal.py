@@ -0,0 +1,46 @@
+# src/viz/seasonal.py
+import plotly.graph_objects as go
+import plotly.express as px
+import pandas as pd
+
+def seasonal_figure(bands: pd.DataFrame, overlay: pd.DataFrame,
+                    title: str, current_year: int | None = None):
+    """
+    Seasonality chart: min/max envelope, p10–p90 and p25–p75 bands,
+    median, plus one line per overlay year (current year bold red).
+    """
+    x = bands.index
+    fig = go.Figure()
+
+    def _band(lo, hi, colour, name):
+        fig.add_trace(go.Scatter(x=x, y=bands[hi], mode="lines",
+                                 line=dict(width=0), showlegend=False,
+                                 hoverinfo="skip"))
+        fig.add_trace(go.Scatter(x=x, y=bands[lo], mode="lines",
+                                 line=dict(width=0), fill="tonexty",
+                                 fillcolor=colour, name=name))
+
+    _band("min", "max", "rgba(150,150,150,0.15)", "min–max")
+    _band("p10", "p90", "rgba(31,119,180,0.15)", "p10–p90")
+    _band("p25", "p75", "rgba(31,119,180,0.30)", "p25–p75")
+    fig.add_trace(go.Scatter(x=x, y=bands["p50"], mode="lines", name="median",
+                             line=dict(color="#1f77b4", dash="dash")))
+
+    palette = px.colors.qualitative.Set2
+    for i, yr in enumerate(overlay.columns):
+        is_now = yr == current_year
+        fig.add_trace(go.Scatter(
+            x=x, y=overlay[yr], mode="lines", name=str(yr),
+            line=dict(color="red" if is_now else palette[i % len(palette)],
+                      width=3 if is_now else 1.5)
+        ))
+
+    fig.update_layout(
+        title=title,
+        height=500,
+        hovermode="x unified",
+        xaxis=dict(tickformat="%b %d"),
+        legend=dict(orientation="h", y=-0.15),
+        margin=dict(l=60, r=40, t=50, b=40),
+    )
+    return fig
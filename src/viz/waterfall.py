@@ -1,43 +1,32 @@
 # src/viz/waterfall.py
-import re
 import plotly.graph_objects as go
-import pandas as pd
-from src.analytics.term_structure import list_legs
-
-_NUMERIC_LEG = re.compile(r"%CL (\d+)!")           # keeps %CL 1! … %CL 24!
-
-def _numeric_legs(df: pd.DataFrame, max_leg: int) -> list[str]:
-    """Return ['%CL 1!', …] up to max_leg that actually exist in df."""
-    legs = [c for c in list_legs(df, max_leg) if _NUMERIC_LEG.fullmatch(c)]
-    return legs
+from src.analytics.curve_cube import as_curve_cube
 
 def waterfall_curve(
-    df: pd.DataFrame,
+    data,
     idx: int,
     threshold: float = 0.20,
     max_leg: int = 12
 ) -> go.Figure | None:
     """
     Plot yesterday vs today forward-curve with coloured markers.
+    • data is a CurveCube (or a DataFrame, converted on the fly); idx is
+      the date-sorted row position, e.g. cube.row(date).
     • Only %CL n! legs (1-max_leg) are shown; calendar codes like "CL Z25"
       are ignored to avoid int() parsing errors.
     • Segments whose |Δ| > threshold ($/bbl) are coloured
       green (up) or red (down); others gray.
     """
-    legs = _numeric_legs(df, max_leg)
+    cube = as_curve_cube(data)
+    legs = cube.tenor_names(max_leg)
     if len(legs) < 2 or idx == 0:
         return None                      # nothing to plot or idx out of range
 
-    # assure we have a date index
-    dfi = df.set_index("Date (Day)").sort_index()
-
     # guard idx bounds
-    if idx >= len(dfi):
-        idx = len(dfi) - 1
-    prev, curr = dfi.iloc[idx - 1], dfi.iloc[idx]
-
-    prev_leg = prev[legs]
-    curr_leg = curr[legs]
+    if idx >= len(cube):
+        idx = len(cube) - 1
+    prev_leg = cube.block(idx - 1, idx, max_leg)[0]
+    curr_leg = cube.block(idx, idx + 1, max_leg)[0]
     delta    = curr_leg - prev_leg
 
     # colours per leg
@@ -54,13 +43,13 @@ def waterfall_curve(
     fig.add_trace(go.Scatter(
         x=x_vals, y=prev_leg,
         mode="lines+markers",
-        name=str(prev.name.date()),
+        name=str(cube.date(idx - 1).date()),
         line=dict(color="gray", width=1, dash="dot")
     ))
     fig.add_trace(go.Scatter(
         x=x_vals, y=curr_leg,
         mode="lines+markers",
-        name=str(curr.name.date()),
+        name=str(cube.date(idx).date()),
         marker=dict(color=colours, size=10),
         line=dict(width=2)
     ))